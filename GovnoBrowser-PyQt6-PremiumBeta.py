@@ -1,1050 +1,135 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
-import json
-from PyQt6.QtCore import QUrl, Qt, QTimer, QRectF, QPropertyAnimation, QEasingCurve, QSize
+import uuid
+from PyQt6.QtCore import (
+    QUrl, Qt, QTimer, QObject, QByteArray, QDataStream, QIODevice, QThread, QStringListModel, pyqtSignal
+)
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QTabWidget, QToolBar, QLineEdit, QPushButton, 
-    QTabBar, QStyle, QWidget, QMessageBox, QLabel, QVBoxLayout, QComboBox,
-    QHBoxLayout, QDialog, QFormLayout, QScrollArea, QListWidget, QListWidgetItem
+    QApplication, QMainWindow, QTabWidget, QToolBar, QLineEdit, QPushButton, QTabBar, QWidget, QCompleter, QMenu
 )
+from PyQt6.QtGui import QColor
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
-from PyQt6.QtGui import QPainter, QBrush, QPen, QColor, QDesktopServices, QIcon, QGuiApplication
-from PyQt6.QtNetwork import QNetworkProxy
-
-class ProxyManager:
-    def __init__(self):
-        self.proxy = QNetworkProxy()
-        self.proxy_types = {
-            "Без прокси": QNetworkProxy.ProxyType.NoProxy,
-            "США": ("ex.com", 8022),
-            "Германия": ("de.com", 8022),
-            "Япония": ("jp.com", 3228)
-        }
-    
-    def set_proxy(self, location):
-        if location == "Без прокси":
-            QNetworkProxy.setApplicationProxy(QNetworkProxy(QNetworkProxy.ProxyType.NoProxy))
-        elif location in self.proxy_types:
-            host, port = self.proxy_types[location]
-            self.proxy.setType(QNetworkProxy.ProxyType.HttpProxy)
-            self.proxy.setHostName(host)
-            self.proxy.setPort(port)
-            QNetworkProxy.setApplicationProxy(self.proxy)
-
-class SnakeGame(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Змейка.app")
-        self.setFixedSize(420, 420)
-        self.setStyleSheet("background-color: #0a192f;")
-        
-        self.cell_size = 20
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.move_snake)
-        self.direction = Qt.Key.Key_Right
-        self.snake = []
-        self.food = None
-        self.score = 0
-        
-        self.init_game()
-        self.timer.start(200)
-    
-    def init_game(self):
-        start_x, start_y = 100, 100
-        for i in range(3):
-            self.snake.append(QRectF(
-                start_x - i * self.cell_size, 
-                start_y, 
-                self.cell_size, 
-                self.cell_size
-            ))
-        self.spawn_food()
-    
-    def spawn_food(self):
-        from random import randint
-        cols = self.width() // self.cell_size
-        rows = self.height() // self.cell_size
-        self.food = QRectF(
-            randint(0, cols-1) * self.cell_size,
-            randint(0, rows-1) * self.cell_size,
-            self.cell_size,
-            self.cell_size
-        )
-    
-    def move_snake(self):
-        head = self.snake[0]
-        new_head = QRectF(head)
-        
-        if self.direction == Qt.Key.Key_Left:
-            new_head.moveLeft(head.left() - self.cell_size)
-        elif self.direction == Qt.Key.Key_Right:
-            new_head.moveLeft(head.left() + self.cell_size)
-        elif self.direction == Qt.Key.Key_Up:
-            new_head.moveTop(head.top() - self.cell_size)
-        elif self.direction == Qt.Key.Key_Down:
-            new_head.moveTop(head.top() + self.cell_size)
-        
-        if (new_head.left() < 0 or 
-            new_head.right() > self.width() or
-            new_head.top() < 0 or 
-            new_head.bottom() > self.height() or
-            any(new_head.intersects(segment) for segment in self.snake[:-1])):
-            self.game_over()
+from core.history import HistoryWriter, SuggestWorker, strip_url
+from core.adblock import ContentBlocker
+from core.containers import DEFAULT_CONTAINER, ProfilePool
+from core.speculation import Speculator
+from core.storage import Journal, read_json, write_json
+from core.paths import data_dir, data_path
+
+DEFAULT_SETTINGS = {
+    "tab_freeze_after": 5 * 60,      # секунд простоя до заморозки вкладки
+    "tab_discard_after": 30 * 60,    # секунд простоя до выгрузки вкладки
+    "tab_memory_budget_mb": 0,       # лимит памяти рендереров, 0 - без лимита
+    "restore_session": True,
+    "fast_launch": False,
+    "cache_path": "",                # пусто - <каталог данных>/profile/cache
+    "cache_size_mb": 512,
+    "adblock_enabled": True,
+    "adblock_lists": [
+        "https://easylist.to/easylist/easylist.txt",
+        "https://easylist.to/easylist/easyprivacy.txt",
+    ],
+    "autofill_enabled": True,
+    "vault_timeout": 15 * 60,        # секунд, сколько мастер-пароль не спрашивается повторно
+    "proxy_pac_url": "",             # свой PAC-файл (путь или URL), иначе правила из proxy_rules.txt
+    # Контейнеры: отдельные cookies и кэш; private - ничего не пишется на диск
+    "containers": {
+        "Работа": {"color": "#4a90d9", "private": False},
+        "Личное": {"color": "#6abf69", "private": False},
+        "Приватный": {"color": "#c678dd", "private": True},
+    },
+    "container_cache_size_mb": 128,
+    "download_directory": "",        # пусто - системная папка «Загрузки»
+    "download_max_active": 3,
+    "download_segments": 4,          # соединений на большой файл, если сервер умеет Range
+    "download_limit_kb": 0,          # КБ/с на все загрузки, 0 - без лимита
+    "download_item_limit_kb": 0,     # КБ/с на одну загрузку
+    "preconnect_enabled": True,      # открывать соединение с сайтом, пока адрес набирается
+    "prerender_enabled": False,      # загружать верхнюю подсказку заранее в скрытой странице
+    "speculative_max_loads": 1,      # сколько таких скрытых загрузок одновременно
+}
+
+START_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Новая вкладка</title>
+    <style>
+        body { background: #1e1e1e; color: white; font-family: Arial; margin: 0;
+               height: 100vh; display: flex; flex-direction: column; align-items: center; justify-content: center; }
+        h1 { font-size: 42px; margin-bottom: 30px; }
+        input { width: 480px; padding: 12px 20px; border-radius: 22px; border: 1px solid #444;
+                background: #3a3a3a; color: white; font-size: 16px; outline: none; }
+    </style>
+</head>
+<body>
+    <h1>Govno Browser</h1>
+    <form action="https://www.google.com/search">
+        <input name="q" placeholder="Поиск в Google..." autofocus>
+    </form>
+</body>
+</html>
+"""
+
+class StartupTrace:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.last = STARTUP_TIME
+
+    def mark(self, phase):
+        if not self.enabled:
             return
-        
-        self.snake.insert(0, new_head)
-        
-        if new_head.intersects(self.food):
-            self.score += 1
-            self.spawn_food()
-        else:
-            self.snake.pop()
-        
-        self.update()
-    
-    def game_over(self):
-        self.timer.stop()
-        QMessageBox.information(self, "Game Over", f"Счёт: {self.score}")
-        self.close()
-    
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        painter.setBrush(QBrush(QColor(100, 255, 100)))
-        for segment in self.snake:
-            painter.drawRect(segment)
-        
-        painter.setBrush(QBrush(QColor(255, 100, 100)))
-        painter.drawRect(self.food)
-        
-        painter.setPen(QPen(Qt.GlobalColor.white))
-        painter.drawText(10, 20, f"Счёт: {self.score}")
-    
-    def keyPressEvent(self, event):
-        key = event.key()
-        if (key == Qt.Key.Key_Left and self.direction != Qt.Key.Key_Right or
-            key == Qt.Key.Key_Right and self.direction != Qt.Key.Key_Left or
-            key == Qt.Key.Key_Up and self.direction != Qt.Key.Key_Down or
-            key == Qt.Key.Key_Down and self.direction != Qt.Key.Key_Up):
-            self.direction = key
-
-class PasswordItemWidget(QWidget):
-    def __init__(self, site, username, password, parent=None):
-        super().__init__(parent)
-        self.setup_ui(site, username, password)
-        
-    def setup_ui(self, site, username, password):
-        self.layout = QVBoxLayout()
-        self.layout.setContentsMargins(10, 5, 10, 5)
-        self.layout.setSpacing(0)
-        
-        self.top_widget = QWidget()
-        top_layout = QHBoxLayout()
-        top_layout.setContentsMargins(0, 0, 0, 0)
-        
-        self.site_label = QLabel(f"🌐 {site}")
-        self.site_label.setStyleSheet("""
-            font-weight: bold; 
-            font-size: 16px; 
-            color: #64ffda;
-            padding: 8px 0;
-        """)
-        
-        self.toggle_btn = QPushButton()
-        self.toggle_btn.setIcon(QIcon.fromTheme("arrow-down"))
-        self.toggle_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                border: none;
-                color: #64ffda;
-                font-size: 16px;
-            }
-        """)
-        self.toggle_btn.setFixedSize(24, 24)
-        
-        top_layout.addWidget(self.site_label)
-        top_layout.addStretch()
-        top_layout.addWidget(self.toggle_btn)
-        self.top_widget.setLayout(top_layout)
-        
-        self.bottom_widget = QWidget()
-        self.bottom_widget.setVisible(False)
-        bottom_layout = QVBoxLayout()
-        bottom_layout.setContentsMargins(15, 0, 0, 5)
-        
-        user_layout = QHBoxLayout()
-        user_label = QLabel("👤 Имя пользователя:")
-        user_label.setStyleSheet("color: #e6f1ff;")
-        
-        self.username_value = QLabel(username)
-        self.username_value.setStyleSheet("""
-            color: #e6f1ff;
-            background: #172a45;
-            padding: 5px;
-            border-radius: 3px;
-        """)
-        
-        self.copy_user_btn = QPushButton("📋")
-        self.copy_user_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 5px;
-                border-radius: 3px;
-                font-weight: bold;
-                min-width: 30px;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        self.copy_user_btn.clicked.connect(lambda: self.copy_to_clipboard(username))
-        
-        user_layout.addWidget(user_label)
-        user_layout.addWidget(self.username_value)
-        user_layout.addWidget(self.copy_user_btn)
-        user_layout.setSpacing(10)
-        
-        pass_layout = QHBoxLayout()
-        pass_label = QLabel("🔑 Пароль:")
-        pass_label.setStyleSheet("color: #e6f1ff;")
-        
-        self.password_value = QLabel("••••••••")
-        self.password_value.setStyleSheet("""
-            color: #e6f1ff;
-            background: #172a45;
-            padding: 5px;
-            border-radius: 3px;
-        """)
-        
-        self.show_pass_btn = QPushButton("👁")
-        self.show_pass_btn.setStyleSheet("""
-            QPushButton {
-                background: #1e3a5a;
-                color: #e6f1ff;
-                padding: 5px;
-                border-radius: 3px;
-                min-width: 30px;
-            }
-            QPushButton:hover { background: #2a4a6a; }
-        """)
-        self.show_pass_btn.setCheckable(True)
-        self.show_pass_btn.toggled.connect(self.toggle_password_visibility)
-        
-        self.copy_pass_btn = QPushButton("📋")
-        self.copy_pass_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 5px;
-                border-radius: 3px;
-                font-weight: bold;
-                min-width: 30px;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        self.copy_pass_btn.clicked.connect(lambda: self.copy_to_clipboard(password))
-        
-        pass_layout.addWidget(pass_label)
-        pass_layout.addWidget(self.password_value)
-        pass_layout.addWidget(self.show_pass_btn)
-        pass_layout.addWidget(self.copy_pass_btn)
-        pass_layout.setSpacing(10)
-        
-        btn_layout = QHBoxLayout()
-        self.edit_btn = QPushButton("✏️ Редактировать")
-        self.edit_btn.setStyleSheet("""
-            QPushButton {
-                background: #1e3a5a;
-                color: #e6f1ff;
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QPushButton:hover { background: #2a4a6a; }
-        """)
-        
-        self.delete_btn = QPushButton("🗑️ Удалить")
-        self.delete_btn.setStyleSheet("""
-            QPushButton {
-                background: #ff5555;
-                color: white;
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QPushButton:hover { background: #ff3333; }
-        """)
-        
-        btn_layout.addWidget(self.edit_btn)
-        btn_layout.addWidget(self.delete_btn)
-        
-        bottom_layout.addLayout(user_layout)
-        bottom_layout.addLayout(pass_layout)
-        bottom_layout.addLayout(btn_layout)
-        self.bottom_widget.setLayout(bottom_layout)
-        
-        self.layout.addWidget(self.top_widget)
-        self.layout.addWidget(self.bottom_widget)
-        self.setLayout(self.layout)
-        
-        self.animation = QPropertyAnimation(self.bottom_widget, b"maximumHeight")
-        self.animation.setDuration(200)
-        self.animation.setEasingCurve(QEasingCurve.Type.OutQuad)
-        
-        self.real_password = password
-        self.is_expanded = False
-        
-        self.toggle_btn.clicked.connect(self.toggle_expand)
-    
-    def toggle_expand(self):
-        self.is_expanded = not self.is_expanded
-        
-        if self.is_expanded:
-            self.bottom_widget.setVisible(True)
-            self.animation.setStartValue(0)
-            self.animation.setEndValue(self.bottom_widget.sizeHint().height())
-            self.toggle_btn.setIcon(QIcon.fromTheme("arrow-up"))
-        else:
-            self.animation.setStartValue(self.bottom_widget.height())
-            self.animation.setEndValue(0)
-            self.toggle_btn.setIcon(QIcon.fromTheme("arrow-down"))
-            self.animation.finished.connect(lambda: self.bottom_widget.setVisible(False) if not self.is_expanded else None)
-        
-        self.animation.start()
-    
-    def toggle_password_visibility(self, checked):
-        if checked:
-            self.password_value.setText(self.real_password)
-        else:
-            self.password_value.setText("••••••••")
-    
-    def copy_to_clipboard(self, text):
-        clipboard = QGuiApplication.clipboard()
-        clipboard.setText(text)
-        
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Скопировано")
-        msg.setText("Текст скопирован в буфер обмена!")
-        msg.setIcon(QMessageBox.Icon.Information)
-        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-        msg.setStyleSheet("""
-            QMessageBox {
-                background-color: #0a192f;
-                color: #e6f1ff;
-            }
-            QLabel { color: #e6f1ff; }
-        """)
-        msg.show()
-        QTimer.singleShot(1000, msg.close)
-
-class PasswordDialog(QDialog):
-    def __init__(self, parent=None, site="", username="", password="", edit_mode=False):
-        super().__init__(parent)
-        self.setWindowTitle("Добавить/Изменить пароль" if not edit_mode else "Редактировать пароль")
-        self.resize(400, 250)
-        self.setMinimumSize(350, 200)
-        self.setStyleSheet("""
-            background-color: #0a192f;
-            color: #e6f1ff;
-            font-family: Arial;
-        """)
-        
-        layout = QVBoxLayout()
-        
-        title = QLabel("Добавление пароля" if not edit_mode else "Редактирование пароля")
-        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #64ffda;")
-        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        form = QFormLayout()
-        form.setContentsMargins(20, 20, 20, 20)
-        
-        self.site_input = QLineEdit()
-        self.site_input.setText(site)
-        self.site_input.setPlaceholderText("example.com")
-        self.site_input.setStyleSheet("""
-            padding: 8px;
-            border: 1px solid #64ffda;
-            border-radius: 4px;
-            background: #172a45;
-            color: white;
-        """)
-        
-        self.username_input = QLineEdit()
-        self.username_input.setText(username)
-        self.username_input.setPlaceholderText("username123")
-        self.username_input.setStyleSheet("""
-            padding: 8px;
-            border: 1px solid #64ffda;
-            border-radius: 4px;
-            background: #172a45;
-            color: white;
-        """)
-        
-        self.password_input = QLineEdit()
-        self.password_input.setText(password)
-        self.password_input.setPlaceholderText("********")
-        self.password_input.setStyleSheet("""
-            padding: 8px;
-            border: 1px solid #64ffda;
-            border-radius: 4px;
-            background: #172a45;
-            color: white;
-        """)
-        self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-        
-        show_pass_btn = QPushButton("👁")
-        show_pass_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                border: none;
-                color: #64ffda;
-                font-size: 16px;
-                padding: 0;
-                margin-left: 5px;
-            }
-        """)
-        show_pass_btn.clicked.connect(self.toggle_password_visibility)
-        
-        pass_layout = QHBoxLayout()
-        pass_layout.addWidget(self.password_input)
-        pass_layout.addWidget(show_pass_btn)
-        
-        form.addRow("Сайт:", self.site_input)
-        form.addRow("Имя пользователя:", self.username_input)
-        form.addRow("Пароль:", pass_layout)
-        
-        layout.addLayout(form)
-        
-        btn_layout = QHBoxLayout()
-        
-        cancel_btn = QPushButton("Отмена")
-        cancel_btn.setStyleSheet("""
-            QPushButton {
-                background: #ff5555;
-                color: white;
-                padding: 8px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #ff3333; }
-        """)
-        cancel_btn.clicked.connect(self.reject)
-        
-        save_btn = QPushButton("Сохранить")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 8px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        save_btn.clicked.connect(self.accept)
-        
-        btn_layout.addWidget(cancel_btn)
-        btn_layout.addWidget(save_btn)
-        layout.addLayout(btn_layout)
-        
-        self.setLayout(layout)
-    
-    def toggle_password_visibility(self):
-        if self.password_input.echoMode() == QLineEdit.EchoMode.Password:
-            self.password_input.setEchoMode(QLineEdit.EchoMode.Normal)
-        else:
-            self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
-    
-    def get_data(self):
-        return {
-            "site": self.site_input.text().strip(),
-            "username": self.username_input.text().strip(),
-            "password": self.password_input.text().strip()
-        }
-
-class PasswordManagerWindow(QMainWindow):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Менеджер паролей")
-        self.resize(700, 600)
-        self.setMinimumSize(600, 400)
-        self.setStyleSheet("""
-            background-color: #0a192f;
-            color: #e6f1ff;
-            font-family: Arial;
-        """)
-        
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        
-        layout = QVBoxLayout()
-        layout.setContentsMargins(15, 15, 15, 15)
-        layout.setSpacing(15)
-        
-        title = QLabel("🔐 Менеджер паролей")
-        title.setStyleSheet("""
-            font-size: 24px; 
-            font-weight: bold; 
-            color: #64ffda;
-            margin-bottom: 10px;
-        """)
-        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        self.password_list = QListWidget()
-        self.password_list.setStyleSheet("""
-            QListWidget {
-                background: #172a45;
-                border: 1px solid #64ffda;
-                border-radius: 5px;
-                color: white;
-            }
-            QListWidget::item {
-                border-bottom: 1px solid #1e3a5a;
-            }
-            QListWidget::item:hover {
-                background: #1e3a5a;
-            }
-        """)
-        self.password_list.itemClicked.connect(self.show_password_details)
-        layout.addWidget(self.password_list)
-        
-        self.details_widget = QWidget()
-        self.details_widget.setVisible(False)
-        details_layout = QVBoxLayout()
-        
-        # Username
-        user_layout = QHBoxLayout()
-        user_label = QLabel("👤 Имя пользователя:")
-        user_label.setStyleSheet("color: #e6f1ff;")
-        self.username_label = QLabel()
-        self.username_label.setStyleSheet("color: #e6f1ff; font-weight: bold;")
-        
-        self.copy_user_btn = QPushButton("📋")
-        self.copy_user_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 5px;
-                border-radius: 3px;
-                font-weight: bold;
-                min-width: 30px;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        
-        user_layout.addWidget(user_label)
-        user_layout.addWidget(self.username_label)
-        user_layout.addWidget(self.copy_user_btn)
-        
-        # Password (исправленная часть)
-        pass_layout = QHBoxLayout()
-        pass_label = QLabel("🔑 Пароль:")
-        pass_label.setStyleSheet("color: #e6f1ff;")
-        
-        self.password_line = QLineEdit()
-        self.password_line.setReadOnly(True)
-        self.password_line.setStyleSheet("""
-            QLineEdit {
-                color: #e6f1ff; 
-                font-weight: bold;
-                background: transparent;
-                border: none;
-            }
-        """)
-        self.password_line.setEchoMode(QLineEdit.EchoMode.Password)
-        
-        self.show_pass_btn = QPushButton("👁")
-        self.show_pass_btn.setStyleSheet("""
-            QPushButton {
-                background: #1e3a5a;
-                color: #e6f1ff;
-                padding: 5px;
-                border-radius: 3px;
-                min-width: 30px;
-            }
-            QPushButton:hover { background: #2a4a6a; }
-        """)
-        self.show_pass_btn.setCheckable(True)
-        
-        self.copy_pass_btn = QPushButton("📋")
-        self.copy_pass_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 5px;
-                border-radius: 3px;
-                font-weight: bold;
-                min-width: 30px;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        
-        pass_layout.addWidget(pass_label)
-        pass_layout.addWidget(self.password_line)
-        pass_layout.addWidget(self.show_pass_btn)
-        pass_layout.addWidget(self.copy_pass_btn)
-        
-        # Кнопки действий
-        btn_layout = QHBoxLayout()
-        self.edit_btn = QPushButton("✏️ Редактировать")
-        self.edit_btn.setStyleSheet("""
-            QPushButton {
-                background: #1e3a5a;
-                color: #e6f1ff;
-                padding: 8px;
-                border-radius: 5px;
-            }
-            QPushButton:hover { background: #2a4a6a; }
-        """)
-        
-        self.delete_btn = QPushButton("🗑️ Удалить")
-        self.delete_btn.setStyleSheet("""
-            QPushButton {
-                background: #ff5555;
-                color: white;
-                padding: 8px;
-                border-radius: 5px;
-            }
-            QPushButton:hover { background: #ff3333; }
-        """)
-        
-        btn_layout.addWidget(self.edit_btn)
-        btn_layout.addWidget(self.delete_btn)
-        
-        details_layout.addLayout(user_layout)
-        details_layout.addLayout(pass_layout)
-        details_layout.addLayout(btn_layout)
-        self.details_widget.setLayout(details_layout)
-        layout.addWidget(self.details_widget)
-        
-        # Кнопки управления
-        btn_layout = QHBoxLayout()
-        
-        self.add_btn = QPushButton("➕ Добавить пароль")
-        self.add_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        self.add_btn.clicked.connect(self.add_password)
-        
-        self.refresh_btn = QPushButton("🔄 Обновить")
-        self.refresh_btn.setStyleSheet("""
-            QPushButton {
-                background: #1e3a5a;
-                color: #e6f1ff;
-                padding: 10px;
-                border-radius: 5px;
-            }
-            QPushButton:hover { background: #2a4a6a; }
-        """)
-        self.refresh_btn.clicked.connect(self.load_passwords)
-        
-        btn_layout.addWidget(self.add_btn)
-        btn_layout.addWidget(self.refresh_btn)
-        layout.addLayout(btn_layout)
-        
-        self.central_widget.setLayout(layout)
-        
-        # Текущий выбранный пароль
-        self.current_password = None
-        
-        # Подключаем сигналы
-        self.show_pass_btn.toggled.connect(self.toggle_password_visibility)
-        self.copy_user_btn.clicked.connect(self.copy_username)
-        self.copy_pass_btn.clicked.connect(self.copy_password)
-        self.edit_btn.clicked.connect(self.edit_password)
-        self.delete_btn.clicked.connect(self.delete_current_password)
-        
-        self.load_passwords()
-    
-    def load_passwords(self):
-        self.password_list.clear()
-        self.details_widget.setVisible(False)
-        passwords = self.get_stored_passwords()
-        self.password_list.setStyleSheet("""
-            QListWidget {
-                background: #172a45;
-                border: 1px solid #64ffda;
-                border-radius: 5px;
-                color: white;
-                font-size: 16px; 
-            }
-            QListWidget::item {
-                border-bottom: 1px solid #1e3a5a;
-                padding: 5px;  
-            }
-            QListWidget::item:hover {
-                background: #1e3a5a;
-            }
-
-        """)
-        
-        if not passwords:
-            item = QListWidgetItem("Нет сохранённых паролей")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.password_list.addItem(item)
-            return
-        
-        for pwd in passwords:
-            item = QListWidgetItem(f"🌐 {pwd['site']}")
-            item.setData(Qt.ItemDataRole.UserRole, pwd)
-            self.password_list.addItem(item)
-    
-    def show_password_details(self, item):
-        if not item.data(Qt.ItemDataRole.UserRole):
-            return
-            
-        self.current_password = item.data(Qt.ItemDataRole.UserRole)
-        self.username_label.setText(self.current_password["username"])
-        self.password_line.setText(self.current_password["password"])
-        self.show_pass_btn.setChecked(False)
-        self.password_line.setEchoMode(QLineEdit.EchoMode.Password)
-        self.details_widget.setVisible(True)
-    
-    def toggle_password_visibility(self, checked):
-        if checked:
-            self.password_line.setEchoMode(QLineEdit.EchoMode.Normal)
-        else:
-            self.password_line.setEchoMode(QLineEdit.EchoMode.Password)
-    
-    def copy_username(self):
-        clipboard = QGuiApplication.clipboard()
-        clipboard.setText(self.username_label.text())
-        self.show_notification("Имя пользователя скопировано")
-    
-    def copy_password(self):
-        clipboard = QGuiApplication.clipboard()
-        clipboard.setText(self.password_line.text())
-        self.show_notification("Пароль скопирован")
-    
-    def show_notification(self, message):
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Уведомление")
-        msg.setText(message)
-        msg.setIcon(QMessageBox.Icon.Information)
-        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-        msg.setStyleSheet("""
-            QMessageBox {
-                background-color: #0a192f;
-                color: #e6f1ff;
-            }
-            QLabel { color: #e6f1ff; }
-        """)
-        msg.show()
-        QTimer.singleShot(1000, msg.close)
-    
-    def add_password(self):
-        dialog = PasswordDialog(self)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            data = dialog.get_data()
-            if not all(data.values()):
-                QMessageBox.warning(self, "Ошибка", "Все поля должны быть заполнены!")
-                return
-            
-            passwords = self.get_stored_passwords()
-            passwords.append(data)
-            self.save_passwords(passwords)
-            self.load_passwords()
-    
-    def edit_password(self):
-        if not self.current_password:
-            return
-            
-        dialog = PasswordDialog(
-            self, 
-            self.current_password["site"], 
-            self.current_password["username"], 
-            self.current_password["password"],
-            True
-        )
-        
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            new_data = dialog.get_data()
-            if not all(new_data.values()):
-                QMessageBox.warning(self, "Ошибка", "Все поля должны быть заполнены!")
-                return
-            
-            passwords = self.get_stored_passwords()
-            for i, pwd in enumerate(passwords):
-                if (pwd["site"] == self.current_password["site"] and 
-                    pwd["username"] == self.current_password["username"] and 
-                    pwd["password"] == self.current_password["password"]):
-                    passwords[i] = new_data
-                    break
-            
-            self.save_passwords(passwords)
-            self.load_passwords()
-    
-    def delete_current_password(self):
-        if not self.current_password:
-            return
-            
-        reply = QMessageBox.question(
-            self, "Подтверждение", 
-            f"Удалить пароль для {self.current_password['site']}?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-        )
-        
-        if reply == QMessageBox.StandardButton.Yes:
-            passwords = self.get_stored_passwords()
-            passwords = [p for p in passwords if not (
-                p["site"] == self.current_password["site"] and 
-                p["username"] == self.current_password["username"] and 
-                p["password"] == self.current_password["password"]
-            )]
-            
-            self.save_passwords(passwords)
-            self.load_passwords()
-    
-    def get_stored_passwords(self):
-        os.makedirs("user_data", exist_ok=True)
-        if not os.path.exists("user_data/passwords.json"):
-            return []
-        
-        try:
-            with open("user_data/passwords.json", "r") as f:
-                return json.load(f)
-        except:
-            return []
-    
-    def save_passwords(self, passwords):
-        os.makedirs("user_data", exist_ok=True)
-        with open("user_data/passwords.json", "w") as f:
-            json.dump(passwords, f, indent=4)
-
-class PremiumWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Премиум")
-        self.resize(600, 400)
-        self.setMinimumSize(500, 350)
-        self.setStyleSheet("""
-            background-color: #0a192f;
-            color: #e6f1ff;
-            font-family: Arial;
-        """)
-        
-        self.PREMIUM_KEYS = [
-            "AGLR71@!91vsUW", "9KLM#22@FFA1XZ", "PQ92$%AA11BB33", 
-            "ZX45&*CC99DD88", "261189HGHJliq7", "5817JFJQOL<T34", 
-            "DUYIK)!$$!5217", "JHQKjg76347437", "u3e812JGKLGFXH", 
-            "7126484kajsh!@"
-        ]
-        
-        self.premium_key = self.load_premium_key()
-        if not self.premium_key:
-            self.show_activation_screen()
-        else:
-            self.show_premium_features()
-
-    def load_premium_key(self):
-        os.makedirs("user_data", exist_ok=True)
-        if not os.path.exists("user_data/premium.txt"):
-            return None
-        
-        with open("user_data/premium.txt", "r") as f:
-            key = f.read().strip()
-        
-        return key if key in self.PREMIUM_KEYS else None
-    
-    def apply_proxy(self):
-        location = self.proxy_combo.currentText()
-        self.proxy_manager.set_proxy(location)
-        QMessageBox.information(self, "GB-ProxyMaster:", f"Прокси: {location} успешно изменен!")
-
-    def show_activation_screen(self):
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)    
-        
-        layout = QVBoxLayout()
-        
-        title = QLabel("Активируй спец. функции!")
-        button = QPushButton("Как получить ключ?")
-        button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://govno-browser.netlify.app/#premium")))
-        button.setStyleSheet("""
-            QPushButton {
-                background: gold;
-                color: black;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 5px;
-                min-width: 200px;
-                max-width: 200px;   
-            }
-            QPushButton:hover {
-                background: #FFD700;
-            }
-        """)
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #64ffda;")
-        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(button, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Введите ключ...")
-        self.key_input.setStyleSheet("""
-            padding: 10px;
-            border: 2px solid #64ffda;
-            border-radius: 5px;
-            background: #172a45;
-            color: white;
-        """)
-        layout.addWidget(self.key_input)
-        
-        activate_btn = QPushButton("Активировать")
-        activate_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        activate_btn.clicked.connect(self.activate_premium)
-        layout.addWidget(activate_btn)
-        
-        self.central_widget.setLayout(layout)
-
-    def activate_premium(self):
-        key = self.key_input.text().strip()
-        if not key:
-            QMessageBox.warning(self, "Ошибка", "Введи ключ!")
-            return
-        
-        if key not in self.PREMIUM_KEYS:
-            QMessageBox.warning(self, "Ошибка", "Неверный ключ!")
-            return
-        
-        os.makedirs("user_data", exist_ok=True)
-        with open("user_data/premium.txt", "w") as f:
-            f.write(key)
-        
-        self.fade_out_animation()
-        QTimer.singleShot(1000, self.show_premium_features)
-
-    def fade_out_animation(self):
-        self.animation = QPropertyAnimation(self, b"windowOpacity")
-        self.animation.setDuration(500)
-        self.animation.setStartValue(1)
-        self.animation.setEndValue(0)
-        self.animation.start()
-
-    # def show_premium_features(self):
-    #     self.setWindowOpacity(1)
-    #     self.central_widget = QWidget()
-    #     self.setCentralWidget(self.central_widget)
-        
-    #     layout = QVBoxLayout()
-        
-    #     title = QLabel("Специальные функции")
-    #     title.setStyleSheet("font-size: 24px; font-weight: bold; color: #64ffda; padding-bottom: 40px;")
-    #     layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-    #     snake_btn = QPushButton("Играть в змейку")
-    #     snake_btn.setStyleSheet("""
-    #         QPushButton {
-    #             background: #64ffda;
-    #             color: #0a192f;
-    #             padding: 10px;
-    #             border-radius: 5px;
-    #             font-size: 16px;
-    #             font-weight: bold;
-    #         }
-    #         QPushButton:hover { background: #52e3c2; }
-    #     """)
-    #     snake_btn.clicked.connect(self.start_snake_game)
-    #     layout.addWidget(snake_btn)
-        
-    #     title2 = QLabel("Прокси")
-    #     title2.setStyleSheet("font-size: 24px; font-weight: bold; color: white; padding: 10px")
-    #     layout.addWidget(title2, alignment=Qt.AlignmentFlag.AlignCenter)
-
-    #     proxy_label = QLabel("Выберите прокси:")
-    #     proxy_label.setStyleSheet("color: #e6f1ff; font-size: 14px; margin-top: 10px;")
-    #     layout.addWidget(proxy_label)
-
-    #     self.proxy_combo = QComboBox()
-    #     self.proxy_combo.addItems(["Без прокси", "США", "Германия", "Япония"])
-    #     self.proxy_combo.setStyleSheet("""
-    #         QComboBox {
-    #             background: #172a45;
-    #             color: white;
-    #             padding: 8px;
-    #             border: 1px solid #64ffda;
-    #             border-radius: 5px;
-    #         }
-    #     """)
-
-    #     proxy_btn = QPushButton("Активировать прокси")
-    #     proxy_btn.setStyleSheet("""
-    #         QPushButton {
-    #             background: #64ffda;
-    #             color: #0a192f;
-    #             padding: 10px;
-    #             border-radius: 5px;
-    #             font-weight: bold;
-    #             margin-top: 5px;
-    #         }
-    #         QPushButton:hover { background: #52e3c2; }
-    #     """)
-    #     proxy_btn.clicked.connect(self.apply_proxy)
-    #     layout.addWidget(self.proxy_combo)
-    #     layout.addWidget(proxy_btn)
-        
-    #     title3 = QLabel("Пароли")
-    #     title3.setStyleSheet("font-size: 24px; font-weight: bold; color: white; padding: 10px; margin-top: 20px;")
-    #     layout.addWidget(title3, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-    #     passwords_btn = QPushButton("Управление паролями")
-    #     passwords_btn.setStyleSheet("""
-    #         QPushButton {
-    #             background: #64ffda;
-    #             color: #0a192f;
-    #             padding: 10px;
-    #             border-radius: 5px;
-    #             font-weight: bold;
-    #             margin-top: 5px;
-    #         }
-    #         QPushButton:hover { background: #52e3c2; }
-    #     """)
-    #     passwords_btn.clicked.connect(self.open_password_manager)
-    #     layout.addWidget(passwords_btn)
-        
-    #     layout.addStretch()
-    #     self.central_widget.setLayout(layout)
-    #     self.proxy_manager = ProxyManager()
-    
-    def open_password_manager(self):
-        self.password_window = PasswordManagerWindow(self)
-        self.password_window.show()
-    
-    def start_snake_game(self):
-        self.snake_game = SnakeGame()
-        self.snake_game.show()
+        now = time.perf_counter()
+        print(f"[startup] {phase:<20} +{(now - self.last) * 1000:7.1f} мс  "
+              f"(всего {(now - STARTUP_TIME) * 1000:7.1f} мс)", file=sys.stderr)
+        self.last = now
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(read_json(data_path("settings.json"), {}))
+    return settings
+
+def save_settings(settings):
+    write_json(data_path("settings.json"), settings, indent=4)
+
+def configure_proxy_routing(settings):
+    # Chromium читает настройки прокси один раз при запуске, поэтому PAC передаётся флагом
+    # до создания QApplication. Модуль правил грузится, только если правила есть.
+    pac_url = settings["proxy_pac_url"]
+    if pac_url and "://" not in pac_url:
+        pac_url = QUrl.fromLocalFile(os.path.abspath(pac_url)).toString()
+    if not pac_url and os.path.exists(data_path("proxy_rules.txt")):
+        from premium.routing import ensure_pac
+        pac_url = QUrl.fromLocalFile(ensure_pac()).toString()
+    if pac_url:
+        flags = os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "")
+        os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = f"{flags} --proxy-pac-url={pac_url}".strip()
 
 # ==================== ОСНОВНЫЕ КЛАССЫ БРАУЗЕРА ====================
 
 class WebPage(QWebEnginePage):
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self, profile, parent=None):
+        super().__init__(profile, parent)
 
     def createWindow(self, _type):
-        return self.parent().window().create_new_tab()
+        # Скрытые страницы упреждающей загрузки окон не открывают
+        if not isinstance(self.parent(), BrowserTab):
+            return None
+        # Ссылка в новом окне открывается в том же контейнере
+        return self.parent().window().create_new_tab(self.parent().container)
 
 class BrowserTab(QWebEngineView):
-    def __init__(self, parent=None):
+    def __init__(self, profile, parent=None):
         super().__init__(parent)
-        self.setPage(WebPage(self))
+        self.setPage(WebPage(profile, self))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.MiddleButton:
-            self.window().tab_widget.removeTab(self.window().tab_widget.indexOf(self))
+            self.window().close_tab(self.window().tab_widget.indexOf(self))
         super().mousePressEvent(event)
 
 class ModernTabBar(QTabBar):
@@ -1055,296 +140,343 @@ class ModernTabBar(QTabBar):
         self.setExpanding(False)
         self.setElideMode(Qt.TextElideMode.ElideRight)
 
-class BrowserWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Govno Browser")
-        self.resize(1200, 800)
-        self.start_page = QUrl("https://gb-start.netlify.app")
-
-        profile = QWebEngineProfile.defaultProfile()
-        profile.setHttpUserAgent("GovnoBrovser/1.0")
-
-        self.create_toolbar()
-        self.setup_tabs()
-        self.set_dark_theme()
-
-    def set_dark_theme(self):
-        self.setStyleSheet("""
-            QMainWindow { background-color: #1e1e1e; }
-            QToolBar { background-color: #252525; border: none; padding: 4px; spacing: 5px; }
-            QPushButton {
-                background-color: #3a3a3a; color: white; border: none; padding: 5px;
-                border-radius: 4px; min-width: 28px; min-height: 28px;
-            }
-            QPushButton:hover { background-color: #4a4a4a; }
-            QPushButton:pressed { background-color: #2a2a2a; }
-            QLineEdit {
-                background-color: #3a3a3a; color: white; border: 1px solid #444;
-                border-radius: 14px; padding: 5px 15px; margin: 0 5px; min-height: 28px;
-            }
-            QTabBar { background-color: #252525; border: none; }
-            QTabBar::tab {
-                background-color: #2d2d2d; color""")
-
-class WebPage(QWebEnginePage):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-
-    def createWindow(self, _type):
-        return self.parent().window().create_new_tab()
-
-class BrowserTab(QWebEngineView):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setPage(WebPage(self))
-
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.MiddleButton:
-            self.window().tab_widget.removeTab(self.window().tab_widget.indexOf(self))
-        super().mousePressEvent(event)
-
-class ModernTabBar(QTabBar):
-    def __init__(self, parent=None):
+class TabPlaceholder(QWidget):
+    # Лёгкая заглушка вместо BrowserTab: хранит только адрес, заголовок и историю
+    def __init__(self, url, title="", history=None, parent=None):
         super().__init__(parent)
-        self.setMovable(True)
-        self.setTabsClosable(True)
-        self.setExpanding(False)
-        self.setElideMode(Qt.TextElideMode.ElideRight)
-
-class PremiumWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("GovnoBrowser | Меня спец. функций")
-        self.resize(700, 500)
-        self.setStyleSheet("""
-            background-color: #0a192f;
-            color: #e6f1ff;
-            font-family: Arial;
-        """)
-        
-        self.PREMIUM_KEYS = [
-            "AGLR71@!91vsUW", #1
-            "9KLM#22@FFA1XZ", #2
-            "PQ92$%AA11BB33", #3
-            "ZX45&*CC99DD88", #4
-            "261189HGHJliq7", #5
-            "5817JFJQOL<T34", #6
-            "DUYIK)!$$!5217", #7
-            "JHQKjg76347437", #8
-            "u3e812JGKLGFXH", #9
-            "7126484kajsh!@"  #10
-        ]
-        
-        self.premium_key = self.load_premium_key()
-        if not self.premium_key:
-            self.show_activation_screen()
-        else:
-            self.show_premium_features()
-
-    def load_premium_key(self):
-        os.makedirs("user_data", exist_ok=True)
-        if not os.path.exists("user_data/premium.txt"):
-            return None
-        
-        with open("user_data/premium.txt", "r") as f:
-            key = f.read().strip()
-        
-        return key if key in self.PREMIUM_KEYS else None
-    
-    def apply_proxy(self):
-        location = self.proxy_combo.currentText()
-        self.proxy_manager.set_proxy(location)
-        QMessageBox.information(self, "GB-ProxyMaster:", f"Прокси: {location} успешно изменен!")
-
-    def show_activation_screen(self):
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)    
-        
-        layout = QVBoxLayout()
-        
-        title = QLabel("Активируй спец. функции!")
-        button = QPushButton("Как получить ключ?")
-        button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://govno-browser.netlify.app/#premium")))
-        button.setStyleSheet("""
-            QPushButton {
-                background: gold;
-                color: black;
-                font-weight: bold;
-                padding: 10px;
-                border-radius: 5px;
-                min-width: 200px;
-                max-width: 200px;   
-            }
-            QPushButton:hover {
-                background: #FFD700;
-            }
-        """)
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #64ffda;")
-        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(button, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Введите ключ...")
-        self.key_input.setStyleSheet("""
-            padding: 10px;
-            border: 2px solid #64ffda;
-            border-radius: 5px;
-            background: #172a45;
-            color: white;
-        """)
-        layout.addWidget(self.key_input)
-        
-        activate_btn = QPushButton("Активировать")
-        activate_btn.setStyleSheet("""
-            QPushButton {
-                background: #64ffda;
-                color: #0a192f;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #52e3c2; }
-        """)
-        activate_btn.clicked.connect(self.activate_premium)
-        layout.addWidget(activate_btn)
-        
-        self.central_widget.setLayout(layout)
-
-    def activate_premium(self):
-        key = self.key_input.text().strip()
-        if not key:
-            QMessageBox.warning(self, "Ошибка", "Введи ключ!")
+        self.url = QUrl(url)
+        self.title = title
+        self.history = history
+
+# ==================== СЕССИЯ ====================
+
+def save_history(history):
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.OpenModeFlag.WriteOnly)
+    stream << history
+    return bytes(data.toBase64()).decode()
+
+def load_history(history, encoded):
+    stream = QDataStream(QByteArray.fromBase64(encoded.encode()), QIODevice.OpenModeFlag.ReadOnly)
+    stream >> history
+
+class SessionStore:
+    # Снимок session.json + журнал session.journal с построчными изменениями.
+    # Каждое событие вкладки дописывается в журнал, а не переписывает весь файл.
+    COMPACT_AFTER = 500
+    # Сессию не жалко потерять за последнюю секунду при отключении питания
+    SYNC_INTERVAL = 1.0
+
+    def __init__(self, directory=None):
+        directory = directory or data_dir()
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, "session.json")
+        self.journal = Journal(os.path.join(directory, "session.journal"), self.SYNC_INTERVAL)
+        self.tabs = {}
+        self.order = []
+        self.current = None
+        self.journal_entries = 0
+        # Номер последней записи журнала; снимок помнит, до какой записи он уже всё содержит
+        self.seq = 0
+
+    def load(self):
+        snapshot = read_json(self.snapshot_path, {})
+        try:
+            self.tabs = snapshot["tabs"]
+            self.order = snapshot["order"]
+            self.current = snapshot["current"]
+            self.seq = snapshot.get("seq", 0)
+        except (KeyError, TypeError, AttributeError):
+            pass
+
+        for entry in self.journal.replay():
+            # Сбой между записью снимка и обнулением журнала: эти записи уже в снимке
+            if entry.get("seq", self.seq + 1) <= self.seq:
+                continue
+            try:
+                self.apply(entry)
+            except KeyError:
+                break
+            self.seq = entry.get("seq", self.seq)
+            self.journal_entries += 1
+
+        tabs = [(tab_id, self.tabs[tab_id]) for tab_id in self.order]
+        current = self.order.index(self.current) if self.current in self.order else 0
+        return tabs, current
+
+    def apply(self, entry):
+        op, tab_id = entry["op"], entry["id"]
+        if op == "open" and tab_id not in self.tabs:
+            self.tabs[tab_id] = {
+                "url": entry["url"], "title": entry.get("title", ""), "history": None,
+                "container": entry.get("container", ""),
+            }
+            self.order.insert(min(entry["index"], len(self.order)), tab_id)
+        elif op == "update" and tab_id in self.tabs:
+            self.tabs[tab_id].update({k: entry[k] for k in ("url", "title", "history") if k in entry})
+        elif op == "close" and tab_id in self.tabs:
+            del self.tabs[tab_id]
+            self.order.remove(tab_id)
+        elif op == "move" and tab_id in self.tabs:
+            self.order.remove(tab_id)
+            self.order.insert(entry["index"], tab_id)
+        elif op == "current":
+            self.current = tab_id
+
+    def record(self, **entry):
+        self.seq += 1
+        entry["seq"] = self.seq
+        self.apply(entry)
+        self.journal.append(entry)
+        self.journal_entries += 1
+        if self.journal_entries >= self.COMPACT_AFTER:
+            self.compact()
+
+    def compact(self):
+        if not self.journal_entries:
             return
-        
-        if key not in self.PREMIUM_KEYS:
-            QMessageBox.warning(self, "Ошибка", "Неверный ключ!")
+        write_json(self.snapshot_path, {"tabs": self.tabs, "order": self.order, "current": self.current, "seq": self.seq})
+        # Журнал обнуляем только после того, как снимок атомарно занял своё место
+        self.journal.reset()
+        self.journal_entries = 0
+
+# ==================== ЖИЗНЕННЫЙ ЦИКЛ ВКЛАДОК ====================
+
+TAB_MEMORY_ESTIMATE = 80 * 1024 * 1024  # если RSS рендерера узнать нельзя
+
+def process_rss(pid):
+    if pid <= 0:
+        return 0
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+class TabLifecycleManager(QObject):
+    CHECK_INTERVAL = 10 * 1000
+
+    def __init__(self, tab_widget, freeze_after, discard_after, memory_budget=0, parent=None):
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        self.freeze_after = freeze_after
+        self.discard_after = discard_after
+        self.memory_budget = memory_budget
+        self.last_active = {}
+        self.scroll_positions = {}
+
+        self.tab_widget.currentChanged.connect(self.on_current_changed)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check_tabs)
+        self.timer.start(self.CHECK_INTERVAL)
+
+    def track(self, browser):
+        self.last_active[browser] = time.monotonic()
+        browser.loadFinished.connect(self.restore_scroll)
+
+    def forget(self, browser):
+        self.last_active.pop(browser, None)
+        self.scroll_positions.pop(browser, None)
+
+    def tracked_tabs(self):
+        # close_tab сам вызывает forget; здесь страховка для вкладок, убранных из tab_widget
+        # другим путём, чтобы учёт не держал удалённые виджеты
+        for browser in list(self.last_active):
+            if self.tab_widget.indexOf(browser) == -1:
+                self.forget(browser)
+        return list(self.last_active)
+
+    def on_current_changed(self, index):
+        browser = self.tab_widget.widget(index)
+        if browser not in self.last_active:
             return
-        
-        os.makedirs("user_data", exist_ok=True)
-        with open("user_data/premium.txt", "w") as f:
-            f.write(key)
-        
-        self.fade_out_animation()
-        QTimer.singleShot(1000, self.show_premium_features)
-
-    def fade_out_animation(self):
-        self.animation = QPropertyAnimation(self, b"windowOpacity")
-        self.animation.setDuration(500)
-        self.animation.setStartValue(1)
-        self.animation.setEndValue(0)
-        self.animation.start()
-
-    def show_premium_features(self):
-        self.setWindowOpacity(1)
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        
-        layout = QVBoxLayout()
-        
-        title = QLabel("🔥 Специальные функции")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #7161b8; padding-bottom: 40px;")
-        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        # Кнопка змейки
-        snake_btn = QPushButton("Играть в змейку")
-        snake_btn.setStyleSheet("""
-            QPushButton {
-                background: #1c4d9d;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QPushButton:hover { background: #1a3c5e; }
-        """)
-        snake_btn.clicked.connect(self.start_snake_game)
-        layout.addWidget(snake_btn)
-        
-        # Раздел прокси
-        title2 = QLabel("Прокси")
-        title2.setStyleSheet("font-size: 24px; font-weight: bold; color: white; padding: 10px")
-        layout.addWidget(title2, alignment=Qt.AlignmentFlag.AlignCenter)
-
-        proxy_label = QLabel("Выберите прокси:")
-        proxy_label.setStyleSheet("color: #e6f1ff; font-size: 14px; margin-top: 10px;")
-        layout.addWidget(proxy_label)
-
-        self.proxy_combo = QComboBox()
-        self.proxy_combo.addItems(["Без прокси", "США", "Германия", "Япония"])
-        self.proxy_combo.setStyleSheet("""
-            QComboBox {
-                background: #172a45;
-                color: white;
-                padding: 8px;
-                border: 1px solid #64ffda;
-                border-radius: 5px;
-            }
-        """)
+        self.last_active[browser] = time.monotonic()
+        page = browser.page()
+        if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            # Выгруженная вкладка перезагрузится сама, прокрутку вернёт restore_scroll
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
 
-        proxy_btn = QPushButton("Активировать прокси")
-        proxy_btn.setStyleSheet("""
-            QPushButton {
-                background: #1c4d9d;
-                color: white;
-                padding: 10px;
-                border-radius: 5px;
-                font-weight: bold;
-                margin-top: 5px;
-            }
-            QPushButton:hover { background: #1a3c5e; }
-        """)
-        proxy_btn.clicked.connect(self.apply_proxy)
-        layout.addWidget(self.proxy_combo)
-        layout.addWidget(proxy_btn)
-        
-        # Раздел паролей
-        title3 = QLabel("Пароли")
-        title3.setStyleSheet("font-size: 24px; font-weight: bold; color: white; padding: 10px; margin-top: 20px;")
-        layout.addWidget(title3, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        passwords_btn = QPushButton("Управление паролями")
-        passwords_btn.setStyleSheet("""
-            QPushButton {
-                background: #1c4d9d;
-                color: white;
-                padding: 10px;
-                font-size: 16px;
-                border-radius: 5px;
-                font-weight: bold;
-                margin-top: 5px;
-            }
-            QPushButton:hover { background: #1a3c5e; }
-        """)
-        passwords_btn.clicked.connect(self.open_password_manager)
-        layout.addWidget(passwords_btn)
-        
-        layout.addStretch()
-        self.central_widget.setLayout(layout)
-        self.proxy_manager = ProxyManager()
-    
-    def open_password_manager(self):
-        self.password_window = PasswordManagerWindow(self)
-        self.password_window.show()
-    
-    def start_snake_game(self):
-        self.snake_game = SnakeGame()
-        self.snake_game.show()
+    def restore_scroll(self, ok):
+        browser = self.sender()
+        position = self.scroll_positions.pop(browser, None)
+        if ok and position is not None:
+            browser.page().runJavaScript(f"window.scrollTo({position.x()}, {position.y()});")
+
+    def can_change(self, browser, state):
+        if browser is self.tab_widget.currentWidget():
+            return False
+        page = browser.page()
+        # recommendedState учитывает звук, DevTools и видимость страницы
+        return page.lifecycleState().value < state.value <= page.recommendedState().value
+
+    def freeze(self, browser):
+        if self.can_change(browser, QWebEnginePage.LifecycleState.Frozen):
+            browser.page().setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+
+    def discard(self, browser):
+        if not self.can_change(browser, QWebEnginePage.LifecycleState.Discarded):
+            return False
+        page = browser.page()
+        self.scroll_positions[browser] = page.scrollPosition()
+        if page.lifecycleState() == QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+        return True
+
+    def check_tabs(self):
+        now = time.monotonic()
+        for browser in self.tracked_tabs():
+            idle = now - self.last_active[browser]
+            if self.discard_after and idle >= self.discard_after:
+                self.discard(browser)
+            elif self.freeze_after and idle >= self.freeze_after:
+                self.freeze(browser)
+
+        if self.memory_budget:
+            self.enforce_memory_budget()
+
+    def renderer_usage(self):
+        tabs_per_pid = {}
+        for browser in self.tracked_tabs():
+            page = browser.page()
+            if page.lifecycleState() == QWebEnginePage.LifecycleState.Discarded:
+                continue
+            tabs_per_pid.setdefault(page.renderProcessPid(), []).append(browser)
+
+        # Один процесс рендерера может обслуживать несколько вкладок
+        usage = {}
+        for pid, browsers in tabs_per_pid.items():
+            rss = process_rss(pid) or TAB_MEMORY_ESTIMATE * len(browsers)
+            for browser in browsers:
+                usage[browser] = rss / len(browsers)
+        return usage
+
+    def container_usage(self):
+        usage = {}
+        for browser, rss in self.renderer_usage().items():
+            usage[browser.container] = usage.get(browser.container, 0) + rss
+        return usage
+
+    def enforce_memory_budget(self):
+        usage = self.renderer_usage()
+        total = sum(usage.values())
+        for browser in sorted(usage, key=lambda b: self.last_active[b]):
+            if total <= self.memory_budget:
+                break
+            if self.discard(browser):
+                total -= usage[browser]
 
 class BrowserWindow(QMainWindow):
-    def __init__(self):
+    suggest_requested = pyqtSignal(int, str)
+    bookmarks_requested = pyqtSignal()
+
+    def __init__(self, fast_launch=False, trace=None):
         super().__init__()
         self.setWindowTitle("Govno Browser")
         self.resize(1200, 800)
         self.start_page = QUrl("https://gb-start.netlify.app")
-
-        profile = QWebEngineProfile.defaultProfile()
-        profile.setHttpUserAgent("GovnoBrovser/1.0")
+        self.settings = load_settings()
+        self.session = SessionStore()
+        self.trace = trace or StartupTrace()
+        self.fast_launch = fast_launch or self.settings["fast_launch"]
+        self.painted = False
+        self.loaded = False
+        # Блокировщик ставится на профиль сразу, до первой загрузки; списки фильтров он получит позже
+        self.content_blocker = ContentBlocker(self)
+        self.profile = self.create_profile()
+        self.containers = ProfilePool(
+            self.profile, self.settings["containers"], self.settings["container_cache_size_mb"] * 1024 * 1024,
+            self.setup_container_profile, QApplication.instance()
+        )
+        self.downloads = None
+        self.premium_window = None
+        self.downloads_dialog = None
+        self.speculator = Speculator(lambda profile: WebPage(profile), self.settings["speculative_max_loads"], self)
+        self.containers.released.connect(self.speculator.drop)
+        self.history_path = data_path("history.db")
+        self.history_writer = HistoryWriter(self.history_path)
+        QApplication.instance().aboutToQuit.connect(self.history_writer.close)
+        # Закладки читаются из базы один раз в потоке подсказок, дальше только этот набор.
+        # bookmark_edits - щелчки по звёздочке, сделанные до того, как набор прочитан
+        self.bookmarks = set()
+        self.bookmark_edits = {}
+
+        # В быстром режиме загрузка фильтров ждёт первой отрисовки окна
+        self.autofill = None
+        if not self.fast_launch:
+            self.load_filters()
 
         self.create_toolbar()
+        self.trace.mark("create_toolbar")
         self.setup_tabs()
+        self.trace.mark("setup_tabs")
         self.set_dark_theme()
+        self.trace.mark("set_dark_theme")
+
+        self.session_timer = QTimer(self)
+        self.session_timer.timeout.connect(self.session.compact)
+        self.session_timer.start(60 * 1000)
+
+        self.setup_omnibox()
+
+    def create_profile(self):
+        # Именованный профиль хранит кэш и cookies на диске между запусками.
+        # Профиль должен пережить страницы вкладок, поэтому его владелец - приложение.
+        storage_path = data_path("profile")
+        profile = QWebEngineProfile("govno", QApplication.instance())
+        profile.setPersistentStoragePath(storage_path)
+        profile.setCachePath(self.settings["cache_path"] or os.path.join(storage_path, "cache"))
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        profile.setHttpCacheMaximumSize(self.settings["cache_size_mb"] * 1024 * 1024)
+        profile.downloadRequested.connect(self.on_download_requested)
+        self.configure_profile(profile)
+        return profile
+
+    def load_filters(self):
+        if self.settings["adblock_enabled"]:
+            self.content_blocker.load(
+                data_path("filters"),
+                data_path("filters.cache"),
+                self.settings["adblock_lists"]
+            )
+        self.trace.mark("load_filters")
+
+    def setup_container_profile(self, profile):
+        profile.downloadRequested.connect(self.on_download_requested)
+        self.configure_profile(profile)
+
+    def configure_profile(self, profile):
+        profile.setHttpUserAgent("GovnoBrovser/1.0")
+        # Один блокировщик с одними скомпилированными фильтрами на все контейнеры
+        profile.setUrlRequestInterceptor(self.content_blocker)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            self.trace.mark("first paint")
+            if self.fast_launch:
+                QTimer.singleShot(0, self.load_filters)
+            QTimer.singleShot(0, self.setup_autofill)
+            # Загрузки, не законченные в прошлый раз, продолжаются после первой отрисовки
+            if os.path.exists(data_path("downloads.json")):
+                QTimer.singleShot(0, self.download_manager)
+
+    def setup_autofill(self):
+        # Премиум-модули грузятся только после первой отрисовки, индекс паролей строится в фоне
+        from premium.vault import key_cache
+        key_cache.timeout = self.settings["vault_timeout"]
+        if self.settings["autofill_enabled"]:
+            from premium.autofill import Autofill
+            self.autofill = Autofill(data_path("passwords.db"), self)
+
+    def on_load_finished(self):
+        if not self.loaded:
+            self.loaded = True
+            self.trace.mark("first loadFinished")
 
     def set_dark_theme(self):
         self.setStyleSheet("""
@@ -1396,6 +528,10 @@ class BrowserWindow(QMainWindow):
         self.url_bar.setPlaceholderText("Введите URL или поисковый запрос...")
         self.url_bar.returnPressed.connect(self.navigate_to_url)
 
+        self.bookmark_btn = QPushButton("☆")
+        self.bookmark_btn.setToolTip("Закладка")
+        self.bookmark_btn.clicked.connect(self.toggle_bookmark)
+
         premium_btn = QPushButton("💎 Специальные функции")
         premium_btn.setStyleSheet("""
             QPushButton {
@@ -1413,77 +549,394 @@ class BrowserWindow(QMainWindow):
         toolbar.addWidget(reload_btn)
         toolbar.addWidget(home_btn)
         toolbar.addWidget(self.url_bar)
+        toolbar.addWidget(self.bookmark_btn)
 
         new_tab_btn = QPushButton("+")
         new_tab_btn.setFixedWidth(40)
-        new_tab_btn.clicked.connect(self.add_new_tab)
+        new_tab_btn.clicked.connect(lambda: self.add_new_tab())
+
+        container_btn = QPushButton("🗂️")
+        container_btn.setToolTip("Новая вкладка в контейнере")
+        self.container_menu = QMenu(self)
+        self.container_menu.aboutToShow.connect(self.update_container_menu)
+        container_btn.setMenu(self.container_menu)
+
+        downloads_btn = QPushButton("⬇️")
+        downloads_btn.setToolTip("Загрузки")
+        downloads_btn.clicked.connect(self.open_downloads)
+
+        cache_btn = QPushButton("🗄️")
+        cache_btn.setToolTip("Кэш")
+        cache_btn.clicked.connect(self.open_cache_manager)
         
         toolbar.addWidget(new_tab_btn)
+        toolbar.addWidget(container_btn)
+        toolbar.addWidget(downloads_btn)
+        toolbar.addWidget(cache_btn)
         toolbar.addWidget(premium_btn)
 
+    def setup_omnibox(self):
+        # Подсказки считаются в отдельном потоке, запросы к базе отправляются не чаще раза в 40 мс
+        self.suggest_model = QStringListModel(self)
+        self.completer = QCompleter(self.suggest_model, self)
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.activated.connect(self.on_suggestion_activated)
+        self.url_bar.setCompleter(self.completer)
+
+        self.suggest_id = 0
+        self.suggest_timer = QTimer(self)
+        self.suggest_timer.setSingleShot(True)
+        self.suggest_timer.setInterval(40)
+        self.suggest_timer.timeout.connect(self.request_suggestions)
+        self.url_bar.textEdited.connect(self.suggest_timer.start)
+
+        self.suggest_thread = QThread(self)
+        self.suggest_worker = SuggestWorker(self.history_path)
+        self.suggest_worker.moveToThread(self.suggest_thread)
+        self.suggest_requested.connect(self.suggest_worker.suggest)
+        self.suggest_worker.suggestions_ready.connect(self.show_suggestions)
+        self.bookmarks_requested.connect(self.suggest_worker.load_bookmarks)
+        self.suggest_worker.bookmarks_ready.connect(self.set_bookmarks)
+        self.suggest_thread.start()
+        self.bookmarks_requested.emit()
+
+    def request_suggestions(self):
+        self.suggest_id += 1
+        self.suggest_worker.latest = self.suggest_id
+        self.suggest_requested.emit(self.suggest_id, self.url_bar.text())
+
+    def show_suggestions(self, request_id, urls):
+        if request_id != self.suggest_id:
+            return
+        self.suggest_model.setStringList(urls)
+        if urls and self.url_bar.hasFocus():
+            self.completer.complete()
+        self.speculate(urls)
+
+    def speculate(self, urls):
+        # Пока адрес набирается, прогреваем соединение с самым вероятным сайтом:
+        # верхней подсказкой из истории и тем, что уже набрано
+        text = self.url_bar.text().strip()
+        if len(text) < 2 or not self.url_bar.hasFocus():
+            return
+        profile = self.current_browser().page().profile()
+        top = QUrl(urls[0]) if urls else None
+        if self.settings["preconnect_enabled"]:
+            for url in (top, self.resolve_input(text)):
+                if url is not None:
+                    self.speculator.preconnect(url, profile)
+        # Страницу целиком грузим, только если подсказка продолжает набранное, а не просто похожа
+        if top is not None and self.settings["prerender_enabled"] and strip_url(urls[0]).startswith(strip_url(text)):
+            self.speculator.prerender(top, profile)
+
+    def on_suggestion_activated(self, url):
+        self.url_bar.setText(url)
+        self.navigate_to_url()
+
+    def fill_credentials(self, ok):
+        if ok and self.autofill:
+            self.autofill.fill(self.sender())
+
+    def update_container_menu(self):
+        # Память считается при каждом открытии меню: рендереры контейнера - отдельные процессы
+        self.container_menu.clear()
+        usage = self.lifecycle.container_usage()
+        for name in self.containers.names():
+            label = name
+            tabs = self.containers.tab_count(name)
+            if tabs:
+                label += f" — вкладок: {tabs}, {usage.get(name, 0) / 1024 / 1024:.0f} МБ"
+            action = self.container_menu.addAction(label)
+            action.triggered.connect(lambda _checked, name=name: self.add_new_tab(container=name))
+
+    def record_session(self, widget, **entry):
+        # Вкладки приватных контейнеров не попадают в сессию на диске
+        if not widget.private:
+            self.session.record(id=widget.tab_id, **entry)
+
+    def record_visit(self, url):
+        if url.scheme() in ("http", "https") and not self.sender().private:
+            self.history_writer.add_visit(url.toString())
+
+    def record_visit_title(self, ok):
+        browser = self.sender()
+        url = browser.url()
+        if ok and url.scheme() in ("http", "https") and not browser.private:
+            self.history_writer.set_title(url.toString(), browser.page().title())
+
+    def toggle_bookmark(self):
+        browser = self.current_browser()
+        url = browser.url().toString()
+        if not url:
+            return
+        bookmarked = url not in self.bookmarks
+        if self.bookmark_edits is not None:
+            self.bookmark_edits[url] = bookmarked
+        self.apply_bookmark(url, bookmarked)
+        self.history_writer.set_bookmarked(url, browser.page().title(), bookmarked)
+        self.update_bookmark_button(url)
+
+    def apply_bookmark(self, url, bookmarked):
+        if bookmarked:
+            self.bookmarks.add(url)
+        else:
+            self.bookmarks.discard(url)
+
+    def set_bookmarks(self, urls):
+        self.bookmarks = urls
+        for url, bookmarked in self.bookmark_edits.items():
+            self.apply_bookmark(url, bookmarked)
+        self.bookmark_edits = None
+        browser = self.current_browser()
+        if isinstance(browser, BrowserTab):
+            self.update_bookmark_button(browser.url().toString())
+
+    def update_bookmark_button(self, url):
+        self.bookmark_btn.setText("★" if url in self.bookmarks else "☆")
+
     def setup_tabs(self):
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabBar(ModernTabBar())
         self.tab_widget.setDocumentMode(True)
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
         self.setCentralWidget(self.tab_widget)
-        self.add_new_tab(self.start_page)
+        self.lifecycle = TabLifecycleManager(
+            self.tab_widget,
+            self.settings["tab_freeze_after"],
+            self.settings["tab_discard_after"],
+            self.settings["tab_memory_budget_mb"] * 1024 * 1024,
+            self
+        )
+        self.tab_widget.tabBar().tabMoved.connect(self.on_tab_moved)
+
+        tabs, current = self.session.load() if self.settings["restore_session"] else ([], 0)
+        if tabs:
+            self.restore_session(tabs, current)
+        else:
+            self.add_new_tab()
+
+    def restore_session(self, tabs, current):
+        # Все вкладки восстанавливаются заглушками, рендерер создаётся только для текущей
+        self.tab_widget.blockSignals(True)
+        for tab_id, tab in tabs:
+            self.add_lazy_tab(tab["url"], tab["title"], tab["history"], tab_id, tab.get("container", ""))
+        self.tab_widget.setCurrentIndex(current)
+        self.tab_widget.blockSignals(False)
+        self.tab_widget.currentChanged.emit(current)
 
     def current_browser(self):
         return self.tab_widget.currentWidget()
 
-    def create_new_tab(self):
-        new_browser = BrowserTab(self)
-        new_browser.urlChanged.connect(self.update_urlbar)
-        new_browser.loadFinished.connect(self.update_tab_title)
+    def make_browser(self, tab_id=None, container=DEFAULT_CONTAINER):
+        # Профиль контейнера берётся из пула и возвращается туда, когда вкладка удалена
+        profile = self.containers.acquire(container)
+        browser = BrowserTab(profile, self)
+        browser.tab_id = tab_id or uuid.uuid4().hex
+        browser.container = container if profile is not self.profile else DEFAULT_CONTAINER
+        browser.private = self.containers.is_private(browser.container)
+        container = browser.container
+        browser.destroyed.connect(lambda: self.containers.release(container))
+        browser.urlChanged.connect(self.update_urlbar)
+        browser.urlChanged.connect(self.record_tab)
+        browser.loadFinished.connect(self.update_tab_title)
+        browser.loadFinished.connect(self.on_load_finished)
+        browser.urlChanged.connect(self.record_visit)
+        browser.loadFinished.connect(self.record_visit_title)
+        browser.loadFinished.connect(self.fill_credentials)
+        self.lifecycle.track(browser)
+        return browser
+
+    def create_new_tab(self, container=DEFAULT_CONTAINER):
+        new_browser = self.make_browser(container=container)
         index = self.tab_widget.addTab(new_browser, "Новая вкладка")
+        self.mark_container(index, new_browser.container)
+        self.record_session(new_browser, op="open", index=index, url="", container=new_browser.container)
         self.tab_widget.setCurrentIndex(index)
         return new_browser.page()
 
-    def add_new_tab(self, url=None):
-        browser = BrowserTab(self)
-        browser.urlChanged.connect(self.update_urlbar)
-        browser.loadFinished.connect(self.update_tab_title)
-        self.tab_widget.addTab(browser, "Новая вкладка")
+    def add_new_tab(self, url=None, container=DEFAULT_CONTAINER):
+        browser = self.make_browser(container=container)
+        index = self.tab_widget.addTab(browser, "Новая вкладка")
+        self.mark_container(index, browser.container)
+        self.record_session(
+            browser, op="open", index=index, url=(url or self.start_page).toString(), container=browser.container
+        )
         self.tab_widget.setCurrentWidget(browser)
-        browser.load(url or self.start_page)
+        if url:
+            browser.load(url)
+        else:
+            self.load_start_page(browser)
+
+    def load_start_page(self, browser):
+        if self.fast_launch:
+            browser.setHtml(START_PAGE_HTML)
+        else:
+            browser.load(self.start_page)
+
+    def add_lazy_tab(self, url, title="", history=None, tab_id=None, container=DEFAULT_CONTAINER):
+        placeholder = TabPlaceholder(url, title, history)
+        placeholder.tab_id = tab_id or uuid.uuid4().hex
+        placeholder.container = container
+        placeholder.private = self.containers.is_private(container)
+        index = self.tab_widget.addTab(placeholder, self.short_title(title or placeholder.url.toString()))
+        self.tab_widget.setTabToolTip(index, placeholder.url.toString())
+        self.mark_container(index, container)
+        if tab_id is None:
+            self.record_session(
+                placeholder, op="open", index=index, url=placeholder.url.toString(), title=title, container=container
+            )
+        return index
+
+    def mark_container(self, index, container):
+        color = self.containers.color(container)
+        if color:
+            self.tab_widget.tabBar().setTabTextColor(index, QColor(color))
+
+    def materialize_tab(self, index):
+        placeholder = self.tab_widget.widget(index)
+        browser = self.make_browser(placeholder.tab_id, placeholder.container)
+
+        # Подменяем заглушку без лишних currentChanged, затем сообщаем о смене вкладки один раз
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.insertTab(index, browser, self.tab_widget.tabText(index))
+        self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.removeTab(index + 1)
+        self.mark_container(index, browser.container)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+
+        if placeholder.history:
+            load_history(browser.history(), placeholder.history)
+        else:
+            browser.load(placeholder.url)
+        self.tab_widget.currentChanged.emit(index)
+        return browser
+
+    def on_tab_changed(self, index):
+        widget = self.tab_widget.widget(index)
+        if isinstance(widget, TabPlaceholder):
+            self.materialize_tab(index)
+        elif isinstance(widget, BrowserTab):
+            self.update_urlbar(widget.url())
+            self.record_session(widget, op="current")
+
+    def on_tab_moved(self, from_index, to_index):
+        self.record_session(self.tab_widget.widget(to_index), op="move", index=to_index)
+
+    def record_tab(self):
+        browser = self.sender()
+        self.record_session(
+            browser, op="update", url=browser.url().toString(),
+            title=browser.page().title(), history=save_history(browser.history())
+        )
 
     def close_tab(self, index):
         if self.tab_widget.count() > 1:
+            self.lifecycle.forget(self.tab_widget.widget(index))
+            self.record_session(self.tab_widget.widget(index), op="close")
             self.tab_widget.widget(index).deleteLater()
             self.tab_widget.removeTab(index)
 
     def update_urlbar(self, url):
         self.url_bar.setText(url.toString())
+        self.update_bookmark_button(url.toString())
 
     def update_tab_title(self):
         browser = self.sender()
         index = self.tab_widget.indexOf(browser)
-        title = browser.page().title()
-        self.tab_widget.setTabText(index, title[:20] + "..." if len(title) > 20 else title)
+        self.tab_widget.setTabText(index, self.short_title(browser.page().title()))
+        self.record_session(browser, op="update", title=browser.page().title())
 
-    def navigate_to_url(self):
-        url_text = self.url_bar.text().strip()
+    def short_title(self, title):
+        return title[:20] + "..." if len(title) > 20 else title
+
+    def resolve_input(self, url_text):
+        url_text = url_text.strip()
         if not url_text:
-            return
+            return None
         if not url_text.startswith(('http://', 'https://', 'file://')):
             if '.' in url_text:
                 url_text = 'http://' + url_text
             else:
                 url_text = f'https://www.google.com/search?q={url_text.replace(" ", "+")}'
-        self.current_browser().load(QUrl(url_text))
+        return QUrl(url_text)
+
+    def navigate_to_url(self):
+        url = self.resolve_input(self.url_bar.text())
+        if url is None:
+            return
+        browser = self.current_browser()
+        # Заранее загруженная страница подставляется, только если у вкладки нет истории назад:
+        # иначе кнопка «Назад» потеряла бы прошлые страницы. Кэш прогрет в любом случае.
+        page, loaded = self.speculator.take(url, browser.page().profile(), not browser.history().canGoBack())
+        if page is None:
+            browser.load(url)
+            return
+        old_page = browser.page()
+        page.setParent(browser)
+        browser.setPage(page)
+        old_page.deleteLater()
+        if loaded:
+            # Страница уже загружена и свой loadFinished не пришлёт: заголовок, сессия, автозаполнение
+            browser.loadFinished.emit(True)
 
     def navigate_home(self):
-        self.current_browser().load(self.start_page)
+        self.load_start_page(self.current_browser())
 
     def open_premium(self):
-        self.premium_window = PremiumWindow()
+        # Премиум-модули импортируются только при первом открытии окна. Окно одно на всё время:
+        # новое окно удалило бы старое вместе с открытым менеджером паролей и его потоками
+        if self.premium_window is None:
+            from premium.window import PremiumWindow
+            self.premium_window = PremiumWindow()
         self.premium_window.show()
+        self.premium_window.raise_()
+        self.premium_window.activateWindow()
+
+    def open_cache_manager(self):
+        from core.cache import CacheManager, CacheDialog
+        dialog = CacheDialog(CacheManager(self.profile), self.settings, lambda: save_settings(self.settings), self)
+        dialog.exec()
+
+    def download_manager(self):
+        if self.downloads is None:
+            from core.downloads import DownloadManager
+            self.downloads = DownloadManager(data_path("downloads.json"), self.settings, self)
+        return self.downloads
+
+    def on_download_requested(self, request):
+        self.download_manager().add_request(request)
+
+    def open_downloads(self):
+        if self.downloads_dialog is None:
+            from core.downloads import DownloadsDialog
+            self.downloads_dialog = DownloadsDialog(
+                self.download_manager(), self.settings, lambda: save_settings(self.settings), self
+            )
+        self.downloads_dialog.show()
+        self.downloads_dialog.raise_()
+
+    def closeEvent(self, event):
+        if self.trace.enabled:
+            print(f"[speculation] {self.speculator.summary()}", file=sys.stderr)
+        self.session.compact()
+        if self.downloads:
+            self.downloads.close()
+        self.suggest_thread.quit()
+        self.suggest_thread.wait()
+        if self.autofill:
+            self.autofill.close()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
+    trace = StartupTrace("--trace-startup" in sys.argv)
+    trace.mark("imports")
+    configure_proxy_routing(load_settings())
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
-    window = BrowserWindow()
+    trace.mark("QApplication init")
+    window = BrowserWindow("--fast-launch" in sys.argv, trace)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,1115 @@
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BROWSER_SCRIPT = os.path.join(ROOT, "GovnoBrowser-PyQt6-PremiumBeta.py")
+
+# Бюджет времени импорта премиум-модулей поверх уже загруженного ядра браузера (мс)
+IMPORT_BUDGETS = {
+    "premium.window": 25,
+    "premium.passwords": 25,
+    "premium.snake": 10,
+    "premium.proxy": 25,
+}
+
+IMPORT_PROBE = """
+import time
+import PyQt6.QtCore, PyQt6.QtGui, PyQt6.QtWidgets
+# Перечисления Qt создаются при первом обращении, в браузере это уже сделало ядро
+PyQt6.QtCore.Qt.AlignmentFlag
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+"""
+
+CORE_PROBE = """
+import sys, time, runpy
+start = time.perf_counter()
+runpy.run_path({script!r}, run_name="govno_browser")
+print((time.perf_counter() - start) * 1000)
+print(any(name == "premium" or name.startswith("premium.") for name in sys.modules))
+print("PyQt6.QtNetwork" in sys.modules)
+"""
+
+def measure_core():
+    # Ядро браузера не должно тянуть премиум-модули и QtNetwork при запуске
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", CORE_PROBE.format(script=BROWSER_SCRIPT)],
+            cwd=ROOT, text=True, capture_output=True, check=True
+        ).stdout.split()
+    except subprocess.CalledProcessError as e:
+        return {"error": e.stderr.strip().splitlines()[-1]}
+    return {"ms": round(float(output[0]), 2), "premium_loaded": output[1] == "True",
+            "qtnetwork_loaded": output[2] == "True"}
+
+def measure_import(module, runs):
+    # Каждый замер в отдельном процессе, иначе модуль уже лежит в sys.modules
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", IMPORT_PROBE.format(module=module)], cwd=ROOT, text=True
+        )
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def bench_imports(args):
+    results = {}
+    failed = []
+    for module, budget in IMPORT_BUDGETS.items():
+        elapsed = measure_import(module, args.runs)
+        results[module] = {"ms": round(elapsed, 2), "budget_ms": budget}
+        if elapsed > budget:
+            failed.append(module)
+
+    results["core"] = measure_core()
+    # Если ядро не загрузилось, проверить его импорты нельзя - это тоже провал
+    core = results["core"]
+    if "error" in core or core.get("premium_loaded") or core.get("qtnetwork_loaded"):
+        failed.append("core")
+    return results, failed
+
+# Подсказка адресной строки на одно нажатие клавиши (мс, 95-й перцентиль)
+SUGGEST_BUDGET_MS = 5
+SUGGEST_QUERIES = ["n", "ne", "new", "news1", "https://www.mail5", "docs", "wiki page", "video 99", "zzz"]
+
+def fill_history(path, rows):
+    from core.history import HistoryStore, strip_url, add_frecency
+
+    store = HistoryStore(path)
+    rng = random.Random(1)
+    words = ["news", "mail", "docs", "video", "shop", "wiki", "forum", "blog", "maps", "dash"]
+    hosts = [f"{rng.choice(words)}{i}.example{i % 50}.com" for i in range(20000)]
+    now = time.time()
+    with store.db:
+        for start in range(0, rows, 50000):
+            batch = []
+            for i in range(start, min(start + 50000, rows)):
+                url = f"https://{rng.choice(hosts)}/{rng.choice(words)}/{i}"
+                visited = now - rng.random() * 180 * 24 * 3600
+                batch.append((url, strip_url(url), f"{rng.choice(words)} page {i}", visited,
+                              add_frecency(None, 1.0, visited)))
+            store.db.executemany(
+                "INSERT INTO places (url, stripped, title, visit_count, last_visit, frecency) "
+                "VALUES (?, ?, ?, 1, ?, ?)", batch
+            )
+    store.close()
+
+def bench_history(args):
+    from core.history import connect, has_fts, suggest
+
+    path = os.path.join(tempfile.mkdtemp(), "history.db")
+    started = time.perf_counter()
+    fill_history(path, args.rows)
+    fill_time = time.perf_counter() - started
+
+    db = connect(path)
+    fts = has_fts(db)
+    results = {"rows": args.rows, "fill_s": round(fill_time, 1), "queries": {}}
+    failed = []
+    for query in SUGGEST_QUERIES:
+        samples = []
+        for _ in range(max(args.runs, 20)):
+            started = time.perf_counter()
+            suggest(db, query, fts=fts)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        results["queries"][query] = {"median_ms": round(statistics.median(samples), 3), "p95_ms": round(p95, 3)}
+        if p95 > SUGGEST_BUDGET_MS:
+            failed.append(query)
+    return results, failed
+
+# Проверка одного запроса блокировщиком (мкс, 95-й перцентиль)
+FILTER_BUDGET_US = 50
+
+def write_filter_list(path, rng):
+    words = ["ad", "ads", "banner", "track", "pixel", "promo", "sponsor", "analytics", "beacon", "popunder"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[Adblock Plus 2.0]\n! синтетический список для замеров\n")
+        for i in range(30000):
+            f.write(f"||{rng.choice(words)}{i}.tracker{i % 97}.com^\n")
+        for i in range(15000):
+            f.write(f"/{rng.choice(words)}/{rng.choice(words)}{i}_*.js$script,third-party\n")
+        for i in range(5000):
+            f.write(f"||cdn{i}.example.org/{rng.choice(words)}^$image,domain=site{i % 300}.com\n")
+            f.write(f"@@||cdn{i}.example.org/{rng.choice(words)}/allowed^\n")
+            f.write(f"site{i}.com##.{rng.choice(words)}-box\n")
+
+def bench_filters(args):
+    from core.filters import load_engine
+
+    rng = random.Random(1)
+    directory = tempfile.mkdtemp()
+    list_file = os.path.join(directory, "synthetic.txt")
+    cache_path = os.path.join(directory, "filters.cache")
+    write_filter_list(list_file, rng)
+
+    started = time.perf_counter()
+    engine = load_engine([list_file], cache_path)
+    compile_time = time.perf_counter() - started
+    started = time.perf_counter()
+    load_engine([list_file], cache_path)
+    cached_time = time.perf_counter() - started
+
+    requests = []
+    for i in range(20000):
+        host = rng.choice([f"cdn{i % 5000}.example.org", f"ad{i}.tracker{i % 97}.com", "static.news.com", "img.site.ru"])
+        path = rng.choice(["/ads/banner12_x.js", "/img/logo.png", "/track/pixel.gif?id=1", "/app/main.js"])
+        requests.append((f"https://{host}{path}", host, f"site{i % 400}.com", rng.choice(["script", "image", "xmlhttprequest"])))
+
+    # Первый проход включает ленивую компиляцию регулярок, бюджет проверяется на втором
+    passes = []
+    for _ in range(2):
+        samples = []
+        blocked = 0
+        for request in requests:
+            started = time.perf_counter()
+            blocked += engine.should_block(*request)
+            samples.append((time.perf_counter() - started) * 1e6)
+        samples.sort()
+        passes.append(samples)
+    cold, samples = passes
+    p95 = samples[int(len(samples) * 0.95) - 1]
+
+    results = {
+        "rules": len(engine),
+        "compile_s": round(compile_time, 2),
+        "cached_load_s": round(cached_time, 3),
+        "cold_p95_us": round(cold[int(len(cold) * 0.95) - 1], 2),
+        "median_us": round(statistics.median(samples), 2),
+        "p95_us": round(p95, 2),
+        "blocked": blocked,
+        "requests": len(requests),
+    }
+    return results, (["p95_us"] if p95 > FILTER_BUDGET_US else [])
+
+# Поиск по хранилищу паролей на одно нажатие клавиши (мс, 95-й перцентиль)
+SEARCH_BUDGET_MS = 10
+SEARCH_QUERIES = ["g", "goo", "google12", "gogle123", "githb55", "mailuser12", "bank.com", "user",
+                  "yandex999.ru", "amazn1234", "shopuser5@mail.ru", "forum123.co.uk", "zzzz"]
+
+def bench_search(args):
+    from premium.search import VaultIndex
+
+    rng = random.Random(1)
+    words = ["google", "mail", "yandex", "github", "amazon", "bank", "shop", "forum", "news", "cloud"]
+    entries = [
+        {"id": i, "site": f"{rng.choice(['www.', 'login.', ''])}{rng.choice(words)}{i}.{rng.choice(['com', 'ru', 'co.uk'])}",
+         "username": f"{rng.choice(words)}user{i % 977}@mail.ru"}
+        for i in range(args.entries)
+    ]
+    index = VaultIndex()
+    started = time.perf_counter()
+    index.load(entries)
+    load_time = time.perf_counter() - started
+
+    # Точечные изменения индекса при добавлении, правке и удалении записи
+    started = time.perf_counter()
+    for i in range(1000):
+        index.put({"id": args.entries + i, "site": f"new{i}.example.com", "username": "someone"})
+        index.put({"id": i, "site": f"edited{i}.example.org", "username": entries[i]["username"]})
+        index.remove(args.entries + i)
+    update_us = (time.perf_counter() - started) / 3000 * 1e6
+
+    results = {"entries": args.entries, "load_s": round(load_time, 2), "update_us": round(update_us, 1), "queries": {}}
+    failed = []
+    for query in SEARCH_QUERIES:
+        samples = []
+        for _ in range(max(args.runs, 20)):
+            started = time.perf_counter()
+            matches = index.search(query)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        results["queries"][query] = {"median_ms": round(statistics.median(samples), 3), "p95_ms": round(p95, 3),
+                                     "matches": len(matches)}
+        if p95 > SEARCH_BUDGET_MS:
+            failed.append(query)
+    return results, failed
+
+# Разблокировка хранилища (мс) и расшифровка одной записи (мкс)
+UNLOCK_BUDGET_MS = 1000
+CACHED_UNLOCK_BUDGET_MS = 1
+DECRYPT_BUDGET_US = 50
+
+def bench_vault(args):
+    from premium.credentials import CredentialStore
+    from premium.vault import Vault, available, key_cache
+
+    if not available():
+        return {"error": "не установлен пакет cryptography"}, []
+    store = CredentialStore(os.path.join(tempfile.mkdtemp(), "passwords.db"), legacy_path=None)
+    with store.db:
+        store.db.executemany(
+            "INSERT INTO credentials (site, username, password) VALUES (?, ?, ?)",
+            [(f"site{i}.example.com", f"user{i}", f"secret-{i}-password") for i in range(args.entries)]
+        )
+    vault = Vault(store.path, store)
+    started = time.perf_counter()
+    vault.create("master password")
+    create_time = time.perf_counter() - started
+    started = time.perf_counter()
+    vault.seal_plaintext()
+    seal_time = time.perf_counter() - started
+
+    unlock = []
+    for _ in range(args.runs):
+        vault.lock()
+        started = time.perf_counter()
+        vault.unlock("master password")
+        unlock.append((time.perf_counter() - started) * 1000)
+    cached = []
+    for _ in range(1000):
+        started = time.perf_counter()
+        vault.unlock("master password")
+        cached.append((time.perf_counter() - started) * 1000)
+
+    entries = store.all()
+    samples = []
+    for entry in entries[:20000]:
+        started = time.perf_counter()
+        vault.open(entry)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    autofill_ok = autofill_finds_dialog_entries(store, vault)
+    key_cache.clear()
+
+    results = {
+        "entries": args.entries,
+        "create_ms": round(create_time * 1000, 1),
+        "seal_all_s": round(seal_time, 2),
+        "unlock_ms": round(statistics.median(unlock), 1),
+        "cached_unlock_ms": round(statistics.median(cached), 4),
+        "decrypt_median_us": round(statistics.median(samples), 2),
+        "decrypt_p95_us": round(p95, 2),
+    }
+    failed = []
+    if results["unlock_ms"] > UNLOCK_BUDGET_MS:
+        failed.append("unlock_ms")
+    if results["cached_unlock_ms"] > CACHED_UNLOCK_BUDGET_MS:
+        failed.append("cached_unlock_ms")
+    if p95 > DECRYPT_BUDGET_US:
+        failed.append("decrypt_p95_us")
+    if not autofill_ok:
+        failed.append("autofill_hosts")
+    return results, failed
+
+# Как пользователь вводит сайт в диалоге пароля, и адрес, на котором запись должна подставиться
+AUTOFILL_SITES = [
+    ("https://GitHub.com/login", "https://github.com/session"),
+    ("www.example.org", "https://example.org/"),
+    ("Mail.Example.net", "https://www.mail.example.net/"),
+]
+
+def autofill_finds_dialog_entries(store, vault):
+    # Запись проходит тот же путь, что в менеджере паролей: диалог -> seal -> хранилище -> индекс
+    from PyQt6.QtCore import QUrl, QEvent
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    from premium.passwords import PasswordDialog
+    from premium.autofill import build_index, find_credentials
+
+    ids = {}
+    for site, url in AUTOFILL_SITES:
+        dialog = PasswordDialog(None, site, "autofill-user", "autofill-password")
+        data = dialog.get_data()
+        dialog.deleteLater()
+        sealed = vault.seal(data["site"], data["username"], data["password"])
+        ids[url] = store.add(data["site"], data["username"], sealed)
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    index = build_index(store.all())
+    for url, entry_id in ids.items():
+        found = find_credentials(index, QUrl(url).host())
+        if [entry["id"] for entry in found] != [entry_id] or vault.open(found[0]) != "autofill-password":
+            return False
+    # Соседний поддомен того же eTLD+1 пароль не получает
+    return not find_credentials(index, "gist.github.com")
+
+# Цена fsync: атомарная запись файла и журнал с fsync на каждую запись и на пачку
+JOURNAL_BATCH = 100
+
+def bench_fsync(args):
+    from core.storage import Journal, atomic_write
+
+    directory = tempfile.mkdtemp(dir=args.dir)
+    payload = json.dumps({"tabs": {str(i): {"url": f"https://example.com/{i}", "title": "x" * 40} for i in range(50)}})
+    record = {"op": "update", "id": "tab", "url": "https://example.com/page", "title": "Страница"}
+    runs = max(args.runs, 50)
+
+    def median_ms(action):
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            action()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    path = os.path.join(directory, "snapshot.json")
+    durable_ms = median_ms(lambda: atomic_write(path, payload))
+    plain_ms = median_ms(lambda: atomic_write(path, payload, durable=False))
+
+    journal = Journal(os.path.join(directory, "each.journal"))
+    each_ms = median_ms(lambda: journal.append(record))
+    journal.close()
+
+    journal = Journal(os.path.join(directory, "batch.journal"))
+    batch_ms = median_ms(lambda: journal.extend([record] * JOURNAL_BATCH))
+    journal.close()
+
+    journal = Journal(os.path.join(directory, "interval.journal"), sync_interval=1.0)
+    interval_ms = median_ms(lambda: journal.append(record))
+    journal.close()
+    shutil.rmtree(directory)
+
+    results = {
+        "directory": directory,
+        "atomic_write_ms": round(durable_ms, 3),
+        "atomic_write_no_fsync_ms": round(plain_ms, 3),
+        "journal_fsync_each_us": round(each_ms * 1000, 1),
+        "journal_batch_per_record_us": round(batch_ms * 1000 / JOURNAL_BATCH, 1),
+        "journal_sync_interval_us": round(interval_ms * 1000, 1),
+    }
+    # Пачка должна делить стоимость fsync, иначе батчинг ничего не даёт
+    failed = [] if batch_ms / JOURNAL_BATCH < each_ms else ["journal_batch_per_record_us"]
+    return results, failed
+
+# Открытие, переключение и закрытие вкладок на локальных страницах
+TAB_OPEN_BUDGET_MS = 1500
+TAB_SWITCH_BUDGET_MS = 50
+# Доля памяти, которая должна вернуться после закрытия вкладок
+TAB_RELEASE_MIN = 0.5
+
+FIXTURE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Страница {index}</title>
+<style>div {{ margin: 4px; padding: 8px; background: #{color:06x}; }}</style></head>
+<body><h1>Страница {index}</h1>{blocks}
+<script>for (let i = 0; i < 2000; i++) document.body.dataset["k" + (i % 50)] = i;</script>
+</body></html>
+"""
+
+def write_fixtures(directory, count):
+    rng = random.Random(1)
+    for index in range(count):
+        blocks = "".join(f"<div>Блок {i} {'текст ' * rng.randint(20, 80)}</div>" for i in range(200))
+        with open(os.path.join(directory, f"page{index}.html"), "w", encoding="utf-8") as f:
+            f.write(FIXTURE_PAGE.format(index=index, color=rng.randint(0, 0xffffff), blocks=blocks))
+
+def serve_fixtures(directory):
+    import threading
+    import functools
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def process_tree():
+    # Браузер и все его потомки: зигота, рендереры, GPU-процесс
+    parents = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        parents.setdefault(int(stat.rsplit(")", 1)[1].split()[1]), []).append(int(name))
+    tree = [os.getpid()]
+    for pid in tree:
+        tree.extend(parents.get(pid, []))
+    return tree
+
+def tree_memory():
+    rss = 0
+    renderers = 0
+    for pid in process_tree():
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                rss += next((int(line.split()[1]) * 1024 for line in f if line.startswith("VmRSS:")), 0)
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                renderers += b"--type=renderer" in f.read()
+        except OSError:
+            continue
+    return rss, renderers
+
+def bench_tabs(args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import runpy
+    from PyQt6.QtCore import QUrl, QEventLoop, QTimer, QCoreApplication, QEvent
+
+    fixtures = tempfile.mkdtemp()
+    write_fixtures(fixtures, args.tabs)
+    if args.fixture == "http":
+        server, base = serve_fixtures(fixtures)
+    else:
+        server, base = None, QUrl.fromLocalFile(fixtures).toString()
+
+    # Свой каталог данных, чтобы не трогать профиль и сессию пользователя
+    workdir = tempfile.mkdtemp()
+    with open(os.path.join(workdir, "settings.json"), "w", encoding="utf-8") as f:
+        json.dump({"restore_session": False, "adblock_enabled": False, "tab_freeze_after": 0,
+                   "tab_discard_after": 0}, f)
+    os.environ["GOVNO_DATA_DIR"] = workdir
+    sys.path.insert(0, ROOT)
+    browser_module = runpy.run_path(BROWSER_SCRIPT, run_name="govno_browser")
+    app = browser_module["QApplication"].instance() or browser_module["QApplication"](sys.argv)
+
+    def wait(signal=None, timeout=10000):
+        loop = QEventLoop()
+        if signal is not None:
+            signal.connect(loop.quit)
+        # Таймер останавливается после ожидания, иначе позже он оборвёт чужой цикл и исказит замеры
+        deadline = QTimer(singleShot=True)
+        deadline.timeout.connect(loop.quit)
+        deadline.start(timeout)
+        loop.exec()
+        deadline.stop()
+        if signal is not None:
+            signal.disconnect(loop.quit)
+
+    def flush_deleted():
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+        app.processEvents()
+
+    window = browser_module["BrowserWindow"](fast_launch=True)
+    window.show()
+    wait(timeout=1000)
+    baseline_rss, baseline_renderers = tree_memory()
+
+    open_samples = []
+    for index in range(args.tabs):
+        started = time.perf_counter()
+        window.add_new_tab(QUrl(f"{base}/page{index}.html"))
+        wait(window.tab_widget.currentWidget().loadFinished)
+        open_samples.append((time.perf_counter() - started) * 1000)
+    wait(timeout=1000)
+    opened_rss, opened_renderers = tree_memory()
+
+    switch_samples = []
+    rng = random.Random(1)
+    for _ in range(max(args.runs, 50)):
+        index = rng.randrange(window.tab_widget.count())
+        started = time.perf_counter()
+        window.tab_widget.setCurrentIndex(index)
+        app.processEvents()
+        switch_samples.append((time.perf_counter() - started) * 1000)
+
+    close_samples = []
+    while window.tab_widget.count() > 1:
+        started = time.perf_counter()
+        window.close_tab(window.tab_widget.count() - 1)
+        flush_deleted()
+        close_samples.append((time.perf_counter() - started) * 1000)
+    # Рендереры завершаются асинхронно, даём им время уйти
+    wait(timeout=3000)
+    flush_deleted()
+    closed_rss, closed_renderers = tree_memory()
+
+    # Вкладки в контейнерах: память по контейнерам, после закрытия последней вкладки профиль удаляется
+    names = window.containers.names()
+    for index in range(args.tabs if names else 0):
+        window.add_new_tab(QUrl(f"{base}/page{index}.html"), names[index % len(names)])
+        wait(window.tab_widget.currentWidget().loadFinished)
+    wait(timeout=1000)
+    container_usage = window.lifecycle.container_usage()
+    while window.tab_widget.count() > 1:
+        window.close_tab(window.tab_widget.count() - 1)
+        flush_deleted()
+    flush_deleted()
+    profiles_left = len(window.containers.live_profiles())
+
+    window.close()
+    flush_deleted()
+    if server:
+        server.shutdown()
+
+    def summary(samples):
+        samples = sorted(samples)
+        return {"median_ms": round(statistics.median(samples), 2),
+                "p95_ms": round(samples[max(int(len(samples) * 0.95) - 1, 0)], 2)}
+
+    grown = opened_rss - baseline_rss
+    released = (opened_rss - closed_rss) / grown if grown > 0 else 1.0
+    results = {
+        "tabs": args.tabs,
+        "fixture": args.fixture,
+        "open": summary(open_samples),
+        "switch": summary(switch_samples),
+        "close": summary(close_samples),
+        "memory": {
+            "baseline_mb": round(baseline_rss / 2 ** 20, 1),
+            "opened_mb": round(opened_rss / 2 ** 20, 1),
+            "closed_mb": round(closed_rss / 2 ** 20, 1),
+            "per_tab_mb": round(grown / args.tabs / 2 ** 20, 1),
+            "released": round(released, 2),
+        },
+        "renderers": {"baseline": baseline_renderers, "opened": opened_renderers, "closed": closed_renderers},
+        "containers": {
+            "memory_mb": {name or "основной": round(rss / 2 ** 20, 1) for name, rss in container_usage.items()},
+            "profiles_left": profiles_left,
+        },
+    }
+    failed = []
+    if results["open"]["p95_ms"] > TAB_OPEN_BUDGET_MS:
+        failed.append("open")
+    if results["switch"]["p95_ms"] > TAB_SWITCH_BUDGET_MS:
+        failed.append("switch")
+    # Закрытые вкладки должны отдавать память и процессы рендеринга
+    if released < TAB_RELEASE_MIN or closed_renderers > baseline_renderers + 1:
+        failed.append("memory")
+    if profiles_left:
+        failed.append("containers")
+    return results, failed
+
+# Импорт и экспорт паролей: время на запись (мкс) и рост пиковой памяти (МБ)
+TRANSFER_ROW_BUDGET_US = 50
+TRANSFER_MEMORY_BUDGET_MB = 64
+
+def bench_transfer(args):
+    import csv
+    import resource
+    from premium.credentials import CredentialStore
+    from premium.transfer import TransferWorker
+    from premium.vault import Vault, key_cache
+
+    directory = tempfile.mkdtemp()
+    source = os.path.join(directory, "chrome.csv")
+    with open(source, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "url", "username", "password"])
+        for i in range(args.entries):
+            writer.writerow([f"site{i}.example.com", f"https://site{i}.example.com/login", f"user{i}", f"secret-{i}"])
+    path = os.path.join(directory, "passwords.db")
+    store = CredentialStore(path)
+    Vault(path, store).create("master password")
+    store.close()
+
+    worker = TransferWorker(path)
+    outcome = []
+    worker.finished.connect(lambda op, result: outcome.append((op, result)))
+
+    def run(op, filename):
+        started = time.perf_counter()
+        worker.run(op, filename)
+        return (time.perf_counter() - started) * 1e6 / args.entries
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    import_us = run("import", source)
+    imported = outcome[-1]
+    duplicate_us = run("import", source)
+    duplicates = outcome[-1]
+    export_us = run("export", os.path.join(directory, "export.json"))
+    # ru_maxrss на Linux в килобайтах
+    grown_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak) / 1024
+    key_cache.clear()
+    shutil.rmtree(directory)
+
+    results = {
+        "entries": args.entries,
+        "import": imported,
+        "reimport": duplicates,
+        "import_per_row_us": round(import_us, 2),
+        "reimport_per_row_us": round(duplicate_us, 2),
+        "export_per_row_us": round(export_us, 2),
+        "peak_memory_growth_mb": round(grown_mb, 1),
+    }
+    failed = []
+    # Повторный импорт того же файла не должен добавить ни одной записи
+    if imported[0] != "import" or duplicates[0] != "import" or duplicates[1]["added"]:
+        failed.append("import")
+    if max(import_us, duplicate_us, export_us) > TRANSFER_ROW_BUDGET_US:
+        failed.append("per_row_us")
+    if grown_mb > TRANSFER_MEMORY_BUDGET_MB:
+        failed.append("peak_memory_growth_mb")
+    return results, failed
+
+# Проверка паролей: проход по хранилищу (мкс на запись) и поиск в списке утечек (мкс)
+AUDIT_ROW_BUDGET_US = 60
+BREACH_LOOKUP_BUDGET_US = 50
+BREACH_ENTRIES = 1000000
+
+def bench_audit(args):
+    import hashlib
+    from premium.audit import AuditWorker, BreachIndex
+    from premium.credentials import CredentialStore
+    from premium.vault import Vault, key_cache
+
+    directory = tempfile.mkdtemp()
+    breach_path = os.path.join(directory, "pwned-passwords.txt")
+    hashes = sorted(hashlib.sha1(f"leaked-{i}".encode()).hexdigest().upper() for i in range(BREACH_ENTRIES))
+    with open(breach_path, "w", encoding="ascii") as f:
+        f.writelines(f"{digest}:{i % 1000 + 1}\n" for i, digest in enumerate(hashes))
+    del hashes
+
+    path = os.path.join(directory, "passwords.db")
+    store = CredentialStore(path)
+    vault = Vault(path, store)
+    vault.create("master password")
+    # Каждый десятый пароль повторяется, каждый двадцатый есть в утечках
+    passwords = [f"leaked-{i}" if i % 20 == 0 else f"Secret-{i % (args.entries * 9 // 10)}-pass!"
+                 for i in range(args.entries)]
+    with store.db:
+        store.db.executemany(
+            "INSERT INTO credentials (site, username, password) VALUES (?, ?, ?)",
+            [(f"site{i}.example.com", f"user{i}", vault.seal(f"site{i}.example.com", f"user{i}", password))
+             for i, password in enumerate(passwords)]
+        )
+    store.close()
+
+    index = BreachIndex(breach_path)
+    samples = []
+    for i in range(20000):
+        started = time.perf_counter()
+        index.count(f"leaked-{i * 37}" if i % 2 else f"missing-{i}")
+        samples.append((time.perf_counter() - started) * 1e6)
+    index.close()
+    samples.sort()
+    lookup_p95 = samples[int(len(samples) * 0.95) - 1]
+
+    worker = AuditWorker(path, breach_path)
+    outcome = []
+    worker.finished.connect(lambda op, result: outcome.append((op, result)))
+    started = time.perf_counter()
+    worker.run()
+    audit_us = (time.perf_counter() - started) * 1e6 / args.entries
+    key_cache.clear()
+    shutil.rmtree(directory)
+
+    op, report = outcome[-1]
+    results = {
+        "entries": args.entries,
+        "breach_entries": BREACH_ENTRIES,
+        "audit_per_row_us": round(audit_us, 2),
+        "breach_lookup_median_us": round(statistics.median(samples), 2),
+        "breach_lookup_p95_us": round(lookup_p95, 2),
+    }
+    if op != "audit":
+        return dict(results, error=report), ["audit"]
+    results.update(reused_groups=len(report["reused"]), weak=len(report["weak"]),
+                   similar_groups=len(report["similar"]), breached=len(report["breached"]))
+    failed = []
+    if report["breach_check"] is False or len(report["breached"]) != (args.entries + 19) // 20:
+        failed.append("breached")
+    if audit_us > AUDIT_ROW_BUDGET_US:
+        failed.append("audit_per_row_us")
+    if lookup_p95 > BREACH_LOOKUP_BUDGET_US:
+        failed.append("breach_lookup_p95_us")
+    return results, failed
+
+# Пул прокси на локальных заглушках: задержки HTTP- и SOCKS5-прокси (мс). Пробы идут
+# параллельно, поэтому общее время проверки не должно сильно превышать самую медленную.
+PROXY_DELAYS_MS = [("http", 300), ("socks5", 40), ("http", 120), ("socks5", 200)]
+PROXY_PROBE_OVERHEAD_MS = 150
+
+def bench_proxy(args):
+    import asyncio
+    import threading
+    from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+    from premium.proxy import AUTO_PROXY, ProxyManager, probe_all
+
+    async def stand_in(reader, writer, kind, delay, status=b"204 No Content"):
+        # Заглушка прокси: проходит рукопожатие SOCKS5 (с логином user/secret, если его прислали)
+        # и вместо похода в сеть сама отвечает status через delay мс
+        try:
+            if kind == "socks5":
+                count = (await reader.readexactly(2))[1]
+                if 2 in await reader.readexactly(count):
+                    writer.write(b"\x05\x02")
+                    user = await reader.readexactly((await reader.readexactly(2))[1])
+                    password = await reader.readexactly((await reader.readexactly(1))[0])
+                    writer.write(b"\x01\x00" if (user, password) == (b"user", b"secret") else b"\x01\x01")
+                else:
+                    writer.write(b"\x05\x00")
+                header = await reader.readexactly(5)
+                await reader.readexactly(header[4] + 2)
+                writer.write(b"\x05\x00\x00\x01" + bytes(6))
+            await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(delay / 1000)
+            writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    def serve(kind, delay, *status):
+        start = asyncio.start_server(lambda r, w: stand_in(r, w, kind, delay, *status), "127.0.0.1", 0)
+        return asyncio.run_coroutine_threadsafe(start, loop).result()
+
+    servers = {}
+    pool = []
+    for number, (kind, delay) in enumerate(PROXY_DELAYS_MS):
+        name = f"{kind}-{delay}ms"
+        servers[name] = serve(kind, delay)
+        pool.append({"name": name, "type": kind, "host": "127.0.0.1", "port": servers[name].sockets[0].getsockname()[1],
+                     "username": "user" if number == 1 else "", "password": "secret" if number == 1 else ""})
+    # Порт, на котором никто не слушает: прокси недоступен
+    probe_socket = socket.socket()
+    probe_socket.bind(("127.0.0.1", 0))
+    pool.append({"name": "dead", "type": "http", "host": "127.0.0.1", "port": probe_socket.getsockname()[1],
+                 "username": "", "password": ""})
+    probe_socket.close()
+    # Самый быстрый, но отвечает 403 вместо адреса проверки: не годится, как и недоступный
+    servers["forbidden"] = serve("http", 10, b"403 Forbidden")
+    pool.append({"name": "forbidden", "type": "http", "host": "127.0.0.1",
+                 "port": servers["forbidden"].sockets[0].getsockname()[1], "username": "", "password": ""})
+    target = "http://probe.invalid/generate_204"
+
+    started = time.perf_counter()
+    probes = asyncio.run(probe_all(pool, target, timeout=2))
+    probe_ms = (time.perf_counter() - started) * 1000
+
+    directory = tempfile.mkdtemp()
+    config = os.path.join(directory, "proxies.json")
+    with open(config, "w", encoding="utf-8") as f:
+        json.dump({"probe_url": target, "proxies": pool}, f)
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    manager = ProxyManager(app, config)
+
+    def wait_probe():
+        waiter = QEventLoop()
+        manager.status_changed.connect(lambda: manager.probing or waiter.quit())
+        deadline = QTimer(singleShot=True)
+        deadline.timeout.connect(waiter.quit)
+        deadline.start(10000)
+        started = time.perf_counter()
+        waiter.exec()
+        deadline.stop()
+        manager.status_changed.disconnect()
+        return (time.perf_counter() - started) * 1000
+
+    manager.set_proxy(AUTO_PROXY)
+    wait_probe()
+    chosen = manager.current["name"] if manager.current else None
+    # Самый быстрый прокси падает: при следующей проверке выбирается следующий по скорости
+    loop.call_soon_threadsafe(servers[chosen].close)
+    time.sleep(0.1)
+    manager.probe()
+    failover_ms = wait_probe()
+    failover = manager.current["name"] if manager.current else None
+    manager.set_proxy("Без прокси")
+    manager.close()
+    shutil.rmtree(directory)
+    loop.call_soon_threadsafe(loop.stop)
+
+    healthy = sorted((latency, proxy["name"]) for proxy, (latency, _) in zip(pool, probes) if latency is not None)
+    slowest = max(delay for _, delay in PROXY_DELAYS_MS)
+    results = {
+        "proxies": {proxy["name"]: round(latency, 1) if latency is not None else error
+                    for proxy, (latency, error) in zip(pool, probes)},
+        "probe_all_ms": round(probe_ms, 1),
+        "probe_sum_ms": round(sum(latency for latency, _ in healthy), 1),
+        "chosen": chosen,
+        "failover_to": failover,
+        "failover_ms": round(failover_ms, 1),
+    }
+    failed = []
+    if probe_ms > slowest + PROXY_PROBE_OVERHEAD_MS:
+        failed.append("probe_all_ms")
+    if len(healthy) != len(PROXY_DELAYS_MS) or chosen != healthy[0][1]:
+        failed.append("chosen")
+    if failover != healthy[1][1]:
+        failed.append("failover_to")
+    return results, failed
+
+# Маршрутизация прокси по правилам: одно решение (мкс) на тысячах доменов и подсетей
+ROUTE_BUDGET_US = 5
+ROUTE_RULES = 20000
+ROUTE_NETWORKS = 2000
+
+def bench_routing(args):
+    from PyQt6.QtCore import QCoreApplication
+    from PyQt6.QtQml import QJSEngine
+    from premium.routing import compile_rules
+
+    rng = random.Random(1)
+    pool = [{"name": "proxy", "type": "http", "host": "127.0.0.1", "port": 3128}]
+    rules = ["* PROXY", "<local> DIRECT"]
+    for i in range(ROUTE_RULES):
+        rules.append(f"{('', '*.', '.')[i % 3]}host{i}.corp{i % 50}.example DIRECT")
+    for i in range(ROUTE_NETWORKS):
+        rules.append(f"10.{i % 256}.{i // 256}.0/24 DIRECT")
+    rules.append("10.0.0.0/8 SOCKS5 127.0.0.1:1080")
+
+    started = time.perf_counter()
+    router = compile_rules(rules, pool)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    hosts = []
+    for _ in range(100000):
+        i = rng.randrange(ROUTE_RULES * 2)
+        kind = rng.random()
+        if kind < 0.4:
+            hosts.append(f"www.host{i}.corp{i % 50}.example")
+        elif kind < 0.7:
+            hosts.append(f"cdn{i}.static.example.com")
+        elif kind < 0.9:
+            hosts.append(f"10.{rng.randrange(256)}.{rng.randrange(16)}.{rng.randrange(256)}")
+        else:
+            hosts.append(f"printer{i}")
+
+    route = router.route
+    started = time.perf_counter()
+    decisions = [route(host) for host in hosts]
+    python_us = (time.perf_counter() - started) * 1e6 / len(hosts)
+
+    # Тот же PAC, что получит Chromium, выполняется в QJSEngine и должен решать так же
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    engine = QJSEngine(app)
+    pac = router.pac()
+    engine.evaluate(pac)
+    find_proxy = engine.globalObject().property("FindProxyForURL")
+    sample = hosts[:5000]
+    started = time.perf_counter()
+    pac_decisions = [find_proxy.call(["http://example/", host]).toString() for host in sample]
+    pac_us = (time.perf_counter() - started) * 1e6 / len(sample)
+    mismatches = sum(a != b for a, b in zip(decisions, pac_decisions))
+
+    results = {
+        "rules": len(rules),
+        "compile_ms": round(compile_ms, 1),
+        "pac_kb": round(len(pac.encode()) / 1024, 1),
+        "route_us": round(python_us, 3),
+        "decisions_per_s": round(1e6 / python_us),
+        "pac_route_us": round(pac_us, 2),
+        "pac_mismatches": mismatches,
+        "direct_share": round(decisions.count("DIRECT") / len(decisions), 3),
+    }
+    failed = []
+    if python_us > ROUTE_BUDGET_US:
+        failed.append("route_us")
+    if mismatches:
+        failed.append("pac_mismatches")
+    return results, failed
+
+# Загрузки: локальный сервер с Range и ограничением скорости на соединение, как у настоящих
+# зеркал. Сегменты должны ускорять загрузку, лимит - держать скорость, докачка - не качать заново.
+DOWNLOAD_SIZE_MB = 32
+DOWNLOAD_CONNECTION_MBPS = 8
+DOWNLOAD_SPEEDUP_MIN = 2.0
+DOWNLOAD_LIMIT_KB = 2048
+DOWNLOAD_LIMIT_TOLERANCE = 0.25
+DOWNLOAD_MAX_ACTIVE = 2
+
+def bench_downloads(args):
+    import hashlib
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+    from core.downloads import DONE, PAUSED, ACTIVE, DownloadManager
+
+    payload = random.Random(1).randbytes(DOWNLOAD_SIZE_MB * 2 ** 20)
+    digest = hashlib.sha256(payload).hexdigest()
+    served = {"bytes": 0}
+    lock = threading.Lock()
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            size = len(payload) if self.path.startswith("/big") else len(payload) // 8
+            start, end = 0, size - 1
+            ranged = self.headers.get("Range", "").startswith("bytes=") and self.headers.get("If-Range", '"v1"') == '"v1"'
+            if ranged:
+                first, _, last = self.headers["Range"][6:].partition("-")
+                start, end = int(first), min(int(last) if last else size - 1, size - 1)
+            self.send_response(206 if ranged else 200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(end - start + 1))
+            if ranged:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            chunk = 64 * 1024
+            try:
+                for offset in range(start, end + 1, chunk):
+                    data = payload[offset:min(offset + chunk, end + 1)]
+                    self.wfile.write(data)
+                    with lock:
+                        served["bytes"] += len(data)
+                    time.sleep(len(data) / (DOWNLOAD_CONNECTION_MBPS * 2 ** 20))
+            except OSError:
+                pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    directory = tempfile.mkdtemp()
+    settings = {"download_directory": directory, "download_max_active": DOWNLOAD_MAX_ACTIVE,
+                "download_segments": 1, "download_limit_kb": 0, "download_item_limit_kb": 0}
+    state_path = os.path.join(directory, "downloads.json")
+    peak = {"active": 0}
+
+    def wait_until(manager, done, timeout=60000):
+        waiter = QEventLoop()
+
+        def check():
+            peak["active"] = max(peak["active"], sum(item["state"] == ACTIVE for item in manager.items))
+            if done():
+                waiter.quit()
+        # changed приходит раз в секунду, условие проверяем чаще
+        poll = QTimer()
+        poll.timeout.connect(check)
+        poll.start(20)
+        # Свой таймер на каждое ожидание: забытый singleShot сработал бы посреди следующего
+        deadline = QTimer(singleShot=True)
+        deadline.timeout.connect(waiter.quit)
+        deadline.start(timeout)
+        check()
+        if not done():
+            waiter.exec()
+        poll.stop()
+        deadline.stop()
+
+    def download(manager, path):
+        started = time.perf_counter()
+        download_id = manager.add_url(f"{base}{path}")
+        item = manager.find(download_id)
+        wait_until(manager, lambda: item["state"] not in ("queued", ACTIVE))
+        return item, time.perf_counter() - started
+
+    def content(item):
+        with open(item["path"], "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    manager = DownloadManager(state_path, settings, app)
+    single, single_s = download(manager, "/big")
+    settings["download_segments"] = 4
+    segmented, segmented_s = download(manager, "/big")
+
+    settings["download_segments"] = 1
+    settings["download_limit_kb"] = DOWNLOAD_LIMIT_KB
+    manager.apply_settings()
+    limited, limited_s = download(manager, "/small")
+    limited_rate = len(payload) // 8 / limited_s / 1024
+    settings["download_limit_kb"] = 0
+    manager.apply_settings()
+
+    # Очередь: одновременно идёт не больше download_max_active загрузок
+    peak["active"] = 0
+    queue = [manager.find(manager.add_url(f"{base}/small?{index}", f"queue{index}.bin")) for index in range(5)]
+    wait_until(manager, lambda: all(item["state"] == DONE for item in queue))
+    queue_peak = peak["active"]
+
+    # Докачка после перезапуска: пауза на середине, новый менеджер из того же downloads.json
+    settings["download_segments"] = 4
+    settings["download_item_limit_kb"] = DOWNLOAD_LIMIT_KB * 4
+    resumed = manager.find(manager.add_url(f"{base}/big", "resumed.bin"))
+    wait_until(manager, lambda: resumed["segments"] and sum(s[2] for s in resumed["segments"]) >= len(payload) // 2)
+    manager.pause(resumed["id"])
+    wait_until(manager, lambda: resumed["state"] == PAUSED)
+    manager.close()
+    before_restart = served["bytes"]
+    fetched = sum(s[2] for s in resumed["segments"])
+    manager = DownloadManager(state_path, settings, app)
+    manager.resume(resumed["id"])
+    resumed = manager.find(resumed["id"])
+    wait_until(manager, lambda: resumed["state"] not in ("queued", ACTIVE))
+    refetched = served["bytes"] - before_restart - (len(payload) - fetched)
+    manager.close()
+    server.shutdown()
+
+    ok = {name: item["state"] == DONE and content(item) == digest
+          for name, item in (("single", single), ("segmented", segmented), ("resumed", resumed))}
+    shutil.rmtree(directory)
+    speedup = single_s / segmented_s
+    results = {
+        "size_mb": DOWNLOAD_SIZE_MB,
+        "single_s": round(single_s, 2),
+        "segmented_s": round(segmented_s, 2),
+        "speedup": round(speedup, 2),
+        "limit_kb": DOWNLOAD_LIMIT_KB,
+        "limited_kb_s": round(limited_rate),
+        "queue_peak_active": queue_peak,
+        "resumed_at_mb": round(fetched / 2 ** 20, 1),
+        "refetched_kb": round(refetched / 1024),
+        "intact": ok,
+    }
+    failed = [name for name, good in ok.items() if not good]
+    if limited["state"] != DONE:
+        failed.append("limited")
+    if speedup < DOWNLOAD_SPEEDUP_MIN:
+        failed.append("speedup")
+    if abs(limited_rate - DOWNLOAD_LIMIT_KB) > DOWNLOAD_LIMIT_KB * DOWNLOAD_LIMIT_TOLERANCE:
+        failed.append("limit")
+    if queue_peak > DOWNLOAD_MAX_ACTIVE:
+        failed.append("queue")
+    # При докачке заново скачивается не больше одного куска на соединение
+    if refetched > 4 * 64 * 1024:
+        failed.append("refetched")
+    return results, failed
+
+BENCHMARKS = {
+    "imports": bench_imports,
+    "history": bench_history,
+    "filters": bench_filters,
+    "tabs": bench_tabs,
+    "search": bench_search,
+    "vault": bench_vault,
+    "fsync": bench_fsync,
+    "transfer": bench_transfer,
+    "audit": bench_audit,
+    "proxy": bench_proxy,
+    "routing": bench_routing,
+    "downloads": bench_downloads,
+}
+
+def git_commit():
+    # Чтобы результаты разных коммитов можно было сравнивать между собой
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True,
+                              capture_output=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности GovnoBrowser")
+    parser.add_argument("benchmark", choices=BENCHMARKS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=1000000, help="размер истории для history")
+    parser.add_argument("--entries", type=int, default=100000, help="размер хранилища паролей для search, vault, transfer и audit")
+    parser.add_argument("--tabs", type=int, default=20, help="число вкладок для tabs")
+    parser.add_argument("--fixture", choices=["http", "file"], default="http", help="откуда грузить страницы для tabs")
+    parser.add_argument("--dir", help="каталог для fsync, по умолчанию временный (может быть tmpfs)")
+    parser.add_argument("--output", help="куда сохранить результаты в JSON")
+    args = parser.parse_args()
+
+    results, failed = BENCHMARKS[args.benchmark](args)
+    report = json.dumps({"benchmark": args.benchmark, "commit": git_commit(), "results": results, "failed": failed},
+                        indent=4, ensure_ascii=False)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+    if failed:
+        print(f"Превышен бюджет: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
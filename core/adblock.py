@@ -0,0 +1,86 @@
+import os
+import time
+import threading
+import urllib.request
+from urllib.parse import urlsplit
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+from core.filters import load_engine
+from core.storage import atomic_write
+
+ResourceType = QWebEngineUrlRequestInfo.ResourceType
+# Переходы в основном фрейме не блокируем никогда, у остальных запросов тип как в EasyList
+REQUEST_TYPES = {
+    ResourceType.ResourceTypeSubFrame: "subdocument",
+    ResourceType.ResourceTypeStylesheet: "stylesheet",
+    ResourceType.ResourceTypeScript: "script",
+    ResourceType.ResourceTypeImage: "image",
+    ResourceType.ResourceTypeFavicon: "image",
+    ResourceType.ResourceTypeFontResource: "font",
+    ResourceType.ResourceTypeMedia: "media",
+    ResourceType.ResourceTypeObject: "object",
+    ResourceType.ResourceTypePluginResource: "object",
+    ResourceType.ResourceTypeXhr: "xmlhttprequest",
+    ResourceType.ResourceTypeJson: "xmlhttprequest",
+    ResourceType.ResourceTypePing: "ping",
+    ResourceType.ResourceTypeCspReport: "ping",
+    ResourceType.ResourceTypeWebSocket: "websocket",
+    ResourceType.ResourceTypeSubResource: "other",
+    ResourceType.ResourceTypePrefetch: "other",
+    ResourceType.ResourceTypeWorker: "script",
+    ResourceType.ResourceTypeSharedWorker: "script",
+    ResourceType.ResourceTypeServiceWorker: "script",
+    ResourceType.ResourceTypeUnknown: "other",
+}
+
+LIST_MAX_AGE = 4 * 24 * 3600
+
+def list_path(directory, url):
+    return os.path.join(directory, os.path.basename(urlsplit(url).path) or "filters.txt")
+
+def update_lists(directory, urls):
+    # Скачивает устаревшие списки, возвращает True, если хоть один файл обновился
+    os.makedirs(directory, exist_ok=True)
+    updated = False
+    for url in urls:
+        path = list_path(directory, url)
+        try:
+            if time.time() - os.path.getmtime(path) < LIST_MAX_AGE:
+                continue
+        except OSError:
+            pass
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                data = response.read()
+        except OSError:
+            continue
+        atomic_write(path, data, durable=False)
+        updated = True
+    return updated
+
+class ContentBlocker(QWebEngineUrlRequestInterceptor):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.engine = None
+        self.blocked = 0
+
+    def interceptRequest(self, info):
+        engine = self.engine
+        resource_type = REQUEST_TYPES.get(info.resourceType())
+        if engine is None or resource_type is None:
+            return
+        url = info.requestUrl()
+        if engine.should_block(url.toString(), url.host(), info.firstPartyUrl().host(), resource_type):
+            info.block(True)
+            self.blocked += 1
+
+    def load(self, directory, cache_path, urls):
+        # Пока индекс грузится в фоне, запросы проходят без проверки
+        def run():
+            paths = [list_path(directory, url) for url in urls]
+            existing = [path for path in paths if os.path.exists(path)]
+            if existing:
+                self.engine = load_engine(existing, cache_path)
+            if update_lists(directory, urls):
+                self.engine = load_engine([path for path in paths if os.path.exists(path)], cache_path)
+
+        threading.Thread(target=run, name="content-blocker", daemon=True).start()
@@ -0,0 +1,156 @@
+import os
+import struct
+from urllib.parse import urlsplit
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QLineEdit, QPushButton, QSpinBox, QMessageBox
+)
+
+# Заголовок записи Simple Cache в Chromium: magic, версия, длина ключа, хэш ключа
+SIMPLE_CACHE_MAGIC = 0xfcfb6d1ba7725c30
+SIMPLE_CACHE_HEADER = struct.Struct("<QIII4x")
+
+def read_cache_key(path):
+    try:
+        with open(path, "rb") as f:
+            header = f.read(SIMPLE_CACHE_HEADER.size)
+            if len(header) < SIMPLE_CACHE_HEADER.size:
+                return None
+            magic, _version, key_length, _key_hash = SIMPLE_CACHE_HEADER.unpack(header)
+            if magic != SIMPLE_CACHE_MAGIC:
+                return None
+            return f.read(key_length).decode("utf-8", "replace")
+    except OSError:
+        return None
+
+def key_host(key):
+    # Ключ вида "1/0/_dk_https://site https://site https://site/file.js", адрес ресурса последним
+    return urlsplit(key.split(" ")[-1]).hostname or ""
+
+class CacheManager:
+    def __init__(self, profile):
+        self.profile = profile
+
+    def stats(self):
+        size = 0
+        entries = set()
+        for root, _dirs, files in os.walk(self.profile.cachePath()):
+            for name in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    continue
+                if name.endswith(("_0", "_s")):
+                    entries.add(name.rsplit("_", 1)[0])
+        return {
+            "path": self.profile.cachePath(),
+            "size": size,
+            "entries": len(entries),
+            "limit": self.profile.httpCacheMaximumSize(),
+        }
+
+    def set_size_limit(self, size):
+        self.profile.setHttpCacheMaximumSize(min(size, 2**31 - 1))
+
+    def clear(self):
+        self.profile.clearHttpCache()
+
+    def clear_origin(self, host):
+        # Удаление по сайту работает только для формата Simple Cache (Linux, macOS).
+        # Возвращает число удалённых записей или None, если формат кэша другой.
+        host = host.lower().strip(".")
+        supported = False
+        removed = 0
+        for root, _dirs, files in os.walk(self.profile.cachePath()):
+            for name in files:
+                if not name.endswith("_0"):
+                    continue
+                key = read_cache_key(os.path.join(root, name))
+                if key is None:
+                    continue
+                supported = True
+                entry_host = key_host(key)
+                if entry_host != host and not entry_host.endswith("." + host):
+                    continue
+                prefix = name[:-2]
+                for suffix in ("_0", "_1", "_s"):
+                    try:
+                        os.remove(os.path.join(root, prefix + suffix))
+                    except OSError:
+                        pass
+                removed += 1
+        return removed if supported else None
+
+class CacheDialog(QDialog):
+    def __init__(self, manager, settings, save_settings, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.settings = settings
+        self.save_settings = save_settings
+        self.setWindowTitle("Кэш")
+        self.resize(420, 260)
+
+        layout = QVBoxLayout()
+
+        title = QLabel("🗄️ HTTP-кэш")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: white;")
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        self.stats_label = QLabel()
+        self.stats_label.setStyleSheet("color: #bbbbbb;")
+        self.stats_label.setWordWrap(True)
+        layout.addWidget(self.stats_label)
+
+        form = QFormLayout()
+        self.size_input = QSpinBox()
+        self.size_input.setRange(16, 2047)
+        self.size_input.setSuffix(" МБ")
+        self.size_input.setValue(self.settings["cache_size_mb"])
+        self.size_input.editingFinished.connect(self.apply_size_limit)
+        form.addRow("Лимит размера:", self.size_input)
+
+        origin_layout = QHBoxLayout()
+        self.origin_input = QLineEdit()
+        self.origin_input.setPlaceholderText("example.com")
+        clear_origin_btn = QPushButton("Очистить сайт")
+        clear_origin_btn.clicked.connect(self.clear_origin)
+        origin_layout.addWidget(self.origin_input)
+        origin_layout.addWidget(clear_origin_btn)
+        form.addRow("Сайт:", origin_layout)
+        layout.addLayout(form)
+
+        clear_btn = QPushButton("🧹 Очистить весь кэш")
+        clear_btn.clicked.connect(self.clear_all)
+        layout.addWidget(clear_btn)
+
+        self.setLayout(layout)
+        self.manager.profile.clearHttpCacheCompleted.connect(self.update_stats)
+        self.update_stats()
+
+    def update_stats(self):
+        stats = self.manager.stats()
+        self.stats_label.setText(
+            f"Папка: {stats['path']}\n"
+            f"Занято: {stats['size'] / 1024 / 1024:.1f} из {stats['limit'] / 1024 / 1024:.0f} МБ, "
+            f"записей: {stats['entries']}"
+        )
+
+    def apply_size_limit(self):
+        self.settings["cache_size_mb"] = self.size_input.value()
+        self.save_settings()
+        self.manager.set_size_limit(self.size_input.value() * 1024 * 1024)
+        self.update_stats()
+
+    def clear_origin(self):
+        host = self.origin_input.text().strip()
+        if not host:
+            return
+        removed = self.manager.clear_origin(host)
+        if removed is None:
+            QMessageBox.warning(self, "Кэш", "Этот формат кэша не поддерживает очистку по сайту, очистите весь кэш.")
+        else:
+            QMessageBox.information(self, "Кэш", f"Удалено записей: {removed}")
+        self.update_stats()
+
+    def clear_all(self):
+        self.manager.clear()
@@ -0,0 +1,77 @@
+import os
+import uuid
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineProfile
+from core.paths import data_path
+
+# Контейнер без имени - основной профиль браузера
+DEFAULT_CONTAINER = ""
+
+def container_slug(name):
+    # Имя каталога и storageName не зависят от букв в имени контейнера
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"govno-container:{name}").hex[:12]
+
+class ProfilePool(QObject):
+    # Вкладки одного контейнера делят один профиль: кэш, cookies и процессы рендереров
+    # существуют один раз. Профиль создаётся с первой вкладкой контейнера и удаляется
+    # после закрытия последней; основной профиль живёт всё время.
+    released = pyqtSignal(object)
+
+    def __init__(self, default_profile, containers, cache_size, configure, parent=None):
+        super().__init__(parent)
+        self.default_profile = default_profile
+        self.containers = containers
+        self.cache_size = cache_size
+        self.configure = configure
+        self.profiles = {}
+        self.refs = {}
+
+    def names(self):
+        return list(self.containers)
+
+    def color(self, name):
+        return self.containers.get(name, {}).get("color", "")
+
+    def is_private(self, name):
+        return bool(self.containers.get(name, {}).get("private", False))
+
+    def create(self, name):
+        if self.is_private(name):
+            # Профиль без имени - off-the-record: кэш и cookies только в памяти
+            profile = QWebEngineProfile(self)
+        else:
+            slug = container_slug(name)
+            storage_path = data_path("containers", slug)
+            profile = QWebEngineProfile(f"container-{slug}", self)
+            profile.setPersistentStoragePath(storage_path)
+            profile.setCachePath(os.path.join(storage_path, "cache"))
+            profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+            profile.setHttpCacheMaximumSize(self.cache_size)
+        self.configure(profile)
+        return profile
+
+    def acquire(self, name):
+        if name not in self.containers:
+            return self.default_profile
+        if name not in self.profiles:
+            self.profiles[name] = self.create(name)
+        self.refs[name] = self.refs.get(name, 0) + 1
+        return self.profiles[name]
+
+    def release(self, name):
+        if name not in self.refs:
+            return
+        self.refs[name] -= 1
+        if self.refs[name] == 0:
+            del self.refs[name]
+            profile = self.profiles.pop(name)
+            # Сначала свои скрытые страницы убирают те, кто ещё держит профиль
+            self.released.emit(profile)
+            # deleteLater: страницы закрытой вкладки удаляются раньше, профиль их не переживает
+            profile.deleteLater()
+
+    def tab_count(self, name):
+        return self.refs.get(name, 0)
+
+    def live_profiles(self):
+        return list(self.profiles.values())
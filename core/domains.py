@@ -0,0 +1,39 @@
+# Самые частые составные публичные суффиксы. Полный Public Suffix List не тащим,
+# для группировки сайтов этого хватает.
+MULTI_LABEL_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp",
+    "com.br", "net.br", "org.br", "gov.br",
+    "com.cn", "net.cn", "org.cn", "gov.cn",
+    "com.ru", "net.ru", "org.ru", "msk.ru", "spb.ru",
+    "com.ua", "net.ua", "org.ua", "kiev.ua",
+    "co.in", "net.in", "org.in", "gov.in",
+    "co.nz", "org.nz", "co.za", "co.kr", "or.kr",
+    "com.tr", "com.mx", "com.ar", "com.tw", "com.hk", "com.sg",
+    "github.io", "gitlab.io", "netlify.app", "vercel.app", "herokuapp.com",
+    "blogspot.com", "appspot.com", "pages.dev", "workers.dev",
+}
+
+def normalize_host(host):
+    host = host.strip().lower().rstrip(".")
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].split("@")[-1]
+    if host.startswith("["):
+        return host.split("]", 1)[0] + "]"
+    host = host.split(":", 1)[0]
+    return host[4:] if host.startswith("www.") else host
+
+def is_ip(host):
+    return host.startswith("[") or host.replace(".", "").isdigit()
+
+def registrable_domain(host):
+    # eTLD+1: news.bbc.co.uk -> bbc.co.uk, mail.google.com -> google.com
+    host = normalize_host(host)
+    if not host or is_ip(host):
+        return host
+    labels = host.split(".")
+    if len(labels) >= 3 and ".".join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
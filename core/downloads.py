@@ -0,0 +1,604 @@
+import os
+import time
+import uuid
+import threading
+from http.client import HTTPException
+from urllib.parse import quote, unquote, urlsplit
+from urllib.request import ProxyHandler, Request, build_opener
+from PyQt6.QtCore import Qt, QObject, QThread, QTimer, QUrl, QStandardPaths, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton, QSpinBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from core.storage import read_json, write_json
+
+USER_AGENT = "GovnoBrovser/1.0"
+PART_SUFFIX = ".part"
+TIMEOUT = 15
+CHUNK_SIZE = 16 * 1024
+# Файлы меньше этого на каждое соединение не делятся: лишние запросы дороже выигрыша
+SEGMENT_MIN_SIZE = 4 * 1024 * 1024
+# После простоя ограничитель скорости разрешает всплеск не больше чем на столько секунд
+RATE_BURST = 0.1
+# Сколько завершённых и отменённых загрузок помнить в списке
+KEEP_FINISHED = 100
+
+# Кто ведёт загрузку: Python-клиент (сегменты, лимиты, докачка после перезапуска) или Chromium.
+# Загрузки из браузера Python-клиент берёт, только если это большой файл с поддержкой Range
+HTTP = "http"
+BROWSER = "browser"
+
+QUEUED = "queued"
+ACTIVE = "active"
+PAUSED = "paused"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FALLBACK = "fallback"
+
+STATE_NAMES = {
+    QUEUED: "В очереди", ACTIVE: "Загружается", PAUSED: "Пауза",
+    DONE: "Готово", FAILED: "Ошибка", CANCELLED: "Отменена",
+}
+
+class RangeLost(Exception):
+    pass
+
+def format_size(size):
+    for unit in ("Б", "КБ", "МБ"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} ГБ"
+
+def default_directory():
+    return (QStandardPaths.writableLocation(QStandardPaths.StandardLocation.DownloadLocation)
+            or os.path.expanduser("~"))
+
+def python_proxies():
+    # Python-клиент ходит через тот же прокси, что и страницы. SOCKS5 и PAC он не умеет -
+    # тогда загрузку ведёт Chromium (None), пустой словарь - без прокси
+    if "--proxy-pac-url" in os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", ""):
+        return None
+    from PyQt6.QtNetwork import QNetworkProxy
+    proxy = QNetworkProxy.applicationProxy()
+    if proxy.type() in (QNetworkProxy.ProxyType.NoProxy, QNetworkProxy.ProxyType.DefaultProxy):
+        return {}
+    if proxy.type() != QNetworkProxy.ProxyType.HttpProxy:
+        return None
+    login = f"{quote(proxy.user(), safe='')}:{quote(proxy.password(), safe='')}@" if proxy.user() else ""
+    address = f"http://{login}{proxy.hostName()}:{proxy.port()}"
+    return {"http": address, "https": address}
+
+def plan_segments(size, count):
+    # [начало, конец включительно, скачано байт]; конец -1 - размер неизвестен, одно соединение
+    if size <= 0:
+        return [[0, -1, 0]]
+    count = max(1, min(count, size // SEGMENT_MIN_SIZE))
+    step = -(-size // count)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+def remaining(segment):
+    return -1 if segment[1] < 0 else segment[1] + 1 - segment[0] - segment[2]
+
+def probe(opener, url):
+    # Запрос одного байта: по ответу видно размер, поддержку докачки и версию файла
+    response = opener.open(Request(url, headers={"User-Agent": USER_AGENT, "Range": "bytes=0-0"}), timeout=TIMEOUT)
+    with response:
+        headers = response.headers
+        validator = headers.get("ETag", "")
+        if not validator or validator.startswith("W/"):
+            validator = headers.get("Last-Modified", "")  # слабый ETag для If-Range не годится
+        total = headers.get("Content-Range", "").rpartition("/")[2]
+        if response.status == 206 and total.isdigit():
+            size, ranges = int(total), True
+        else:
+            length = headers.get("Content-Length", "")
+            size, ranges = (int(length) if length.isdigit() else -1), False
+        content_type = headers.get_content_type() if headers.get("Content-Type") else ""
+        return {"size": size, "ranges": ranges, "validator": validator, "type": content_type}
+
+def python_can_take(info):
+    # У Chromium остаются cookies, Referer и тело POST исходного запроса, у Python-клиента их нет.
+    # Поэтому у браузера забираем только большие файлы с докачкой по Range, где сегменты окупаются;
+    # страница вместо файла (вход, ошибка) или неизвестный тип - тоже дело Chromium
+    return (info["ranges"] and info["size"] >= SEGMENT_MIN_SIZE
+            and info["type"] != "" and "html" not in info["type"])
+
+class RateLimiter:
+    # Общий для потоков «виртуальный таймер»: каждый кусок сдвигает момент, когда канал
+    # снова свободен, и поток спит до него. rate - байт в секунду, 0 - без ограничения.
+    def __init__(self, rate=0):
+        self.rate = rate
+        self.free_at = 0.0
+        self.lock = threading.Lock()
+
+    def consume(self, amount):
+        rate = self.rate
+        if rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.free_at = max(self.free_at, now - RATE_BURST) + amount / rate
+            delay = self.free_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+class DownloadWorker(QObject):
+    # Живёт в отдельном QThread; большие файлы качаются несколькими соединениями,
+    # каждое пишет свой диапазон в общий .part-файл
+    accepted = pyqtSignal(str)
+    finished = pyqtSignal(str, str, str)
+
+    def __init__(self, item, limiters, segments, proxies, browser=False):
+        super().__init__()
+        self.item = item
+        self.limiters = limiters
+        self.segments = segments
+        self.opener = build_opener(ProxyHandler(proxies))
+        self.browser = browser  # загрузку начал Chromium и может довести её сам
+        self.stop = None
+
+    @pyqtSlot()
+    def run(self):
+        item = self.item
+        try:
+            try:
+                status = self.download()
+            except RangeLost:
+                # Файл на сервере сменился: докачка невозможна, качаем заново
+                item["size"] = None
+                self.stop = None
+                status = self.download()
+        except (OSError, ValueError, HTTPException, RangeLost) as e:
+            self.finished.emit(item["id"], FAILED, str(e) or type(e).__name__)
+        else:
+            self.finished.emit(item["id"], status, "")
+
+    def download(self):
+        item = self.item
+        part = item["path"] + PART_SUFFIX
+        if item["size"] is None:
+            try:
+                info = probe(self.opener, item["url"])
+            except (OSError, ValueError, HTTPException):
+                if self.browser:
+                    return FALLBACK  # HTTPError, URLError, таймаут: Chromium попробует со своими cookies
+                raise
+            if self.browser and not python_can_take(info):
+                return FALLBACK
+            item.update(size=info["size"], ranges=info["ranges"], validator=info["validator"])
+            item["segments"] = plan_segments(info["size"] if info["ranges"] else -1, self.segments)
+            with open(part, "wb") as f:
+                if info["ranges"]:
+                    f.truncate(info["size"])  # место под все сегменты сразу
+        elif not os.path.exists(part):
+            for segment in item["segments"]:
+                segment[2] = 0
+            open(part, "wb").close()
+        self.accepted.emit(item["id"])
+
+        pending = [segment for segment in item["segments"] if remaining(segment)]
+        if len(pending) == 1:
+            self.fetch(pending[0], part)
+        elif pending:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(len(pending)) as pool:
+                futures = [pool.submit(self.fetch, segment, part) for segment in pending]
+            for future in futures:
+                future.result()
+        if self.stop is not None:
+            return self.stop
+
+        received = sum(segment[2] for segment in item["segments"])
+        if any(remaining(segment) > 0 for segment in item["segments"]) or item["size"] > received:
+            raise OSError("Соединение оборвалось до конца файла")
+        item["size"] = received
+        os.replace(part, item["path"])
+        return DONE
+
+    def fetch(self, segment, part):
+        try:
+            self.fetch_segment(segment, part)
+        except BaseException:
+            # Остальные соединения этой загрузки останавливаются, ошибка уйдёт в run
+            if self.stop is None:
+                self.stop = FAILED
+            raise
+
+    def fetch_segment(self, segment, part):
+        item = self.item
+        headers = {"User-Agent": USER_AGENT}
+        if item["ranges"]:
+            headers["Range"] = f"bytes={segment[0] + segment[2]}-{segment[1]}"
+            if item["validator"]:
+                headers["If-Range"] = item["validator"]
+        else:
+            segment[2] = 0  # без Range продолжить нельзя, только заново
+        with self.opener.open(Request(item["url"], headers=headers), timeout=TIMEOUT) as response, \
+                open(part, "r+b", buffering=0) as f:
+            if item["ranges"] and response.status != 206:
+                raise RangeLost()
+            f.seek(segment[0] + segment[2])
+            if not item["ranges"]:
+                f.truncate()
+            # Без буфера: записанное в состоянии уже лежит в файле, даже если процесс упадёт
+            while self.stop is None:
+                size = CHUNK_SIZE if segment[1] < 0 else min(CHUNK_SIZE, remaining(segment))
+                if size <= 0:
+                    break
+                data = response.read(size)
+                if not data:
+                    break
+                for limiter in self.limiters:
+                    limiter.consume(len(data))
+                f.write(data)
+                segment[2] += len(data)
+
+class DownloadManager(QObject):
+    # Очередь с ограничением одновременных загрузок, общий и личный лимиты скорости.
+    # Состояние (и прогресс каждого сегмента) пишется в downloads.json, после перезапуска
+    # незаконченные загрузки продолжаются с места остановки.
+    changed = pyqtSignal()
+
+    def __init__(self, state_path, settings, parent=None):
+        super().__init__(parent)
+        self.state_path = state_path
+        self.settings = settings
+        self.limiter = RateLimiter()
+        self.items = read_json(state_path, {}).get("downloads", [])
+        self.requests = {}  # id -> QWebEngineDownloadRequest, пока загрузку может вести Chromium
+        self.workers = {}
+        self.threads = {}
+        self.speed = {}
+        self.last_received = {}
+        self.last_tick = time.monotonic()
+        for item in self.items:
+            if item["state"] in (QUEUED, ACTIVE):
+                if item["kind"] == HTTP:
+                    item["state"] = QUEUED
+                else:
+                    item["state"], item["error"] = FAILED, "Прервана при закрытии браузера"
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.tick)
+        self.apply_settings()
+
+    def directory(self):
+        return self.settings["download_directory"] or default_directory()
+
+    def find(self, download_id):
+        return next((item for item in self.items if item["id"] == download_id), None)
+
+    def unique_path(self, filename):
+        directory = self.directory()
+        os.makedirs(directory, exist_ok=True)
+        name, ext = os.path.splitext(os.path.basename(filename) or "download")
+        taken = {item["path"] for item in self.items if item["state"] != CANCELLED}
+        path = os.path.join(directory, name + ext)
+        number = 1
+        while path in taken or os.path.exists(path) or os.path.exists(path + PART_SUFFIX):
+            path = os.path.join(directory, f"{name} ({number}){ext}")
+            number += 1
+        return path
+
+    def add_item(self, url, path, mime, kind, private=False):
+        item = {
+            "id": uuid.uuid4().hex, "url": url, "path": path, "mime": mime, "kind": kind,
+            "state": QUEUED, "error": "", "size": None, "ranges": False, "validator": "",
+            "segments": [], "received": 0, "private": private,
+        }
+        self.items.append(item)
+        finished = [old for old in self.items if old["state"] in (DONE, CANCELLED)]
+        for old in finished[:-KEEP_FINISHED]:
+            self.items.remove(old)
+        return item
+
+    def add_request(self, request):
+        # Обработчик QWebEngineProfile.downloadRequested
+        path = self.unique_path(request.downloadFileName())
+        request.setDownloadDirectory(os.path.dirname(path))
+        request.setDownloadFileName(os.path.basename(path))
+        request.accept()
+        # Пока загрузка в очереди или Python-клиент проверяет сервер, Chromium стоит на паузе
+        request.pause()
+        url = request.url()
+        use_python = url.scheme() in ("http", "https") and not request.isSavePageDownload()
+        # Загрузки приватных контейнеров видны только в этом запуске: в downloads.json их нет
+        page = request.page()
+        private = page is not None and page.profile().isOffTheRecord()
+        item = self.add_item(url.toString(), path, request.mimeType(), HTTP if use_python else BROWSER, private)
+        download_id = item["id"]
+        self.requests[download_id] = request
+        request.isFinishedChanged.connect(lambda: self.on_browser_finished(download_id))
+        self.schedule()
+        return download_id
+
+    def add_url(self, url, filename="", mime=""):
+        filename = filename or unquote(os.path.basename(urlsplit(url).path))
+        item = self.add_item(url, self.unique_path(filename), mime, HTTP)
+        self.schedule()
+        return item["id"]
+
+    def apply_settings(self):
+        self.limiter.rate = self.settings["download_limit_kb"] * 1024
+        for worker in self.workers.values():
+            worker.limiters[1].rate = self.settings["download_item_limit_kb"] * 1024
+        self.schedule()
+
+    def received(self, item):
+        request = self.requests.get(item["id"])
+        if item["kind"] == BROWSER and request is not None:
+            return request.receivedBytes()
+        if item["segments"]:
+            return sum(segment[2] for segment in item["segments"])
+        return item["received"]
+
+    def total_size(self, item):
+        request = self.requests.get(item["id"])
+        if item["kind"] == BROWSER and request is not None:
+            return request.totalBytes()
+        return item["size"] if item["size"] is not None else -1
+
+    def schedule(self):
+        free = self.settings["download_max_active"] - sum(item["state"] == ACTIVE for item in self.items)
+        for item in self.items:
+            if free <= 0:
+                break
+            if item["state"] == QUEUED:
+                self.start(item)
+                free -= 1
+        if any(item["state"] == ACTIVE for item in self.items) and not self.timer.isActive():
+            self.last_tick = time.monotonic()
+            self.timer.start()
+        self.save()
+        self.changed.emit()
+
+    def start(self, item):
+        item["state"], item["error"] = ACTIVE, ""
+        self.last_received[item["id"]] = self.received(item)
+        proxies = python_proxies() if item["kind"] == HTTP else None
+        if proxies is None:
+            self.hand_to_browser(item, "Через этот прокси файл может скачать только браузер")
+            return
+        worker = DownloadWorker(
+            item, [self.limiter, RateLimiter(self.settings["download_item_limit_kb"] * 1024)],
+            self.settings["download_segments"], proxies, item["id"] in self.requests
+        )
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.accepted.connect(self.on_accepted)
+        worker.finished.connect(self.on_finished)
+        self.workers[item["id"]] = worker
+        self.threads[item["id"]] = thread
+        thread.start()
+
+    def hand_to_browser(self, item, error):
+        request = self.requests.get(item["id"])
+        if request is None or request.isFinished():
+            item["state"], item["error"] = FAILED, error
+            return
+        item["kind"], item["state"] = BROWSER, ACTIVE
+        request.resume()
+
+    def on_accepted(self, download_id):
+        # Файл качает Python-клиент: загрузку Chromium больше не держим
+        request = self.requests.pop(download_id, None)
+        if request is not None:
+            request.cancel()
+
+    def on_finished(self, download_id, status, error):
+        self.workers.pop(download_id)
+        thread = self.threads.pop(download_id)
+        thread.quit()
+        thread.wait()
+        thread.deleteLater()
+        item = self.find(download_id)
+        if status == FALLBACK:
+            self.hand_to_browser(item, "Сервер отдаёт файл только браузеру")
+        else:
+            item["state"], item["error"] = status, error
+            if status == CANCELLED:
+                self.remove_part(item)
+        self.schedule()
+
+    def on_browser_finished(self, download_id):
+        request = self.requests.pop(download_id, None)
+        item = self.find(download_id)
+        if request is None or item is None:
+            return
+        from PyQt6.QtWebEngineCore import QWebEngineDownloadRequest
+        state = request.state()
+        item["size"], item["received"] = request.totalBytes(), request.receivedBytes()
+        if state == QWebEngineDownloadRequest.DownloadState.DownloadCompleted:
+            item["state"] = DONE
+        elif state == QWebEngineDownloadRequest.DownloadState.DownloadCancelled:
+            item["state"] = CANCELLED
+        else:
+            item["state"], item["error"] = FAILED, request.interruptReasonString()
+        self.schedule()
+
+    def pause(self, download_id):
+        item = self.find(download_id)
+        if download_id in self.workers:
+            self.workers[download_id].stop = PAUSED  # состояние сменится, когда поток остановится
+            return
+        if item["state"] == ACTIVE and download_id in self.requests:
+            self.requests[download_id].pause()
+        if item["state"] in (ACTIVE, QUEUED):
+            item["state"] = PAUSED
+            self.schedule()
+
+    def resume(self, download_id):
+        item = self.find(download_id)
+        if item["state"] not in (PAUSED, FAILED):
+            return
+        if item["kind"] == BROWSER and download_id not in self.requests:
+            # Chromium после перезапуска не докачивает: повторяем через Python-клиент с начала
+            item.update(kind=HTTP, size=None, segments=[], received=0)
+        item["state"] = QUEUED
+        self.schedule()
+
+    def cancel(self, download_id):
+        item = self.find(download_id)
+        if download_id in self.workers:
+            self.workers[download_id].stop = CANCELLED
+            return
+        request = self.requests.pop(download_id, None)
+        if request is not None:
+            request.cancel()
+        if item["state"] in (QUEUED, ACTIVE, PAUSED, FAILED):
+            item["state"] = CANCELLED
+            self.remove_part(item)
+            self.schedule()
+
+    def remove_part(self, item):
+        try:
+            os.remove(item["path"] + PART_SUFFIX)
+        except OSError:
+            pass
+
+    def tick(self):
+        # Скорость - прирост за секунду; заодно сохраняем прогресс сегментов
+        now = time.monotonic()
+        elapsed = max(now - self.last_tick, 1e-3)
+        self.last_tick = now
+        active = [item for item in self.items if item["state"] == ACTIVE]
+        self.speed = {}
+        for item in active:
+            received = self.received(item)
+            self.speed[item["id"]] = max(received - self.last_received.get(item["id"], received), 0) / elapsed
+            self.last_received[item["id"]] = received
+        if not active:
+            self.timer.stop()
+        self.save()
+        self.changed.emit()
+
+    def throughput(self):
+        return sum(self.speed.values())
+
+    def save(self):
+        items = [item for item in self.items if not item.get("private")]
+        write_json(self.state_path, {"downloads": items}, durable=False)
+
+    def close(self):
+        # Незаконченные загрузки остаются в очереди и продолжатся при следующем запуске
+        self.timer.stop()
+        for worker in self.workers.values():
+            worker.stop = PAUSED
+        for thread in self.threads.values():
+            thread.quit()
+            thread.wait()
+        for item in self.items:
+            if item.get("private") and item["state"] not in (DONE, CANCELLED):
+                self.remove_part(item)  # приватная загрузка не продолжается, недокачанное не оставляем
+            elif item["state"] == ACTIVE and item["kind"] == HTTP:
+                item["state"] = QUEUED
+        self.save()
+
+class DownloadsDialog(QDialog):
+    COLUMNS = ["Файл", "Размер", "Скорость", "Состояние"]
+
+    def __init__(self, manager, settings, save_settings, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.settings = settings
+        self.save_settings = save_settings
+        self.ids = []
+        self.setWindowTitle("Загрузки")
+        self.resize(640, 420)
+
+        layout = QVBoxLayout()
+
+        title = QLabel("⬇️ Загрузки")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: white;")
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        self.throughput_label = QLabel()
+        self.throughput_label.setStyleSheet("color: #bbbbbb;")
+        layout.addWidget(self.throughput_label)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        for text, action in (("⏸ Пауза", manager.pause), ("▶ Продолжить", manager.resume),
+                             ("✖ Отменить", manager.cancel)):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _checked, action=action: self.apply_to_selected(action))
+            buttons.addWidget(button)
+        folder_btn = QPushButton("📂 Папка")
+        folder_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(manager.directory())))
+        buttons.addWidget(folder_btn)
+        layout.addLayout(buttons)
+
+        form = QFormLayout()
+        self.inputs = {}
+        for key, label, minimum, maximum, suffix in (
+            ("download_max_active", "Одновременно:", 1, 10, ""),
+            ("download_segments", "Соединений на файл:", 1, 16, ""),
+            ("download_limit_kb", "Общий лимит:", 0, 1024 * 1024, " КБ/с"),
+            ("download_item_limit_kb", "Лимит на загрузку:", 0, 1024 * 1024, " КБ/с"),
+        ):
+            spin = QSpinBox()
+            spin.setRange(minimum, maximum)
+            spin.setSuffix(suffix)
+            if not minimum:
+                spin.setSpecialValueText("без лимита")
+            spin.setValue(self.settings[key])
+            spin.editingFinished.connect(self.apply_settings)
+            self.inputs[key] = spin
+            form.addRow(label, spin)
+        layout.addLayout(form)
+
+        self.setLayout(layout)
+        self.manager.changed.connect(self.update_table)
+        self.update_table()
+
+    def selected_id(self):
+        row = self.table.currentRow()
+        return self.ids[row] if 0 <= row < len(self.ids) else None
+
+    def apply_to_selected(self, action):
+        download_id = self.selected_id()
+        if download_id:
+            action(download_id)
+
+    def apply_settings(self):
+        for key, spin in self.inputs.items():
+            self.settings[key] = spin.value()
+        self.save_settings()
+        self.manager.apply_settings()
+
+    def update_table(self):
+        selected = self.selected_id()
+        items = list(reversed(self.manager.items))
+        self.ids = [item["id"] for item in items]
+        self.table.setRowCount(len(items))
+        for row, item in enumerate(items):
+            received = self.manager.received(item)
+            total = self.manager.total_size(item)
+            size = format_size(received) + (f" из {format_size(total)}" if total > 0 and received < total else "")
+            speed = self.manager.speed.get(item["id"])
+            state = STATE_NAMES[item["state"]]
+            if item["error"]:
+                state += f": {item['error']}"
+            for column, text in enumerate((os.path.basename(item["path"]), size,
+                                           f"{format_size(speed)}/с" if speed is not None else "", state)):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        if selected in self.ids:
+            self.table.selectRow(self.ids.index(selected))
+
+        active = sum(item["state"] == ACTIVE for item in self.manager.items)
+        queued = sum(item["state"] == QUEUED for item in self.manager.items)
+        self.throughput_label.setText(
+            f"Скорость: {format_size(self.manager.throughput())}/с, загружается: {active}, в очереди: {queued}"
+        )
@@ -0,0 +1,224 @@
+import os
+import re
+import pickle
+from core.domains import registrable_domain
+from core.storage import atomic_write
+
+# Компилятор фильтров в формате EasyList/Adblock Plus (сетевые правила, без косметики).
+# Правила «||домен^» попадают в множество доменов, остальные раскладываются по индексу
+# токенов: для запроса проверяются только правила, чей токен встречается в адресе.
+ENGINE_VERSION = 2
+
+RESOURCE_TYPES = {
+    "script", "image", "stylesheet", "font", "media", "object", "subdocument",
+    "xmlhttprequest", "ping", "websocket", "other",
+}
+FLAG_OPTIONS = {"third-party", "~third-party", "first-party", "~first-party", "match-case"}
+
+TOKEN_RE = re.compile(r"[a-z0-9%]+")
+DOMAIN_RULE_RE = re.compile(r"^\|\|([a-z0-9.-]+)\^?$")
+SEPARATOR = r"(?:[^a-z0-9_.%-]|$)"
+
+def pattern_to_regex(pattern):
+    start = end = ""
+    if pattern.startswith("||"):
+        start = r"^[a-z][a-z0-9+.-]*://(?:[^/?#]*\.)?"
+        pattern = pattern[2:]
+    elif pattern.startswith("|"):
+        start = "^"
+        pattern = pattern[1:]
+    if pattern.endswith("|"):
+        end = "$"
+        pattern = pattern[:-1]
+    body = re.escape(pattern).replace(r"\*", ".*").replace(r"\^", SEPARATOR)
+    return start + body + end
+
+def pattern_tokens(pattern):
+    # Токен годится для индекса, только если с обеих сторон он ограничен разделителем или якорем,
+    # иначе «ads» из «ads.js» не нашёлся бы в адресе «/loads.js»
+    anchored_start = pattern.startswith("|")
+    anchored_end = pattern.endswith("|")
+    tokens = []
+    for match in TOKEN_RE.finditer(pattern):
+        before = pattern[match.start() - 1] if match.start() else ("|" if anchored_start else "*")
+        after = pattern[match.end()] if match.end() < len(pattern) else ("|" if anchored_end else "*")
+        if before != "*" and after != "*":
+            tokens.append(match.group())
+    return tokens
+
+class Rule:
+    __slots__ = ("source", "match_case", "types", "excluded_types", "third_party",
+                 "domains", "excluded_domains", "compiled")
+
+    def __init__(self, pattern, options):
+        self.match_case = "match-case" in options["flags"]
+        self.source = pattern_to_regex(pattern if self.match_case else pattern.lower())
+        self.types = options["types"]
+        self.excluded_types = options["excluded_types"]
+        self.third_party = options["third_party"]
+        self.domains = options["domains"]
+        self.excluded_domains = options["excluded_domains"]
+        self.compiled = None
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != "compiled"}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.compiled = None
+
+    def matches(self, url, lower_url, request):
+        if self.types and request["type"] not in self.types:
+            return False
+        if request["type"] in self.excluded_types:
+            return False
+        if self.third_party is not None and self.third_party != request["third_party"]:
+            return False
+        if self.domains or self.excluded_domains:
+            site_domains = request["site_domains"]
+            if self.excluded_domains and not self.excluded_domains.isdisjoint(site_domains):
+                return False
+            if self.domains and self.domains.isdisjoint(site_domains):
+                return False
+        if self.compiled is None:
+            self.compiled = re.compile(self.source)  # регулярки компилируются при первом обращении
+        return self.compiled.search(url if self.match_case else lower_url) is not None
+
+def parse_options(text):
+    options = {"flags": set(), "types": set(), "excluded_types": set(), "third_party": None,
+               "domains": set(), "excluded_domains": set()}
+    for option in filter(None, text.lower().split(",")):
+        if option.startswith("domain="):
+            for domain in option[7:].split("|"):
+                if domain.startswith("~"):
+                    options["excluded_domains"].add(domain[1:])
+                elif domain:
+                    options["domains"].add(domain)
+        elif option in RESOURCE_TYPES:
+            options["types"].add(option)
+        elif option.startswith("~") and option[1:] in RESOURCE_TYPES:
+            options["excluded_types"].add(option[1:])
+        elif option in FLAG_OPTIONS:
+            options["flags"].add(option)
+            if option in ("third-party", "~first-party"):
+                options["third_party"] = True
+            elif option in ("~third-party", "first-party"):
+                options["third_party"] = False
+        else:
+            return None  # popup, csp, redirect и прочее не поддерживаем - правило пропускаем
+    return options
+
+class RuleSet:
+    def __init__(self):
+        self.domains = set()
+        self.index = {}
+        self.generic = []
+
+    def add(self, pattern, options):
+        domain = DOMAIN_RULE_RE.match(pattern)
+        if domain and not any(options.values()):
+            self.domains.add(domain.group(1))
+            return
+        rule = Rule(pattern, options)
+        # Токены запроса берутся из адреса в нижнем регистре; регистр проверяет только регулярка правила
+        tokens = pattern_tokens(pattern.lower())
+        if not tokens:
+            self.generic.append(rule)
+            return
+        # Правило кладём в самую короткую корзину: частые токены вроде «ads» не должны
+        # собирать тысячи правил, которые придётся перебирать на каждом запросе
+        token = min(tokens, key=lambda t: (len(self.index.get(t, ())), -len(t)))
+        self.index.setdefault(token, []).append(rule)
+
+    def matches(self, url, lower_url, tokens, request):
+        if not self.domains.isdisjoint(request["host_suffixes"]):
+            return True
+        for token in tokens:
+            for rule in self.index.get(token, ()):
+                if rule.matches(url, lower_url, request):
+                    return True
+        for rule in self.generic:
+            if rule.matches(url, lower_url, request):
+                return True
+        return False
+
+    def __len__(self):
+        return len(self.domains) + sum(len(rules) for rules in self.index.values()) + len(self.generic)
+
+def host_suffixes(host):
+    labels = host.split(".")
+    return {".".join(labels[i:]) for i in range(len(labels))}
+
+class FilterEngine:
+    def __init__(self):
+        self.block = RuleSet()
+        self.allow = RuleSet()
+
+    def add(self, line):
+        line = line.strip()
+        if not line or line.startswith(("!", "[")) or "#" in line and ("##" in line or "#@#" in line or "#?#" in line or "#$#" in line):
+            return False
+        rules = self.block
+        if line.startswith("@@"):
+            rules = self.allow
+            line = line[2:]
+        pattern, options_text = line, ""
+        if "$" in line:
+            pattern, options_text = line.rsplit("$", 1)
+        if pattern.startswith("/") and pattern.endswith("/") and len(pattern) > 1:
+            return False  # регулярные выражения в фильтрах слишком медленные
+        options = parse_options(options_text)
+        if options is None or not pattern.strip("*"):
+            return False
+        rules.add(pattern, options)
+        return True
+
+    def add_file(self, path):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                self.add(line)
+
+    def should_block(self, url, host, site_host, resource_type):
+        host = host.lower()
+        site_host = (site_host or host).lower()
+        lower_url = url.lower()
+        request = {
+            "type": resource_type,
+            "host_suffixes": host_suffixes(host),
+            "site_domains": host_suffixes(site_host),
+            "third_party": registrable_domain(host) != registrable_domain(site_host),
+        }
+        tokens = set(TOKEN_RE.findall(lower_url))
+        if not self.block.matches(url, lower_url, tokens, request):
+            return False
+        return not self.allow.matches(url, lower_url, tokens, request)
+
+    def __len__(self):
+        return len(self.block) + len(self.allow)
+
+def lists_signature(paths):
+    signature = [ENGINE_VERSION]
+    for path in sorted(paths):
+        stat = os.stat(path)
+        signature.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    return signature
+
+def load_engine(paths, cache_path):
+    # Скомпилированный индекс кэшируется на диске и пересобирается, только если списки изменились
+    signature = lists_signature(paths)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_signature, engine = pickle.load(f)
+        if cached_signature == signature:
+            return engine
+    except (OSError, EOFError, ValueError, AttributeError, pickle.UnpicklingError):
+        pass
+
+    engine = FilterEngine()
+    for path in paths:
+        engine.add_file(path)
+
+    # Кэш можно пересобрать, поэтому без fsync: важна только атомарность подмены
+    atomic_write(cache_path, pickle.dumps((signature, engine), protocol=pickle.HIGHEST_PROTOCOL), durable=False)
+    return engine
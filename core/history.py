@@ -0,0 +1,287 @@
+import math
+import time
+import queue
+import sqlite3
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+# Фрекенси хранится как ln(Σ вес * e^(λ·t)) по всем визитам: порядок записей не зависит
+# от текущего времени, поэтому рейтинг обновляется одним сложением при визите, а не при запросе.
+FRECENCY_HALF_LIFE = 30 * 24 * 3600
+FRECENCY_DECAY = math.log(2) / FRECENCY_HALF_LIFE
+BOOKMARK_WEIGHT = 20.0
+
+# Если под префикс попадает больше строк, выгоднее идти по индексу фрекенси сверху вниз
+PREFIX_SCAN_LIMIT = 1000
+# Для поиска по словам заголовка берём самые свежие совпадения и сортируем их по фрекенси
+FTS_CANDIDATES = 300
+# Поиск по словам - best effort: если не уложился в бюджет, остаются подсказки по префиксу
+SUGGEST_BUDGET = 0.004
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    stripped TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    visit_count INTEGER NOT NULL DEFAULT 0,
+    last_visit REAL NOT NULL DEFAULT 0,
+    frecency REAL NOT NULL DEFAULT 0,
+    bookmarked INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS places_stripped ON places(stripped);
+CREATE INDEX IF NOT EXISTS places_frecency ON places(frecency);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+    title, url, content='places', content_rowid='id', prefix='2 3 4 5 6'
+);
+CREATE TRIGGER IF NOT EXISTS places_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, title, url) VALUES (new.id, new.title, new.url);
+END;
+CREATE TRIGGER IF NOT EXISTS places_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, url) VALUES ('delete', old.id, old.title, old.url);
+END;
+CREATE TRIGGER IF NOT EXISTS places_au AFTER UPDATE OF title, url ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, url) VALUES ('delete', old.id, old.title, old.url);
+    INSERT INTO places_fts(rowid, title, url) VALUES (new.id, new.title, new.url);
+END;
+"""
+
+def strip_url(url):
+    url = url.strip().lower()
+    for scheme in ("https://", "http://"):
+        if url.startswith(scheme):
+            url = url[len(scheme):]
+            break
+    if url.startswith("www."):
+        url = url[4:]
+    return url
+
+def add_frecency(frecency, weight, now):
+    # log-sum-exp: ln(e^frecency + weight * e^(λ·now)) без переполнения
+    visit = math.log(weight) + FRECENCY_DECAY * now
+    if frecency is None or frecency == 0:
+        return visit
+    high, low = max(frecency, visit), min(frecency, visit)
+    return high + math.log1p(math.exp(low - high))
+
+def fts_query(text):
+    tokens = [t for t in "".join(c if c.isalnum() else " " for c in text).split() if t]
+    return " ".join(f'"{t}"*' for t in tokens)
+
+def connect(path):
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    try:
+        db.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        pass  # SQLite собран без FTS5, остаётся только поиск по префиксу адреса
+    return db
+
+def has_fts(db):
+    return db.execute("SELECT 1 FROM sqlite_master WHERE name = 'places_fts'").fetchone() is not None
+
+def bookmarked_urls(db):
+    return {row[0] for row in db.execute("SELECT url FROM places WHERE bookmarked")}
+
+class HistoryStore:
+    def __init__(self, path):
+        self.path = path
+        self.db = connect(path)
+
+    def add_visit(self, url, title="", now=None, weight=1.0):
+        with self.db:
+            self.apply_visit(url, title, now or time.time(), weight)
+
+    def apply_visit(self, url, title, now, weight=1.0):
+        row = self.db.execute("SELECT id, frecency FROM places WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            self.db.execute(
+                "INSERT INTO places (url, stripped, title, visit_count, last_visit, frecency) "
+                "VALUES (?, ?, ?, 1, ?, ?)",
+                (url, strip_url(url), title, now, add_frecency(None, weight, now))
+            )
+        else:
+            self.db.execute(
+                "UPDATE places SET visit_count = visit_count + 1, last_visit = ?, frecency = ?, "
+                "title = CASE WHEN ? != '' THEN ? ELSE title END WHERE id = ?",
+                (now, add_frecency(row[1], weight, now), title, title, row[0])
+            )
+
+    def set_title(self, url, title):
+        with self.db:
+            self.apply_title(url, title)
+
+    def apply_title(self, url, title):
+        self.db.execute("UPDATE places SET title = ? WHERE url = ? AND title != ?", (title, url, title))
+
+    def write_batch(self, records):
+        with self.db:
+            for kind, url, title, now in records:
+                if kind == "visit":
+                    self.apply_visit(url, title, now)
+                elif kind in ("bookmark", "unbookmark"):
+                    self.apply_bookmarked(url, title, kind == "bookmark", now)
+                else:
+                    self.apply_title(url, title)
+
+    def is_bookmarked(self, url):
+        row = self.db.execute("SELECT bookmarked FROM places WHERE url = ?", (url,)).fetchone()
+        return bool(row and row[0])
+
+    def set_bookmarked(self, url, title, bookmarked):
+        with self.db:
+            self.apply_bookmarked(url, title, bookmarked, time.time())
+
+    def apply_bookmarked(self, url, title, bookmarked, now):
+        if bookmarked and not self.is_bookmarked(url):
+            # Закладка считается «тяжёлым» визитом, чтобы держаться в начале подсказок
+            self.apply_visit(url, title, now, weight=BOOKMARK_WEIGHT)
+        self.db.execute("UPDATE places SET bookmarked = ? WHERE url = ?", (int(bookmarked), url))
+
+    def close(self):
+        self.db.close()
+
+class HistoryWriter:
+    # Визиты копятся в ограниченной очереди и пишутся пачками, одной транзакцией на пачку,
+    # из фонового потока со своим соединением - GUI-поток диск не трогает.
+    STOP = None
+
+    def __init__(self, path, max_queue=10000, batch_size=500, flush_interval=1.0, put_timeout=0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(max_queue)
+        self.dropped = 0
+        self.written = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name="history-writer", daemon=True)
+        self.thread.start()
+
+    def add_visit(self, url, title=""):
+        self.put(("visit", url, title, time.time()))
+
+    def set_title(self, url, title):
+        self.put(("title", url, title, None))
+
+    def set_bookmarked(self, url, title, bookmarked):
+        # Закладку поставил пользователь: её не отбрасываем, а ждём места в очереди
+        if not self.closed:
+            self.queue.put(("bookmark" if bookmarked else "unbookmark", url, title, time.time()))
+
+    def put(self, record):
+        if self.closed:
+            return
+        try:
+            # Если писатель не успевает, GUI-поток ждёт недолго, а затем запись отбрасывается
+            self.queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        store = HistoryStore(self.path)
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not self.STOP:
+                try:
+                    batch.append(self.queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is self.STOP:
+                batch.pop()
+                stopping = True
+            if batch:
+                try:
+                    store.write_batch(batch)
+                    self.written += len(batch)
+                except sqlite3.Error:
+                    self.dropped += len(batch)
+        store.close()
+
+    def close(self):
+        # Всё, что уже в очереди, гарантированно записывается до выхода
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(self.STOP)
+        self.thread.join()
+
+def suggest(db, text, limit=8, fts=True):
+    started = time.perf_counter()
+    prefix = strip_url(text)
+    if not prefix:
+        return []
+    bounds = (prefix, prefix + "\uffff")
+
+    in_range = db.execute(
+        "SELECT count(*) FROM (SELECT 1 FROM places INDEXED BY places_stripped "
+        "WHERE stripped >= ? AND stripped < ? LIMIT ?)", (*bounds, PREFIX_SCAN_LIMIT + 1)
+    ).fetchone()[0]
+    index = "places_stripped" if in_range <= PREFIX_SCAN_LIMIT else "places_frecency"
+    rows = db.execute(
+        f"SELECT url FROM places INDEXED BY {index} WHERE stripped >= ? AND stripped < ? "
+        "ORDER BY frecency DESC LIMIT ?", (*bounds, limit)
+    ).fetchall()
+    results = [row[0] for row in rows]
+
+    query = fts_query(text)
+    if fts and query and len(results) < limit:
+        deadline = started + SUGGEST_BUDGET
+        db.set_progress_handler(lambda: time.perf_counter() > deadline, 1000)
+        try:
+            rows = db.execute(
+                "SELECT url FROM places WHERE id IN "
+                "(SELECT rowid FROM places_fts WHERE places_fts MATCH ? ORDER BY rowid DESC LIMIT ?) "
+                "ORDER BY frecency DESC LIMIT ?", (query, FTS_CANDIDATES, limit)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            db.set_progress_handler(None, 0)
+        results += [row[0] for row in rows if row[0] not in results]
+    return results[:limit]
+
+class SuggestWorker(QObject):
+    # Живёт в отдельном QThread со своим соединением к базе
+    suggestions_ready = pyqtSignal(int, list)
+    bookmarks_ready = pyqtSignal(object)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.db = None
+        self.fts = False
+        self.latest = 0
+
+    def open(self):
+        if self.db is None:
+            self.db = connect(self.path)
+            self.fts = has_fts(self.db)
+
+    @pyqtSlot(int, str)
+    def suggest(self, request_id, text):
+        if request_id < self.latest:
+            return  # пользователь уже набрал что-то новее
+        self.open()
+        try:
+            results = suggest(self.db, text, fts=self.fts)
+        except sqlite3.Error:
+            results = []
+        self.suggestions_ready.emit(request_id, results)
+
+    @pyqtSlot()
+    def load_bookmarks(self):
+        # Закладки держит в памяти окно: звёздочка при каждой навигации без запроса к базе
+        self.open()
+        try:
+            bookmarks = bookmarked_urls(self.db)
+        except sqlite3.Error:
+            bookmarks = set()
+        self.bookmarks_ready.emit(bookmarks)
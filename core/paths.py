@@ -0,0 +1,70 @@
+import os
+import sys
+from PyQt6.QtCore import QStandardPaths
+
+APP_NAME = "GovnoBrowser"
+# Переопределяет каталог данных: портативный режим, бенчмарки
+ENV_DATA_DIR = "GOVNO_DATA_DIR"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Файлы, по которым видно, что user_data оставил наш браузер
+LEGACY_MARKERS = ("settings.json", "passwords.json", "passwords.db", "history.db", "premium.txt")
+
+_data_dir = None
+
+def legacy_data_dir():
+    # Старые версии писали в user_data относительно текущего каталога, обычно это папка браузера.
+    # Чужую папку с тем же именем не трогаем: переносим только ту, где есть наши файлы.
+    for directory in (os.path.join(ROOT, "user_data"), os.path.abspath("user_data")):
+        if os.path.isdir(directory) and any(os.path.exists(os.path.join(directory, name)) for name in LEGACY_MARKERS):
+            return directory
+    return None
+
+def migrate_data_dir(legacy, directory):
+    import shutil  # нужен один раз за всё время, при переносе
+    os.makedirs(os.path.dirname(directory), exist_ok=True)
+    try:
+        os.rename(legacy, directory)  # тот же диск: атомарно
+        return directory
+    except OSError:
+        pass
+    # Между дисками копируем во временную папку и только готовую копию переименовываем
+    partial = directory + ".partial"
+    try:
+        shutil.rmtree(partial, ignore_errors=True)
+        shutil.copytree(legacy, partial)
+        os.rename(partial, directory)
+    except OSError as e:
+        print(f"Не удалось перенести {legacy}: {e}", file=sys.stderr)
+        shutil.rmtree(partial, ignore_errors=True)  # недокопированная часть; старые данные целы
+        return legacy
+    # Копия полная и дальше не удаляется, даже если старую папку убрать не получится
+    try:
+        shutil.rmtree(legacy)
+    except OSError as e:
+        print(f"Данные скопированы, но {legacy} удалить не удалось: {e}", file=sys.stderr)
+    return directory
+
+def resolve_data_dir():
+    override = os.environ.get(ENV_DATA_DIR)
+    if override:
+        return os.path.abspath(override)
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    directory = os.path.join(base, APP_NAME) if base else os.path.join(ROOT, "user_data")
+    legacy = legacy_data_dir()
+    if legacy and legacy != directory and not os.path.exists(directory):
+        directory = migrate_data_dir(legacy, directory)
+        if directory != legacy:
+            print(f"Данные перенесены из {legacy} в {directory}", file=sys.stderr)
+    return directory
+
+def data_dir():
+    # Каталог выбирается и создаётся один раз за процесс, дальше только готовый абсолютный путь
+    global _data_dir
+    if _data_dir is None:
+        directory = resolve_data_dir()
+        os.makedirs(directory, exist_ok=True)
+        _data_dir = directory
+    return _data_dir
+
+def data_path(*parts):
+    return os.path.join(data_dir(), *parts)
@@ -0,0 +1,112 @@
+import time
+import html
+from PyQt6.QtCore import QObject, QUrl
+from core.history import strip_url
+
+# Chromium держит неиспользованное заранее открытое соединение около 10 секунд
+PRECONNECT_TTL = 10.0
+PRECONNECT_HTML = '<link rel="dns-prefetch" href="{0}"><link rel="preconnect" href="{0}">'
+
+def origin(url):
+    return url.adjusted(
+        QUrl.UrlFormattingOption.RemoveUserInfo | QUrl.UrlFormattingOption.RemovePath
+        | QUrl.UrlFormattingOption.RemoveQuery | QUrl.UrlFormattingOption.RemoveFragment
+    ).toString()
+
+def speculation_key(url):
+    # http://github.com и https://www.github.com/ - одна цель: редирект всё равно приведёт туда же
+    return strip_url(url.toString()).rstrip("/")
+
+class Speculator(QObject):
+    # Угадывает адрес, пока его набирают: заранее открывает соединение (DNS, TCP, TLS)
+    # через скрытую страницу с <link rel=preconnect>, а по желанию целиком загружает
+    # верхнюю подсказку в скрытой странице, которая по Enter подставляется во вкладку.
+    def __init__(self, page_factory, max_loads=1, parent=None):
+        super().__init__(parent)
+        self.page_factory = page_factory
+        self.max_loads = max_loads
+        self.warmer = None
+        self.preconnected = {}  # (профиль, origin) -> когда открыто соединение
+        self.prerendered = []
+        self.stats = dict.fromkeys(("preconnects", "preconnect_hits", "prerenders", "hits", "warm", "misses"), 0)
+
+    def new_page(self, profile):
+        page = self.page_factory(profile)
+        page.setParent(self)
+        page.setAudioMuted(True)
+        return page
+
+    def preconnect(self, url, profile):
+        if url.scheme() not in ("http", "https") or not url.host():
+            return
+        origins = [origin(url)]
+        if url.scheme() == "http":
+            # Набранный без схемы домен почти всегда уводит на https
+            origins.append(origin(url.adjusted(QUrl.UrlFormattingOption.RemovePort)).replace("http://", "https://", 1))
+        now = time.monotonic()
+        self.preconnected = {key: when for key, when in self.preconnected.items() if now - when < PRECONNECT_TTL}
+        fresh = [o for o in origins if now - self.preconnected.get((profile, o), -PRECONNECT_TTL) >= PRECONNECT_TTL]
+        if not fresh:
+            return
+        for o in fresh:
+            self.preconnected[(profile, o)] = now
+        if self.warmer is None or self.warmer.profile() is not profile:
+            if self.warmer is not None:
+                self.warmer.deleteLater()
+            self.warmer = self.new_page(profile)
+        self.warmer.setHtml("".join(PRECONNECT_HTML.format(html.escape(o)) for o in fresh))
+        self.stats["preconnects"] += len(fresh)
+
+    def prerender(self, url, profile):
+        key = speculation_key(url)
+        if self.max_loads <= 0 or any(
+            entry["key"] == key and entry["page"].profile() is profile for entry in self.prerendered
+        ):
+            return
+        # Не больше max_loads скрытых загрузок: новая догадка вытесняет самую старую
+        while len(self.prerendered) >= self.max_loads:
+            self.prerendered.pop(0)["page"].deleteLater()
+        entry = {"key": key, "page": self.new_page(profile), "loaded": False}
+        entry["page"].loadFinished.connect(lambda ok, entry=entry: entry.update(loaded=ok))
+        entry["page"].load(url)
+        self.prerendered.append(entry)
+        self.stats["prerenders"] += 1
+
+    def take(self, url, profile, swap=True):
+        # По Enter: считает попадания и отдаёт готовую страницу, если её можно подставить.
+        # Остальные догадки больше не нужны и выгружаются.
+        if time.monotonic() - self.preconnected.get((profile, origin(url)), -PRECONNECT_TTL) < PRECONNECT_TTL:
+            self.stats["preconnect_hits"] += 1
+        key = speculation_key(url)
+        match = next((entry for entry in self.prerendered
+                      if entry["key"] == key and entry["page"].profile() is profile), None)
+        if match is None and self.prerendered:
+            self.stats["misses"] += 1
+        for entry in self.prerendered:
+            if entry is not match or not swap:
+                entry["page"].deleteLater()
+        self.prerendered = []
+        if match is None:
+            return None, False
+        if not swap:
+            # Вкладку с историей не подменяем, но кэш и соединения уже прогреты
+            self.stats["warm"] += 1
+            return None, False
+        self.stats["hits"] += 1
+        match["page"].setAudioMuted(False)
+        return match["page"], match["loaded"]
+
+    def drop(self, profile):
+        # Профиль контейнера удаляется: его скрытые страницы должны уйти раньше
+        if self.warmer is not None and self.warmer.profile() is profile:
+            self.warmer.deleteLater()
+            self.warmer = None
+        for entry in [entry for entry in self.prerendered if entry["page"].profile() is profile]:
+            self.prerendered.remove(entry)
+            entry["page"].deleteLater()
+        self.preconnected = {key: when for key, when in self.preconnected.items() if key[0] is not profile}
+
+    def summary(self):
+        guesses = self.stats["hits"] + self.stats["warm"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] + self.stats["warm"]) / guesses if guesses else 0.0
+        return dict(self.stats, hit_rate=round(hit_rate, 2))
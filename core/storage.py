@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import zlib
+
+def fsync_directory(directory):
+    # Переименование попадает на диск только вместе с записью каталога (на Windows так нельзя)
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write(path, data, durable=True, backup=False):
+    # Пишем во временный файл рядом и подменяем им старый: после сбоя на месте
+    # остаётся либо старая, либо новая версия целиком, но не обрезанная.
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        if durable:
+            os.fsync(f.fileno())
+    if backup and os.path.exists(path):
+        os.replace(path, path + ".bak")
+    os.replace(tmp_path, path)
+    if durable:
+        fsync_directory(directory)
+
+def write_json(path, value, indent=None, durable=True):
+    # Предыдущая версия остаётся в .bak, к ней откатываемся, если основной файл повреждён
+    atomic_write(path, json.dumps(value, indent=indent, ensure_ascii=False), durable, backup=True)
+
+def read_json(path, default=None):
+    for candidate in (path, path + ".bak"):
+        try:
+            with open(candidate, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            print(f"Файл {candidate} повреждён: {e}", file=sys.stderr)
+            continue
+        if candidate != path:
+            print(f"{path} восстановлен из резервной копии", file=sys.stderr)
+        return value
+    return default
+
+def encode_record(entry):
+    body = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+def decode_record(line):
+    if line.startswith(b"{"):
+        return json.loads(line)  # запись старого формата, без контрольной суммы
+    checksum, _, body = line.rstrip(b"\n").partition(b" ")
+    if int(checksum, 16) != zlib.crc32(body):
+        raise ValueError("контрольная сумма не совпала")
+    return json.loads(body)
+
+class Journal:
+    # Журнал упреждающей записи: строка = crc32 + JSON. flush после каждой записи
+    # переживает падение программы, fsync не чаще раза в sync_interval секунд -
+    # так стоимость fsync делится на все записи пачки.
+    def __init__(self, path, sync_interval=0.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.file = None
+        self.synced_at = 0.0
+        self.pending = False
+
+    def replay(self):
+        entries = []
+        offset = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # строка недописана: сбой посреди записи
+                    try:
+                        entries.append(decode_record(line))
+                    except ValueError:
+                        break
+                    offset += len(line)
+                else:
+                    return entries
+        except FileNotFoundError:
+            return entries
+        # Отрезаем повреждённый хвост, иначе новые записи окажутся за ним и потеряются при чтении
+        print(f"Журнал {self.path} повреждён после {len(entries)} записей, хвост отброшен", file=sys.stderr)
+        with open(self.path, "r+b") as f:
+            f.truncate(offset)
+        return entries
+
+    def open(self):
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.file = open(self.path, "ab")
+        return self.file
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        f = self.open()
+        f.write(b"".join(encode_record(entry) for entry in entries))
+        f.flush()
+        self.pending = True
+        if time.monotonic() - self.synced_at >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        if self.file is not None and self.pending:
+            os.fsync(self.file.fileno())
+            self.pending = False
+            self.synced_at = time.monotonic()
+
+    def reset(self):
+        # Вызывается после того, как снимок со всеми записями журнала атомарно сохранён
+        self.close()
+        self.file = open(self.path, "wb")
+
+    def close(self):
+        if self.file is not None:
+            self.sync()
+            self.file.close()
+            self.file = None
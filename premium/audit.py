@@ -0,0 +1,171 @@
+import os
+import math
+import mmap
+import hashlib
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from premium.credentials import CredentialStore
+from premium.vault import Vault, VaultError
+
+# Через сколько записей сообщать о прогрессе и проверять отмену
+PROGRESS_STEP = 500
+# Список утечек в каталоге данных: pwned-passwords-sha1-ordered-by-hash с haveibeenpwned.com
+BREACH_FILE = "pwned-passwords.txt"
+# Ниже этой оценки энтропии (бит) пароль считается слабым
+WEAK_BITS = 50
+# Короче этого после нормализации пароли не сравниваются на похожесть
+SIMILAR_MIN_LENGTH = 4
+# Самые частые пароли из утечек: слабые при любой длине
+COMMON_PASSWORDS = {
+    "123456", "123456789", "12345678", "1234567890", "12345", "1234567", "111111", "000000",
+    "123123", "654321", "666666", "121212", "987654321", "password", "password1", "passw0rd",
+    "qwerty", "qwerty123", "qwertyuiop", "1q2w3e4r", "1q2w3e4r5t", "1qaz2wsx", "zaq12wsx",
+    "asdfghjkl", "iloveyou", "admin", "administrator", "welcome", "letmein", "monkey", "dragon",
+    "football", "baseball", "sunshine", "princess", "superman", "michael", "abc123", "abcd1234",
+    "qazwsx", "trustno1", "master", "shadow", "йцукен", "йцукенг", "пароль", "любовь", "наташа",
+}
+# Замены цифр и символов на буквы, которыми «усиливают» пароль
+LEET = str.maketrans("013457@$!|", "oieastasil")
+
+def strength_bits(password):
+    # Грубая оценка: размер алфавита в степени «полезной» длины. Повторы и шаги
+    # последовательностей (aaaa, abcd, 4321) полезной длины не добавляют.
+    pool = 0
+    if any(c.islower() for c in password):
+        pool += 26
+    if any(c.isupper() for c in password):
+        pool += 26
+    if any(c.isdigit() for c in password):
+        pool += 10
+    if any(not c.isalnum() for c in password):
+        pool += 33
+    if any(ord(c) > 127 and c.isalpha() for c in password):
+        pool += 33
+    length = 0
+    previous = None
+    for c in password:
+        if previous is None or abs(ord(c) - ord(previous)) > 1:
+            length += 1
+        previous = c
+    return length * math.log2(pool) if pool else 0.0
+
+def is_weak(password):
+    return password.lower() in COMMON_PASSWORDS or strength_bits(password) < WEAK_BITS
+
+def skeleton(password):
+    # Password1!, p@ssword2 и PASSWORD дают один скелет: регистр, leet-замены
+    # и цифры с символами по краям отбрасываются
+    return password.lower().strip("0123456789!?.,-_*#%&+=~ ").translate(LEET)
+
+class BreachIndex:
+    # Отсортированный список SHA-1 утёкших паролей в формате Have I Been Pwned
+    # (строки «HASH:COUNT»). Файл отображается в память целиком и не читается:
+    # бинарный поиск по байтам трогает несколько страниц на один пароль.
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"Файл {path} пуст")
+
+    def count(self, password):
+        digest = hashlib.sha1(password.encode("utf-8")).hexdigest().upper().encode()
+        data = self.map
+        low, high = 0, len(data)
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b"\n", 0, middle) + 1
+            end = data.find(b"\n", start)
+            if end < 0:
+                end = len(data)
+            key, _, count = data[start:end].rstrip(b"\r").partition(b":")
+            if key == digest:
+                return int(count or 1)
+            if key < digest:
+                low = end + 1
+            else:
+                high = start
+        return 0
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+class PasswordAudit:
+    # Один проход по записям: повторы и похожие находятся через словари по хешу,
+    # без попарного сравнения. Открытые пароли не сохраняются, только хеши.
+    def __init__(self, breaches=None):
+        self.breaches = breaches
+        # Соль на время проверки: хеши нельзя сопоставить с чем-то вне этого процесса
+        self.salt = os.urandom(16)
+        self.by_password = {}
+        self.by_skeleton = {}
+        self.weak = []
+        self.breached = []
+
+    def digest(self, text):
+        return hashlib.blake2b(text.encode("utf-8"), key=self.salt, digest_size=16).digest()
+
+    def add(self, entry_id, password):
+        digest = self.digest(password)
+        self.by_password.setdefault(digest, []).append(entry_id)
+        base = skeleton(password)
+        if len(base) >= SIMILAR_MIN_LENGTH:
+            self.by_skeleton.setdefault(self.digest(base), {}).setdefault(digest, entry_id)
+        if is_weak(password):
+            self.weak.append(entry_id)
+        if self.breaches is not None:
+            count = self.breaches.count(password)
+            if count:
+                self.breached.append((entry_id, count))
+
+    def report(self):
+        reused = [ids for ids in self.by_password.values() if len(ids) > 1]
+        # Похожие - разные пароли с общим скелетом; одинаковые уже попали в повторы
+        similar = [list(variants.values()) for variants in self.by_skeleton.values() if len(variants) > 1]
+        return {
+            "reused": sorted(reused, key=len, reverse=True),
+            "weak": self.weak,
+            "similar": sorted(similar, key=len, reverse=True),
+            "breached": sorted(self.breached, key=lambda item: item[1], reverse=True),
+            "breach_check": self.breaches is not None,
+        }
+
+class AuditWorker(QObject):
+    # Живёт в отдельном QThread со своим соединением к хранилищу
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str, object)
+
+    def __init__(self, path, breach_path=None):
+        super().__init__()
+        self.path = path
+        self.breach_path = breach_path
+        self.cancelled = False
+
+    @pyqtSlot()
+    def run(self):
+        self.cancelled = False
+        store = CredentialStore(self.path)
+        breaches = None
+        try:
+            if self.breach_path and os.path.exists(self.breach_path):
+                breaches = BreachIndex(self.breach_path)
+            audit = PasswordAudit(breaches)
+            vault = Vault(self.path)
+            total = store.count()
+            for count, entry in enumerate(store.each(), 1):
+                if count % PROGRESS_STEP == 0:
+                    if self.cancelled:
+                        self.finished.emit("cancelled", None)
+                        return
+                    self.progress.emit(count, total)
+                audit.add(entry["id"], vault.open(entry))
+            report = audit.report()
+            report["breach_path"] = self.breach_path
+            self.finished.emit("audit", report)
+        except (OSError, ValueError, VaultError) as e:
+            self.finished.emit("error", str(e))
+        finally:
+            if breaches is not None:
+                breaches.close()
+            store.close()
@@ -0,0 +1,124 @@
+import os
+import json
+from PyQt6.QtCore import QObject, QThread, QFileSystemWatcher, pyqtSignal, pyqtSlot
+from PyQt6.QtWebEngineCore import QWebEngineScript
+from core.domains import normalize_host, registrable_domain
+from premium.credentials import CredentialStore
+from premium.vault import Vault, VaultError
+
+# Заполняет первое поле пароля на странице и ближайшее поле логина перед ним
+FILL_SCRIPT = """
+(function (username, password) {
+    var field = document.querySelector("input[type=password]:not([autocomplete=new-password])");
+    if (!field || field.value) return false;
+    var scope = field.form || document;
+    var inputs = Array.prototype.filter.call(
+        scope.querySelectorAll("input[type=text], input[type=email], input:not([type])"),
+        function (input) { return field.compareDocumentPosition(input) & Node.DOCUMENT_POSITION_PRECEDING; }
+    );
+    function set(input, value) {
+        input.value = value;
+        input.dispatchEvent(new Event("input", {bubbles: true}));
+        input.dispatchEvent(new Event("change", {bubbles: true}));
+    }
+    var user = inputs[inputs.length - 1];
+    if (user && !user.value) set(user, username);
+    set(field, password);
+    return true;
+})(%s, %s)
+"""
+
+def build_index(entries):
+    index = {}
+    for entry in entries:
+        # Сайт вводят как угодно: "https://GitHub.com/", "www.github.com". Сама запись не меняется,
+        # site входит в AAD шифра, поэтому нормализованный хост лежит рядом
+        entry["host"] = normalize_host(entry["site"])
+        index.setdefault(registrable_domain(entry["host"]), []).append(entry)
+    return index
+
+def find_credentials(index, host):
+    # Без действия пользователя подставляем только на том самом сайте, где пароль сохранён:
+    # соседние поддомены того же eTLD+1 могут принадлежать другим людям
+    host = normalize_host(host)
+    return [entry for entry in index.get(registrable_domain(host), ()) if entry["host"] == host]
+
+class AutofillLoader(QObject):
+    # Живёт в отдельном QThread со своим соединением к хранилищу
+    index_ready = pyqtSignal(object)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.legacy_path = os.path.join(os.path.dirname(path), "passwords.json")
+        self.store = None
+
+    @pyqtSlot()
+    def reload(self):
+        if self.store is None:
+            if not (os.path.exists(self.path) or os.path.exists(self.legacy_path)):
+                return  # паролей ещё нет, пустую базу не создаём
+            self.store = CredentialStore(self.path, self.legacy_path)
+        elif not self.store.changed():
+            return
+        self.index_ready.emit(build_index(self.store.all()))
+
+class Autofill(QObject):
+    reload_requested = pyqtSignal()
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        # eTLD+1 -> [записи с зашифрованными паролями]; при навигации только поиск в словаре, без диска
+        self.index = {}
+        self.vault = Vault(path)
+
+        self.thread = QThread(self)
+        self.loader = AutofillLoader(path)
+        self.loader.moveToThread(self.thread)
+        self.reload_requested.connect(self.loader.reload)
+        self.loader.index_ready.connect(self.set_index)
+        self.thread.start()
+
+        # Каталог следим ради появления базы, сами файлы - ради изменений из менеджера паролей
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.addPath(os.path.dirname(path) or ".")
+        self.watcher.directoryChanged.connect(self.watch)
+        self.watcher.fileChanged.connect(self.watch)
+        self.watch()
+
+    def watch(self, changed_path=None):
+        paths = [p for p in (self.path, self.path + "-wal")
+                 if os.path.exists(p) and p not in self.watcher.files()]
+        if paths:
+            self.watcher.addPaths(paths)
+        self.reload_requested.emit()
+
+    def set_index(self, index):
+        self.index = index
+
+    def lookup(self, url):
+        return find_credentials(self.index, url.host())
+
+    def fill(self, browser):
+        url = browser.url()
+        # По http страницу может подменить любой в сети - пароль ей не отдаём
+        if url.scheme() != "https":
+            return
+        credentials = self.lookup(url)
+        if not credentials:
+            return
+        entry = credentials[0]
+        try:
+            password = self.vault.open(entry)
+        except VaultError:
+            return  # хранилище заблокировано: подставим после ввода мастер-пароля в менеджере
+        # Отдельный мир JavaScript: скрипты страницы не видят и не подменяют наш код
+        browser.page().runJavaScript(
+            FILL_SCRIPT % (json.dumps(entry["username"]), json.dumps(password)),
+            QWebEngineScript.ScriptWorldId.ApplicationWorld
+        )
+
+    def close(self):
+        self.thread.quit()
+        self.thread.wait()
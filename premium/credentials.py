@@ -0,0 +1,158 @@
+import os
+import time
+import sqlite3
+from core.paths import data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS credentials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    site TEXT NOT NULL,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL,
+    created REAL NOT NULL DEFAULT 0,
+    updated REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS credentials_site ON credentials(site, username);
+CREATE TABLE IF NOT EXISTS vault_meta (
+    name TEXT PRIMARY KEY,
+    value BLOB
+);
+"""
+
+FIELDS = "id, site, username, password"
+
+def as_record(row):
+    return {"id": row[0], "site": row[1], "username": row[2], "password": row[3]} if row else None
+
+class CredentialStore:
+    def __init__(self, path=None, legacy_path=None):
+        if path is None:
+            # Каталог данных браузера уже создан при запуске, makedirs не нужен
+            path, legacy_path = data_path("passwords.db"), data_path("passwords.json")
+        self.path = path
+        self.legacy_path = legacy_path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # Старые значения паролей затираются нулями, а не остаются в свободных страницах
+        self.db.execute("PRAGMA secure_delete=ON")
+        self.db.executescript(SCHEMA)
+        if legacy_path and os.path.exists(legacy_path):
+            self.migrate(legacy_path)
+        self.seen_version = self.data_version()
+
+    def migrate(self, legacy_path):
+        # Старый passwords.json переносится один раз, файл остаётся рядом как резервная копия,
+        # пока пароли не зашифрованы (drop_legacy_backup)
+        import json
+        try:
+            with open(legacy_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO credentials (site, username, password, created, updated) VALUES (?, ?, ?, ?, ?)",
+                [(e.get("site", ""), e.get("username", ""), e.get("password", ""), now, now)
+                 for e in entries if isinstance(e, dict)]
+            )
+        os.replace(legacy_path, legacy_path + ".migrated")
+
+    def get_meta(self, name):
+        row = self.db.execute("SELECT value FROM vault_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, **values):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO vault_meta (name, value) VALUES (?, ?)", values.items())
+
+    def data_version(self):
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self):
+        # data_version меняется только от чужих коммитов, свои записи его не трогают
+        version = self.data_version()
+        changed = version != self.seen_version
+        self.seen_version = version
+        return changed
+
+    def all(self):
+        return list(self.each())
+
+    def each(self):
+        # Курсор отдаёт строки по мере чтения, весь список в память не попадает
+        return map(as_record, self.db.execute(f"SELECT {FIELDS} FROM credentials ORDER BY site, username"))
+
+    def get(self, entry_id):
+        return as_record(self.db.execute(f"SELECT {FIELDS} FROM credentials WHERE id = ?", (entry_id,)).fetchone())
+
+    def find(self, site, username=None):
+        if username is None:
+            rows = self.db.execute(f"SELECT {FIELDS} FROM credentials WHERE site = ? ORDER BY username", (site,))
+        else:
+            rows = self.db.execute(f"SELECT {FIELDS} FROM credentials WHERE site = ? AND username = ?", (site, username))
+        return [as_record(row) for row in rows]
+
+    def plaintext(self):
+        rows = self.db.execute(f"SELECT {FIELDS} FROM credentials WHERE typeof(password) = 'text'")
+        return [as_record(row) for row in rows]
+
+    def set_passwords(self, pairs):
+        with self.db:
+            self.db.executemany("UPDATE credentials SET password = ? WHERE id = ?", [(p, i) for i, p in pairs])
+        if pairs:
+            self.scrub()
+
+    def scrub(self):
+        # Открытый текст мог остаться в WAL и в страницах, записанных до secure_delete:
+        # переносим WAL в базу, пересобираем её и обрезаем WAL до нуля
+        self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.db.execute("VACUUM")
+        self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def drop_legacy_backup(self):
+        if not self.legacy_path:
+            return
+        try:
+            os.remove(self.legacy_path + ".migrated")
+        except FileNotFoundError:
+            pass
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM credentials").fetchone()[0]
+
+    def add(self, site, username, password):
+        now = time.time()
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO credentials (site, username, password, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (site, username, password, now, now)
+            )
+        return cursor.lastrowid
+
+    def add_many(self, rows):
+        # Одна транзакция на весь импорт: при ошибке или отмене база остаётся как была.
+        # Уже сохранённые пары (site, username) пропускаются по индексу credentials_site,
+        # повторы внутри самого импорта тоже.
+        now = time.time()
+        with self.db:
+            cursor = self.db.executemany(
+                "INSERT INTO credentials (site, username, password, created, updated) SELECT ?, ?, ?, ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM credentials WHERE site = ? AND username = ?)",
+                ((site, username, password, now, now, site, username) for site, username, password in rows)
+            )
+        return cursor.rowcount
+
+    def update(self, entry_id, site, username, password):
+        with self.db:
+            self.db.execute(
+                "UPDATE credentials SET site = ?, username = ?, password = ?, updated = ? WHERE id = ?",
+                (site, username, password, time.time(), entry_id)
+            )
+
+    def delete(self, entry_id):
+        with self.db:
+            self.db.execute("DELETE FROM credentials WHERE id = ?", (entry_id,))
+
+    def close(self):
+        self.db.close()
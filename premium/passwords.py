@@ -0,0 +1,942 @@
+import os
+import bisect
+from PyQt6.QtCore import Qt, QTimer, QThread, QSize, QModelIndex, QAbstractListModel, QFileSystemWatcher, pyqtSignal
+from PyQt6.QtWidgets import (
+    QMainWindow, QLineEdit, QPushButton, QWidget, QMessageBox, QLabel, QVBoxLayout,
+    QHBoxLayout, QDialog, QFormLayout, QListView, QStyle, QStyledItemDelegate, QInputDialog,
+    QFileDialog, QProgressDialog, QTreeWidget, QTreeWidgetItem, QApplication
+)
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QGuiApplication
+from core.paths import data_path
+from premium.credentials import CredentialStore
+from premium.search import VaultSearchWorker
+from premium.vault import Vault, VaultError, available
+
+def entry_key(entry):
+    return (entry["site"], entry["username"], entry["id"])
+
+class PasswordListModel(QAbstractListModel):
+    USERNAME_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Записи отсортированы по сайту, ключи лежат рядом для бинарного поиска позиции.
+        # rows - то, что сейчас показано: либо сам entries, либо результаты поиска.
+        self.entries = []
+        self.keys = []
+        self.by_id = {}
+        self.rows = self.entries
+        self.filtered = False
+        self.loaded = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry["site"]
+        if role in (self.USERNAME_ROLE, Qt.ItemDataRole.ToolTipRole):
+            return entry["username"]
+        if role == Qt.ItemDataRole.UserRole:
+            return entry["id"]
+        return None
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = sorted(entries, key=entry_key)
+        self.keys = [entry_key(entry) for entry in self.entries]
+        self.by_id = {entry["id"]: entry for entry in self.entries}
+        self.rows = self.entries
+        self.filtered = False
+        self.loaded = True
+        self.endResetModel()
+
+    def set_matches(self, ids):
+        self.beginResetModel()
+        if ids is None:
+            self.rows = self.entries
+            self.filtered = False
+        else:
+            self.rows = [self.by_id[entry_id] for entry_id in ids if entry_id in self.by_id]
+            self.filtered = True
+        self.endResetModel()
+
+    def entry(self, entry_id):
+        return self.by_id.get(entry_id)
+
+    def add_entry(self, entry):
+        # В режиме поиска новая запись появится после повторного поиска
+        key = entry_key(entry)
+        row = bisect.bisect_left(self.keys, key)
+        if not self.filtered:
+            self.beginInsertRows(QModelIndex(), row, row)
+        self.entries.insert(row, entry)
+        self.keys.insert(row, key)
+        self.by_id[entry["id"]] = entry
+        if not self.filtered:
+            self.endInsertRows()
+
+    def remove_entry(self, entry_id):
+        entry = self.by_id.pop(entry_id, None)
+        if entry is None:
+            return
+        row = bisect.bisect_left(self.keys, entry_key(entry))
+        if self.filtered:
+            if entry in self.rows:
+                shown = self.rows.index(entry)
+                self.beginRemoveRows(QModelIndex(), shown, shown)
+                del self.rows[shown]
+                self.endRemoveRows()
+        else:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self.entries[row]
+        del self.keys[row]
+        if not self.filtered:
+            self.endRemoveRows()
+
+    def update_entry(self, entry):
+        self.remove_entry(entry["id"])
+        self.add_entry(entry)
+
+class PasswordItemDelegate(QStyledItemDelegate):
+    ROW_HEIGHT = 44
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Шрифты и метрики создаются один раз, paint вызывается только для видимых строк
+        self.site_font = QFont("Arial", 12, QFont.Weight.Bold)
+        self.user_font = QFont("Arial", 10)
+        self.site_metrics = QFontMetrics(self.site_font)
+        self.user_metrics = QFontMetrics(self.user_font)
+        self.selected_color = QColor("#1e3a5a")
+        self.hover_color = QColor("#1a3150")
+        self.site_color = QColor("#64ffda")
+        self.user_color = QColor("#8892b0")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        rect = option.rect
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(rect, self.selected_color)
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            painter.fillRect(rect, self.hover_color)
+        painter.setPen(self.selected_color)
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+
+        text_rect = rect.adjusted(12, 0, -12, 0)
+        align = Qt.AlignmentFlag.AlignVCenter
+        username = self.user_metrics.elidedText(
+            index.data(PasswordListModel.USERNAME_ROLE), Qt.TextElideMode.ElideRight, text_rect.width() // 2
+        )
+        painter.setFont(self.user_font)
+        painter.setPen(self.user_color)
+        painter.drawText(text_rect, align | Qt.AlignmentFlag.AlignRight, username)
+
+        site_width = text_rect.width() - self.user_metrics.horizontalAdvance(username) - 16
+        site = self.site_metrics.elidedText(f"🌐 {index.data()}", Qt.TextElideMode.ElideRight, site_width)
+        painter.setFont(self.site_font)
+        painter.setPen(self.site_color)
+        painter.drawText(text_rect, align | Qt.AlignmentFlag.AlignLeft, site)
+        painter.restore()
+
+class PasswordDialog(QDialog):
+    def __init__(self, parent=None, site="", username="", password="", edit_mode=False):
+        super().__init__(parent)
+        self.setWindowTitle("Добавить/Изменить пароль" if not edit_mode else "Редактировать пароль")
+        self.resize(400, 250)
+        self.setMinimumSize(350, 200)
+        self.setStyleSheet("""
+            background-color: #0a192f;
+            color: #e6f1ff;
+            font-family: Arial;
+        """)
+        
+        layout = QVBoxLayout()
+        
+        title = QLabel("Добавление пароля" if not edit_mode else "Редактирование пароля")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #64ffda;")
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        form = QFormLayout()
+        form.setContentsMargins(20, 20, 20, 20)
+        
+        self.site_input = QLineEdit()
+        self.site_input.setText(site)
+        self.site_input.setPlaceholderText("example.com")
+        self.site_input.setStyleSheet("""
+            padding: 8px;
+            border: 1px solid #64ffda;
+            border-radius: 4px;
+            background: #172a45;
+            color: white;
+        """)
+        
+        self.username_input = QLineEdit()
+        self.username_input.setText(username)
+        self.username_input.setPlaceholderText("username123")
+        self.username_input.setStyleSheet("""
+            padding: 8px;
+            border: 1px solid #64ffda;
+            border-radius: 4px;
+            background: #172a45;
+            color: white;
+        """)
+        
+        self.password_input = QLineEdit()
+        self.password_input.setText(password)
+        self.password_input.setPlaceholderText("********")
+        self.password_input.setStyleSheet("""
+            padding: 8px;
+            border: 1px solid #64ffda;
+            border-radius: 4px;
+            background: #172a45;
+            color: white;
+        """)
+        self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        
+        show_pass_btn = QPushButton("👁")
+        show_pass_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: none;
+                color: #64ffda;
+                font-size: 16px;
+                padding: 0;
+                margin-left: 5px;
+            }
+        """)
+        show_pass_btn.clicked.connect(self.toggle_password_visibility)
+        
+        pass_layout = QHBoxLayout()
+        pass_layout.addWidget(self.password_input)
+        pass_layout.addWidget(show_pass_btn)
+        
+        form.addRow("Сайт:", self.site_input)
+        form.addRow("Имя пользователя:", self.username_input)
+        form.addRow("Пароль:", pass_layout)
+        
+        layout.addLayout(form)
+        
+        btn_layout = QHBoxLayout()
+        
+        cancel_btn = QPushButton("Отмена")
+        cancel_btn.setStyleSheet("""
+            QPushButton {
+                background: #ff5555;
+                color: white;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #ff3333; }
+        """)
+        cancel_btn.clicked.connect(self.reject)
+        
+        save_btn = QPushButton("Сохранить")
+        save_btn.setStyleSheet("""
+            QPushButton {
+                background: #64ffda;
+                color: #0a192f;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #52e3c2; }
+        """)
+        save_btn.clicked.connect(self.accept)
+        
+        btn_layout.addWidget(cancel_btn)
+        btn_layout.addWidget(save_btn)
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+    
+    def toggle_password_visibility(self):
+        if self.password_input.echoMode() == QLineEdit.EchoMode.Password:
+            self.password_input.setEchoMode(QLineEdit.EchoMode.Normal)
+        else:
+            self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
+    
+    def get_data(self):
+        return {
+            "site": self.site_input.text().strip(),
+            "username": self.username_input.text().strip(),
+            "password": self.password_input.text().strip()
+        }
+
+class AuditDialog(QDialog):
+    def __init__(self, parent, report, lookup):
+        super().__init__(parent)
+        self.setWindowTitle("Проверка паролей")
+        self.resize(520, 480)
+        self.setStyleSheet("""
+            background-color: #0a192f;
+            color: #e6f1ff;
+            font-family: Arial;
+        """)
+        self.lookup = lookup
+
+        layout = QVBoxLayout()
+        title = QLabel("Проверка паролей")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #64ffda;")
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderHidden(True)
+        self.tree.setStyleSheet("""
+            QTreeWidget {
+                background: #172a45;
+                border: 1px solid #1e3a5a;
+                border-radius: 5px;
+            }
+        """)
+        self.add_groups("Один пароль на нескольких сайтах", report["reused"])
+        self.add_entries("Слабые пароли", report["weak"])
+        self.add_groups("Похожие пароли", report["similar"])
+        if report["breach_check"]:
+            self.add_entries("Найдены в утечках", [entry_id for entry_id, _ in report["breached"]],
+                             [f"утечек: {count}" for _, count in report["breached"]])
+        layout.addWidget(self.tree)
+
+        if self.tree.topLevelItemCount() == 0:
+            summary = QLabel("Проблем не найдено")
+            summary.setStyleSheet("color: #64ffda; font-size: 16px;")
+            layout.addWidget(summary, alignment=Qt.AlignmentFlag.AlignCenter)
+            self.tree.setVisible(False)
+        if not report["breach_check"]:
+            hint = QLabel(f"Проверка по утечкам выключена: положите список Have I Been Pwned (SHA-1) "
+                          f"в {report['breach_path']}")
+            hint.setWordWrap(True)
+            hint.setStyleSheet("color: #8892b0;")
+            layout.addWidget(hint)
+
+        close_btn = QPushButton("Закрыть")
+        close_btn.setStyleSheet("""
+            QPushButton {
+                background: #1e3a5a;
+                color: #e6f1ff;
+                padding: 8px;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background: #2a4a6a; }
+        """)
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
+
+    def entry_text(self, entry_id):
+        entry = self.lookup(entry_id)
+        return f"{entry['site']} — {entry['username']}" if entry else None
+
+    def add_entries(self, title, ids, notes=None, parent=None):
+        texts = [self.entry_text(entry_id) for entry_id in ids]
+        if notes:
+            texts = [text and f"{text} ({note})" for text, note in zip(texts, notes)]
+        texts = [text for text in texts if text]
+        if not texts:
+            return None
+        item = QTreeWidgetItem([f"{title}: {len(texts)}"])
+        item.addChildren([QTreeWidgetItem([text]) for text in texts])
+        if parent is None:
+            self.tree.addTopLevelItem(item)
+        else:
+            parent.addChild(item)
+        return item
+
+    def add_groups(self, title, groups):
+        if not groups:
+            return
+        item = QTreeWidgetItem([f"{title}: {len(groups)}"])
+        self.tree.addTopLevelItem(item)
+        for number, ids in enumerate(groups, 1):
+            self.add_entries(f"Группа {number}", ids, parent=item)
+
+class PasswordManagerWindow(QMainWindow):
+    search_requested = pyqtSignal(int, str)
+    index_changed = pyqtSignal(str, object)
+    transfer_requested = pyqtSignal(str, str)
+    audit_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Менеджер паролей")
+        self.resize(700, 600)
+        self.setMinimumSize(600, 400)
+        self.setStyleSheet("""
+            background-color: #0a192f;
+            color: #e6f1ff;
+            font-family: Arial;
+        """)
+        
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(15)
+        
+        title = QLabel("🔐 Менеджер паролей")
+        title.setStyleSheet("""
+            font-size: 24px; 
+            font-weight: bold; 
+            color: #64ffda;
+            margin-bottom: 10px;
+        """)
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Поиск по сайту или имени пользователя")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet("""
+            padding: 8px;
+            border: 1px solid #64ffda;
+            border-radius: 4px;
+            background: #172a45;
+            color: white;
+        """)
+        layout.addWidget(self.search_input)
+
+        self.model = PasswordListModel(self)
+        self.password_list = QListView()
+        self.password_list.setModel(self.model)
+        self.password_list.setItemDelegate(PasswordItemDelegate(self.password_list))
+        # Все строки одной высоты: представлению не нужно измерять каждую
+        self.password_list.setUniformItemSizes(True)
+        self.password_list.setMouseTracking(True)
+        self.password_list.setStyleSheet("""
+            QListView {
+                background: #172a45;
+                border: 1px solid #64ffda;
+                border-radius: 5px;
+                color: white;
+            }
+        """)
+        self.password_list.clicked.connect(self.show_password_details)
+        layout.addWidget(self.password_list)
+
+        self.empty_label = QLabel("Нет сохранённых паролей")
+        self.empty_label.setStyleSheet("color: #8892b0; font-size: 16px;")
+        layout.addWidget(self.empty_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        for signal in (self.model.modelReset, self.model.rowsInserted, self.model.rowsRemoved):
+            signal.connect(self.update_empty_state)
+        
+        self.details_widget = QWidget()
+        self.details_widget.setVisible(False)
+        details_layout = QVBoxLayout()
+        
+        # Username
+        user_layout = QHBoxLayout()
+        user_label = QLabel("👤 Имя пользователя:")
+        user_label.setStyleSheet("color: #e6f1ff;")
+        self.username_label = QLabel()
+        self.username_label.setStyleSheet("color: #e6f1ff; font-weight: bold;")
+        
+        self.copy_user_btn = QPushButton("📋")
+        self.copy_user_btn.setStyleSheet("""
+            QPushButton {
+                background: #64ffda;
+                color: #0a192f;
+                padding: 5px;
+                border-radius: 3px;
+                font-weight: bold;
+                min-width: 30px;
+            }
+            QPushButton:hover { background: #52e3c2; }
+        """)
+        
+        user_layout.addWidget(user_label)
+        user_layout.addWidget(self.username_label)
+        user_layout.addWidget(self.copy_user_btn)
+        
+        # Password (исправленная часть)
+        pass_layout = QHBoxLayout()
+        pass_label = QLabel("🔑 Пароль:")
+        pass_label.setStyleSheet("color: #e6f1ff;")
+        
+        self.password_line = QLineEdit()
+        self.password_line.setReadOnly(True)
+        self.password_line.setStyleSheet("""
+            QLineEdit {
+                color: #e6f1ff; 
+                font-weight: bold;
+                background: transparent;
+                border: none;
+            }
+        """)
+        self.password_line.setEchoMode(QLineEdit.EchoMode.Password)
+        
+        self.show_pass_btn = QPushButton("👁")
+        self.show_pass_btn.setStyleSheet("""
+            QPushButton {
+                background: #1e3a5a;
+                color: #e6f1ff;
+                padding: 5px;
+                border-radius: 3px;
+                min-width: 30px;
+            }
+            QPushButton:hover { background: #2a4a6a; }
+        """)
+        self.show_pass_btn.setCheckable(True)
+        
+        self.copy_pass_btn = QPushButton("📋")
+        self.copy_pass_btn.setStyleSheet("""
+            QPushButton {
+                background: #64ffda;
+                color: #0a192f;
+                padding: 5px;
+                border-radius: 3px;
+                font-weight: bold;
+                min-width: 30px;
+            }
+            QPushButton:hover { background: #52e3c2; }
+        """)
+        
+        pass_layout.addWidget(pass_label)
+        pass_layout.addWidget(self.password_line)
+        pass_layout.addWidget(self.show_pass_btn)
+        pass_layout.addWidget(self.copy_pass_btn)
+        
+        # Кнопки действий
+        btn_layout = QHBoxLayout()
+        self.edit_btn = QPushButton("✏️ Редактировать")
+        self.edit_btn.setStyleSheet("""
+            QPushButton {
+                background: #1e3a5a;
+                color: #e6f1ff;
+                padding: 8px;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background: #2a4a6a; }
+        """)
+        
+        self.delete_btn = QPushButton("🗑️ Удалить")
+        self.delete_btn.setStyleSheet("""
+            QPushButton {
+                background: #ff5555;
+                color: white;
+                padding: 8px;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background: #ff3333; }
+        """)
+        
+        btn_layout.addWidget(self.edit_btn)
+        btn_layout.addWidget(self.delete_btn)
+        
+        details_layout.addLayout(user_layout)
+        details_layout.addLayout(pass_layout)
+        details_layout.addLayout(btn_layout)
+        self.details_widget.setLayout(details_layout)
+        layout.addWidget(self.details_widget)
+        
+        # Кнопки управления
+        btn_layout = QHBoxLayout()
+        
+        self.add_btn = QPushButton("➕ Добавить пароль")
+        self.add_btn.setStyleSheet("""
+            QPushButton {
+                background: #64ffda;
+                color: #0a192f;
+                padding: 10px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #52e3c2; }
+        """)
+        self.add_btn.clicked.connect(self.add_password)
+        
+        self.refresh_btn = QPushButton("🔄 Обновить")
+        self.refresh_btn.setStyleSheet("""
+            QPushButton {
+                background: #1e3a5a;
+                color: #e6f1ff;
+                padding: 10px;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background: #2a4a6a; }
+        """)
+        self.refresh_btn.clicked.connect(self.refresh_passwords)
+
+        self.import_btn = QPushButton("📥 Импорт")
+        self.export_btn = QPushButton("📤 Экспорт")
+        self.audit_btn = QPushButton("🩺 Проверка")
+        self.job_buttons = (self.import_btn, self.export_btn, self.audit_btn)
+        for button in self.job_buttons:
+            button.setStyleSheet("""
+                QPushButton {
+                    background: #1e3a5a;
+                    color: #e6f1ff;
+                    padding: 10px;
+                    border-radius: 5px;
+                }
+                QPushButton:hover { background: #2a4a6a; }
+            """)
+        self.import_btn.clicked.connect(self.import_passwords)
+        self.export_btn.clicked.connect(self.export_passwords)
+        self.audit_btn.clicked.connect(self.audit_passwords)
+        
+        btn_layout.addWidget(self.add_btn)
+        btn_layout.addWidget(self.refresh_btn)
+        btn_layout.addWidget(self.import_btn)
+        btn_layout.addWidget(self.export_btn)
+        btn_layout.addWidget(self.audit_btn)
+        layout.addLayout(btn_layout)
+        
+        self.central_widget.setLayout(layout)
+        
+        # Текущий выбранный пароль
+        self.current_password = None
+        self.store = CredentialStore()
+        self.vault = Vault(self.store.path, self.store)
+        # Записи держим в модели и перечитываем только когда базу поменял кто-то другой
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_store_changed)
+        self.watch_store()
+
+        # Поиск идёт по индексу в отдельном потоке, запросы не чаще раза в 40 мс
+        self.search_id = 0
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(40)
+        self.search_timer.timeout.connect(self.request_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+        self.search_thread = QThread(self)
+        self.search_worker = VaultSearchWorker()
+        self.search_worker.moveToThread(self.search_thread)
+        self.index_changed.connect(self.search_worker.apply)
+        self.search_requested.connect(self.search_worker.search)
+        self.search_worker.results_ready.connect(self.show_search_results)
+        self.search_thread.start()
+        # Окно может быть удалено без closeEvent (вместе с родителем при выходе):
+        # работающий QThread при удалении роняет процесс, поэтому останавливаем заранее
+        QApplication.instance().aboutToQuit.connect(self.stop_threads)
+
+        # Импорт, экспорт и проверка грузятся при первом использовании и работают в общем фоновом потоке
+        self.job_thread = None
+        self.transfer_worker = None
+        self.audit_worker = None
+        self.active_worker = None
+        self.job_progress = None
+        
+        # Подключаем сигналы
+        self.show_pass_btn.toggled.connect(self.toggle_password_visibility)
+        self.copy_user_btn.clicked.connect(self.copy_username)
+        self.copy_pass_btn.clicked.connect(self.copy_password)
+        self.edit_btn.clicked.connect(self.edit_password)
+        self.delete_btn.clicked.connect(self.delete_current_password)
+        
+        self.load_passwords()
+    
+    def watch_store(self):
+        # После замены файла (новый inode) наблюдатель его теряет, поэтому добавляем заново
+        paths = [p for p in (self.store.path, self.store.path + "-wal")
+                 if os.path.exists(p) and p not in self.watcher.files()]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def on_store_changed(self, path):
+        self.watch_store()
+        self.refresh_passwords()
+
+    def refresh_passwords(self):
+        if self.model.loaded and not self.store.changed():
+            return
+        self.load_passwords()
+
+    def load_passwords(self):
+        self.details_widget.setVisible(False)
+        self.current_password = None
+        entries = self.store.all()
+        self.model.set_entries(entries)
+        self.index_changed.emit("load", entries)
+        if self.search_input.text().strip():
+            self.request_search()
+
+    def request_search(self):
+        self.search_id += 1
+        self.search_worker.latest = self.search_id
+        self.search_requested.emit(self.search_id, self.search_input.text())
+
+    def show_search_results(self, request_id, ids):
+        if request_id != self.search_id:
+            return
+        self.details_widget.setVisible(False)
+        self.current_password = None
+        self.model.set_matches(ids)
+
+    def update_empty_state(self):
+        empty = self.model.rowCount() == 0
+        self.empty_label.setText("Ничего не найдено" if self.model.filtered else "Нет сохранённых паролей")
+        self.empty_label.setVisible(empty)
+        self.password_list.setVisible(not empty)
+
+    def ensure_unlocked(self):
+        # Мастер-пароль спрашивается один раз, дальше ключ берётся из кэша до таймаута
+        if not available() or not self.vault.locked():
+            return True
+        if not self.vault.initialized():
+            master, ok = QInputDialog.getText(self, "Мастер-пароль", "Придумайте мастер-пароль для хранилища:",
+                                              QLineEdit.EchoMode.Password)
+            if not ok or not master:
+                return False
+            again, ok = QInputDialog.getText(self, "Мастер-пароль", "Повторите мастер-пароль:",
+                                             QLineEdit.EchoMode.Password)
+            if not ok:
+                return False
+            if again != master:
+                QMessageBox.warning(self, "Ошибка", "Пароли не совпадают!")
+                return False
+            self.vault.create(master)
+        else:
+            while True:
+                master, ok = QInputDialog.getText(self, "Мастер-пароль", "Введите мастер-пароль:",
+                                                  QLineEdit.EchoMode.Password)
+                if not ok:
+                    return False
+                if self.vault.unlock(master):
+                    break
+                QMessageBox.warning(self, "Ошибка", "Неверный мастер-пароль!")
+        if self.vault.seal_plaintext():
+            self.load_passwords()
+        return True
+
+    def show_password_details(self, index):
+        entry_id = index.data(Qt.ItemDataRole.UserRole)
+        if not self.ensure_unlocked():
+            return
+        entry = self.model.entry(entry_id)
+        if not entry:
+            return
+        try:
+            self.current_password = dict(entry, password=self.vault.open(entry))
+        except VaultError as e:
+            QMessageBox.warning(self, "Ошибка", str(e))
+            return
+        self.username_label.setText(self.current_password["username"])
+        self.password_line.setText(self.current_password["password"])
+        self.show_pass_btn.setChecked(False)
+        self.password_line.setEchoMode(QLineEdit.EchoMode.Password)
+        self.details_widget.setVisible(True)
+    
+    def toggle_password_visibility(self, checked):
+        if checked:
+            self.password_line.setEchoMode(QLineEdit.EchoMode.Normal)
+        else:
+            self.password_line.setEchoMode(QLineEdit.EchoMode.Password)
+    
+    def copy_username(self):
+        clipboard = QGuiApplication.clipboard()
+        clipboard.setText(self.username_label.text())
+        self.show_notification("Имя пользователя скопировано")
+    
+    def copy_password(self):
+        clipboard = QGuiApplication.clipboard()
+        clipboard.setText(self.password_line.text())
+        self.show_notification("Пароль скопирован")
+    
+    def show_notification(self, message):
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Уведомление")
+        msg.setText(message)
+        msg.setIcon(QMessageBox.Icon.Information)
+        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
+        msg.setStyleSheet("""
+            QMessageBox {
+                background-color: #0a192f;
+                color: #e6f1ff;
+            }
+            QLabel { color: #e6f1ff; }
+        """)
+        msg.show()
+        QTimer.singleShot(1000, msg.close)
+    
+    def add_password(self):
+        if not self.ensure_unlocked():
+            return
+        dialog = PasswordDialog(self)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            data = dialog.get_data()
+            if not all(data.values()):
+                QMessageBox.warning(self, "Ошибка", "Все поля должны быть заполнены!")
+                return
+            
+            sealed = self.vault.seal(data["site"], data["username"], data["password"])
+            entry_id = self.store.add(data["site"], data["username"], sealed)
+            self.model.add_entry(dict(data, id=entry_id, password=sealed))
+            self.index_changed.emit("put", dict(data, id=entry_id, password=sealed))
+            if self.model.filtered:
+                self.request_search()
+    
+    def edit_password(self):
+        if not self.current_password:
+            return
+            
+        dialog = PasswordDialog(
+            self, 
+            self.current_password["site"], 
+            self.current_password["username"], 
+            self.current_password["password"],
+            True
+        )
+        
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            new_data = dialog.get_data()
+            if not all(new_data.values()):
+                QMessageBox.warning(self, "Ошибка", "Все поля должны быть заполнены!")
+                return
+            
+            if not self.ensure_unlocked():
+                return
+            entry_id = self.current_password["id"]
+            sealed = self.vault.seal(new_data["site"], new_data["username"], new_data["password"])
+            self.store.update(entry_id, new_data["site"], new_data["username"], sealed)
+            self.model.update_entry(dict(new_data, id=entry_id, password=sealed))
+            self.index_changed.emit("put", dict(new_data, id=entry_id, password=sealed))
+            if self.model.filtered:
+                self.request_search()
+            self.current_password = None
+            self.details_widget.setVisible(False)
+    
+    def delete_current_password(self):
+        if not self.current_password:
+            return
+            
+        reply = QMessageBox.question(
+            self, "Подтверждение", 
+            f"Удалить пароль для {self.current_password['site']}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            self.store.delete(self.current_password["id"])
+            self.model.remove_entry(self.current_password["id"])
+            self.index_changed.emit("remove", self.current_password["id"])
+            self.current_password = None
+            self.details_widget.setVisible(False)
+    
+    def import_passwords(self):
+        if not self.ensure_unlocked():
+            return
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Импорт паролей", "", "Пароли (*.csv *.json);;Все файлы (*)"
+        )
+        if filename:
+            self.start_transfer("import", filename, "Импорт паролей...")
+
+    def export_passwords(self):
+        if not self.ensure_unlocked():
+            return
+        reply = QMessageBox.question(
+            self, "Подтверждение",
+            "Пароли будут сохранены в файл открытым текстом. Продолжить?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт паролей", "passwords.csv", "CSV (*.csv);;JSON (*.json)"
+        )
+        if filename:
+            self.start_transfer("export", filename, "Экспорт паролей...")
+
+    def start_job_thread(self):
+        if self.job_thread is None:
+            self.job_thread = QThread(self)
+            self.job_thread.start()
+        return self.job_thread
+
+    def start_transfer(self, op, filename, label):
+        if self.transfer_worker is None:
+            from premium.transfer import TransferWorker
+            self.transfer_worker = TransferWorker(self.store.path)
+            self.transfer_worker.moveToThread(self.start_job_thread())
+            self.transfer_requested.connect(self.transfer_worker.run)
+            self.transfer_worker.progress.connect(self.show_job_progress)
+            self.transfer_worker.finished.connect(self.finish_transfer)
+        self.begin_job(self.transfer_worker, label)
+        self.transfer_requested.emit(op, filename)
+
+    def audit_passwords(self):
+        if not self.ensure_unlocked():
+            return
+        if self.audit_worker is None:
+            from premium.audit import AuditWorker, BREACH_FILE
+            self.audit_worker = AuditWorker(self.store.path, data_path(BREACH_FILE))
+            self.audit_worker.moveToThread(self.start_job_thread())
+            self.audit_requested.connect(self.audit_worker.run)
+            self.audit_worker.progress.connect(self.show_job_progress)
+            self.audit_worker.finished.connect(self.finish_audit)
+        self.begin_job(self.audit_worker, "Проверка паролей...")
+        self.audit_requested.emit()
+
+    def begin_job(self, worker, label):
+        self.active_worker = worker
+        for button in self.job_buttons:
+            button.setEnabled(False)
+        self.job_progress = QProgressDialog(label, "Отмена", 0, 0, self)
+        self.job_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.job_progress.setMinimumDuration(500)
+        self.job_progress.canceled.connect(self.cancel_job)
+
+    def cancel_job(self):
+        # Флаг читается рабочим потоком между записями, очередь сигналов он сейчас не разбирает
+        if self.active_worker is not None:
+            self.active_worker.cancelled = True
+
+    def show_job_progress(self, done, total):
+        if self.job_progress is not None:
+            self.job_progress.setMaximum(total)
+            self.job_progress.setValue(min(done, total))
+
+    def end_job(self):
+        if self.job_progress is not None:
+            self.job_progress.canceled.disconnect(self.cancel_job)
+            self.job_progress.close()
+            self.job_progress = None
+        self.active_worker = None
+        for button in self.job_buttons:
+            button.setEnabled(True)
+
+    def finish_transfer(self, op, result):
+        self.end_job()
+        if op == "import":
+            self.refresh_passwords()
+            skipped = result["read"] - result["added"]
+            QMessageBox.information(self, "Импорт паролей",
+                                    f"Добавлено паролей: {result['added']}, уже были сохранены: {skipped}")
+        elif op == "export":
+            QMessageBox.information(self, "Экспорт паролей", f"Экспортировано паролей: {result['written']}")
+        elif op == "error":
+            QMessageBox.warning(self, "Ошибка", result)
+
+    def finish_audit(self, op, result):
+        self.end_job()
+        if op == "audit":
+            AuditDialog(self, result, self.model.entry).exec()
+        elif op == "error":
+            QMessageBox.warning(self, "Ошибка", result)
+
+    def stop_threads(self):
+        self.search_thread.quit()
+        self.search_thread.wait()
+        if self.job_thread is not None:
+            self.cancel_job()
+            self.job_thread.quit()
+            self.job_thread.wait()
+
+    def closeEvent(self, event):
+        self.stop_threads()
+        # Окно может пережить закрытие: база закрыта, чужие записи в неё больше не перечитываем
+        self.search_timer.stop()
+        self.watcher.fileChanged.disconnect(self.on_store_changed)
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        self.store.close()
+        super().closeEvent(event)
@@ -0,0 +1,232 @@
+import sys
+import time
+import struct
+from urllib.parse import urlsplit
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+from core.paths import data_path
+from core.storage import read_json
+
+NO_PROXY = "Без прокси"
+AUTO_PROXY = "Авто (самый быстрый)"
+PROXY_FILE = "proxies.json"
+# Прокси, которые были в браузере изначально; свой список - в proxies.json каталога данных
+DEFAULT_PROXIES = [
+    {"name": "США", "type": "http", "host": "ex.com", "port": 8022},
+    {"name": "Германия", "type": "http", "host": "de.com", "port": 8022},
+    {"name": "Япония", "type": "http", "host": "jp.com", "port": 3228},
+]
+# Адрес, до которого проверяется каждый прокси; отвечает пустым 204
+PROBE_URL = "http://connectivitycheck.gstatic.com/generate_204"
+PROBE_TIMEOUT = 5.0
+# В авто-режиме пул перепроверяется раз в столько секунд
+PROBE_INTERVAL = 60
+# Текущий прокси меняется, только если новый быстрее хотя бы в столько раз: без метаний
+SWITCH_RATIO = 1.5
+
+class ProxyError(Exception):
+    pass
+
+def load_pool(path):
+    config = read_json(path, {}) if path else {}
+    pool = []
+    for proxy in config.get("proxies", DEFAULT_PROXIES):
+        try:
+            kind = proxy.get("type", "http").lower()
+            if kind not in ("http", "socks5"):
+                raise ValueError(f"неизвестный тип {kind}")
+            pool.append({
+                "name": proxy.get("name") or f"{proxy['host']}:{proxy['port']}",
+                "type": kind,
+                "host": proxy["host"],
+                "port": int(proxy["port"]),
+                "username": proxy.get("username", ""),
+                "password": proxy.get("password", ""),
+            })
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            print(f"Пропущен прокси {proxy!r}: {e}", file=sys.stderr)
+    return pool, config.get("probe_url", PROBE_URL)
+
+async def socks5_connect(reader, writer, proxy, host, port):
+    # RFC 1928 и RFC 1929 (логин и пароль), адрес передаётся именем - DNS на стороне прокси
+    methods = b"\x00\x02" if proxy["username"] else b"\x00"
+    writer.write(b"\x05" + bytes([len(methods)]) + methods)
+    version, method = await reader.readexactly(2)
+    if version != 5 or method == 0xFF:
+        raise ProxyError("SOCKS5: способ входа не подошёл")
+    if method == 2:
+        username, password = proxy["username"].encode(), proxy["password"].encode()
+        writer.write(b"\x01" + bytes([len(username)]) + username + bytes([len(password)]) + password)
+        if (await reader.readexactly(2))[1] != 0:
+            raise ProxyError("SOCKS5: неверный логин или пароль")
+    name = host.encode("idna")
+    writer.write(b"\x05\x01\x00\x03" + bytes([len(name)]) + name + struct.pack(">H", port))
+    version, reply, _, address_type = await reader.readexactly(4)
+    if reply != 0:
+        raise ProxyError(f"SOCKS5: отказ в соединении ({reply})")
+    if address_type == 1:
+        await reader.readexactly(4 + 2)
+    elif address_type == 4:
+        await reader.readexactly(16 + 2)
+    else:
+        await reader.readexactly((await reader.readexactly(1))[0] + 2)
+
+async def request_through(proxy, target):
+    import asyncio
+    url = urlsplit(target)
+    host, port = url.hostname, url.port or 80
+    reader, writer = await asyncio.open_connection(proxy["host"], proxy["port"])
+    try:
+        headers = f"Host: {url.netloc}\r\nConnection: close\r\n"
+        if proxy["type"] == "socks5":
+            await socks5_connect(reader, writer, proxy, host, port)
+            request_line = f"GET {url.path or '/'} HTTP/1.1\r\n"
+        else:
+            request_line = f"GET {target} HTTP/1.1\r\n"
+            if proxy["username"]:
+                import base64
+                token = base64.b64encode(f"{proxy['username']}:{proxy['password']}".encode()).decode()
+                headers += f"Proxy-Authorization: Basic {token}\r\n"
+        writer.write((request_line + headers + "\r\n").encode())
+        status_line = await reader.readline()
+    finally:
+        writer.close()
+    parts = status_line.split()
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+        raise ProxyError("некорректный ответ")
+    status = int(parts[1])
+    # Адрес проверки отвечает 2xx (обычно 204). Всё остальное - прокси не пустил (407, 403),
+    # подменил ответ своей страницей или не смог достучаться до адреса (5xx)
+    if not 200 <= status < 300:
+        raise ProxyError(f"ответ {status}")
+
+async def probe(proxy, target, timeout=PROBE_TIMEOUT):
+    import asyncio
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(request_through(proxy, target), timeout)
+    except asyncio.TimeoutError:
+        return None, "таймаут"
+    except (OSError, EOFError, ProxyError, UnicodeError) as e:
+        return None, str(e) or type(e).__name__
+    return (time.perf_counter() - started) * 1000, None
+
+async def probe_all(pool, target, timeout=PROBE_TIMEOUT):
+    # Все прокси проверяются одновременно: общее время - как у самого медленного, а не сумма
+    import asyncio
+    return await asyncio.gather(*(probe(proxy, target, timeout) for proxy in pool))
+
+class ProxyProber(QObject):
+    # Живёт в отдельном QThread, каждый запуск крутит свой цикл asyncio
+    results_ready = pyqtSignal(int, object)
+
+    @pyqtSlot(int, object, str)
+    def probe(self, request_id, pool, target):
+        import asyncio
+        self.results_ready.emit(request_id, asyncio.run(probe_all(pool, target)))
+
+class ProxyManager(QObject):
+    probe_requested = pyqtSignal(int, object, str)
+    status_changed = pyqtSignal()
+
+    def __init__(self, parent=None, path=None):
+        super().__init__(parent)
+        self.pool, self.probe_url = load_pool(path or data_path(PROXY_FILE))
+        # name -> задержка в мс или None, если прокси недоступен
+        self.latency = {}
+        self.errors = {}
+        self.mode = NO_PROXY
+        self.current = None
+        self.probe_id = 0
+        self.probing = False
+
+        self.thread = QThread(self)
+        self.prober = ProxyProber()
+        self.prober.moveToThread(self.thread)
+        self.probe_requested.connect(self.prober.probe)
+        self.prober.results_ready.connect(self.on_probed)
+        self.thread.start()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(PROBE_INTERVAL * 1000)
+        self.timer.timeout.connect(self.probe)
+
+    def names(self):
+        return [proxy["name"] for proxy in self.pool]
+
+    def find(self, name):
+        return next((proxy for proxy in self.pool if proxy["name"] == name), None)
+
+    def probe(self):
+        self.probe_id += 1
+        self.probing = True
+        self.probe_requested.emit(self.probe_id, self.pool, self.probe_url)
+        self.status_changed.emit()
+
+    @pyqtSlot(int, object)
+    def on_probed(self, request_id, results):
+        if request_id != self.probe_id:
+            return
+        self.probing = False
+        for proxy, (latency, error) in zip(self.pool, results):
+            self.latency[proxy["name"]] = latency
+            self.errors[proxy["name"]] = error
+        if self.mode == AUTO_PROXY:
+            self.failover()
+        self.status_changed.emit()
+
+    def fastest(self):
+        healthy = [proxy for proxy in self.pool if self.latency.get(proxy["name"]) is not None]
+        return min(healthy, key=lambda proxy: self.latency[proxy["name"]], default=None)
+
+    def failover(self):
+        best = self.fastest()
+        if best is None:
+            return  # живых прокси нет: остаёмся на текущем, пул перепроверится по таймеру
+        current = self.latency.get(self.current["name"]) if self.current else None
+        if current is not None and current <= self.latency[best["name"]] * SWITCH_RATIO:
+            return
+        self.apply(best)
+
+    def set_proxy(self, location):
+        self.mode = location
+        if location == NO_PROXY:
+            self.timer.stop()
+            self.apply(None)
+        elif location == AUTO_PROXY:
+            # Пока нет замеров, ждём первой проверки; дальше перепроверка по таймеру
+            self.timer.start()
+            if self.latency:
+                self.failover()
+            if not self.probing:
+                self.probe()
+        elif self.find(location):
+            self.timer.stop()
+            self.apply(self.find(location))
+        self.status_changed.emit()
+
+    def apply(self, proxy):
+        # QtWebEngine берёт прокси только из настроек приложения: отдельный прокси
+        # для профиля Chromium в Qt не поддерживается, поэтому он общий для всех вкладок
+        from PyQt6.QtNetwork import QNetworkProxy
+        if proxy is None:
+            QNetworkProxy.setApplicationProxy(QNetworkProxy(QNetworkProxy.ProxyType.NoProxy))
+        else:
+            kind = QNetworkProxy.ProxyType.Socks5Proxy if proxy["type"] == "socks5" else QNetworkProxy.ProxyType.HttpProxy
+            QNetworkProxy.setApplicationProxy(QNetworkProxy(
+                kind, proxy["host"], proxy["port"], proxy["username"], proxy["password"]
+            ))
+        self.current = proxy
+        self.status_changed.emit()
+
+    def close(self):
+        self.timer.stop()
+        self.thread.quit()
+        self.thread.wait()
+
+def proxy_manager(app):
+    # Один на процесс, как и сам прокси QtWebEngine: переживает закрытие окна спец. функций
+    manager = app.findChild(ProxyManager)
+    if manager is None:
+        manager = ProxyManager(app)
+        app.aboutToQuit.connect(manager.close)
+    return manager
@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+from core.paths import data_path
+from premium.proxy import PROXY_FILE, load_pool
+
+RULES_FILE = "proxy_rules.txt"
+PAC_FILE = "proxy.pac"
+# Метки узла дерева доменов: правило для самого домена и для его поддоменов
+EXACT = "="
+SUBDOMAINS = "*"
+
+def parse_ipv4(host):
+    parts = host.split(".")
+    if len(parts) != 4:
+        return None
+    value = 0
+    for part in parts:
+        if not part.isdigit() or int(part) > 255:
+            return None
+        value = value << 8 | int(part)
+    return value
+
+def parse_action(text, pool):
+    # DIRECT, PROXY (весь пул по порядку), PROXY <имя из пула>, PROXY/SOCKS5 host:port -
+    # результат сразу в формате PAC, Chromium сам переходит к следующему при отказе
+    kind, _, target = text.partition(" ")
+    kind, target = kind.upper(), target.strip()
+    if kind == "DIRECT" and not target:
+        return "DIRECT"
+    if kind not in ("PROXY", "SOCKS5"):
+        raise ValueError(f"неизвестное действие {text!r}")
+    if kind == "PROXY" and not target:
+        proxies = pool
+    else:
+        proxies = [proxy for proxy in pool if proxy["name"] == target]
+    if proxies:
+        return "; ".join(f"{'SOCKS5' if p['type'] == 'socks5' else 'PROXY'} {p['host']}:{p['port']}" for p in proxies)
+    host, _, port = target.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"нет прокси {target!r}")
+    return f"{kind} {host}:{port}"
+
+class ProxyRouter:
+    # Правила компилируются один раз: домены - в дерево по меткам справа налево,
+    # подсети IPv4 - в двоичное дерево по битам адреса. Решение для запроса -
+    # один проход по меткам хоста или не больше 32 шагов по битам адреса.
+    def __init__(self, default="DIRECT"):
+        self.trie = {}
+        self.cidr = [None, None, None]
+        self.local = None
+        self.default = default
+
+    def add(self, pattern, action):
+        pattern = pattern.lower().rstrip(".")
+        if pattern == "*":
+            self.default = action
+        elif pattern == "<local>":
+            self.local = action
+        elif pattern[:1].isdigit() and parse_ipv4(pattern.split("/")[0]) is not None:
+            self.add_network(pattern, action)
+        else:
+            marks = [EXACT]
+            if pattern.startswith("*."):
+                pattern, marks = pattern[2:], [SUBDOMAINS]
+            elif pattern.startswith("."):
+                pattern, marks = pattern[1:], [EXACT, SUBDOMAINS]
+            if not pattern or "*" in pattern or "/" in pattern:
+                raise ValueError(f"некорректный шаблон {pattern!r}")
+            node = self.trie
+            for label in reversed(pattern.split(".")):
+                node = node.setdefault(label, {})
+            for mark in marks:
+                node[mark] = action
+
+    def add_network(self, pattern, action):
+        address, _, bits = pattern.partition("/")
+        bits = int(bits) if bits else 32
+        if not 0 <= bits <= 32:
+            raise ValueError(f"некорректная маска {pattern!r}")
+        address = parse_ipv4(address)
+        node = self.cidr
+        for shift in range(31, 31 - bits, -1):
+            bit = address >> shift & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        node[2] = action
+
+    def match_address(self, address):
+        node = self.cidr
+        action = node[2]
+        shift = 31
+        while node is not None:
+            if node[2] is not None:
+                action = node[2]
+            if shift < 0:
+                break
+            node = node[address >> shift & 1]
+            shift -= 1
+        return action
+
+    def match_host(self, host):
+        labels = host.split(".")
+        node = self.trie
+        action = None
+        for index in range(len(labels) - 1, -1, -1):
+            node = node.get(labels[index])
+            if node is None:
+                break
+            if index and SUBDOMAINS in node:
+                action = node[SUBDOMAINS]
+            elif not index and EXACT in node:
+                action = node[EXACT]
+        return action
+
+    def route(self, host):
+        # Самое точное правило выигрывает: домен или подсеть, затем <local>, затем *
+        host = host.lower().rstrip(".")
+        address = parse_ipv4(host) if host[-1:].isdigit() else None
+        if address is not None:
+            action = self.match_address(address)
+        else:
+            action = self.match_host(host)
+            if action is None and "." not in host:
+                action = self.local
+        return action or self.default
+
+    def pac(self):
+        # То же дерево и тот же алгоритм, но в JavaScript: PAC выполняет сам Chromium.
+        # Данные идут через JSON.parse, чтобы метки вроде __proto__ остались обычными ключами.
+        return PAC_TEMPLATE % (
+            json.dumps(json.dumps(self.trie, ensure_ascii=False, separators=(",", ":"))),
+            json.dumps(json.dumps(self.cidr, separators=(",", ":"))),
+            json.dumps(self.local), json.dumps(self.default),
+        )
+
+PAC_TEMPLATE = """// Создано GovnoBrowser из proxy_rules.txt, изменения вносите туда
+var TRIE = JSON.parse(%s);
+var CIDR = JSON.parse(%s);
+var LOCAL = %s;
+var DEFAULT = %s;
+
+function parseIPv4(host) {
+    var parts = host.split(".");
+    if (parts.length != 4) return null;
+    var value = 0;
+    for (var i = 0; i < 4; i++) {
+        if (!/^[0-9]+$/.test(parts[i]) || +parts[i] > 255) return null;
+        value = value * 256 + +parts[i];
+    }
+    return value;
+}
+
+function has(node, key) {
+    return Object.prototype.hasOwnProperty.call(node, key);
+}
+
+function FindProxyForURL(url, host) {
+    host = host.toLowerCase().replace(/\\.$/, "");
+    var action = null;
+    var address = parseIPv4(host);
+    if (address !== null) {
+        var node = CIDR;
+        for (var shift = 31; node !== null; shift--) {
+            if (node[2] !== null) action = node[2];
+            if (shift < 0) break;
+            node = node[Math.floor(address / Math.pow(2, shift)) %% 2];
+        }
+    } else {
+        var labels = host.split(".");
+        var node = TRIE;
+        for (var i = labels.length - 1; i >= 0; i--) {
+            if (!has(node, labels[i])) break;
+            node = node[labels[i]];
+            if (i > 0 && has(node, "*")) action = node["*"];
+            else if (i == 0 && has(node, "=")) action = node["="];
+        }
+        if (action === null && host.indexOf(".") < 0) action = LOCAL;
+    }
+    return action || DEFAULT;
+}
+"""
+
+def compile_rules(lines, pool):
+    router = ProxyRouter()
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        pattern, _, action = line.partition(" ")
+        try:
+            router.add(pattern, parse_action(action.strip(), pool))
+        except ValueError as e:
+            print(f"{RULES_FILE}, строка {number}: {e}", file=sys.stderr)
+    return router
+
+def load_router(path=None):
+    with open(path or data_path(RULES_FILE), "r", encoding="utf-8") as f:
+        return compile_rules(f, load_pool(data_path(PROXY_FILE))[0])
+
+def ensure_pac():
+    # PAC пересобирается только если правила или список прокси новее готового файла
+    pac_path = data_path(PAC_FILE)
+    sources = [data_path(RULES_FILE), data_path(PROXY_FILE)]
+    try:
+        built = os.path.getmtime(pac_path)
+    except OSError:
+        built = 0
+    if any(os.path.exists(path) and os.path.getmtime(path) > built for path in sources):
+        from core.storage import atomic_write
+        atomic_write(pac_path, load_router().pac(), durable=False)
+    return pac_path
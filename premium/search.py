@@ -0,0 +1,146 @@
+import bisect
+import itertools
+from collections import Counter, defaultdict
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from core.domains import normalize_host, registrable_domain
+
+# Сколько записей показывать по одному запросу
+SEARCH_LIMIT = 1000
+# Сколько кандидатов с опечатками проверять за один запрос
+CANDIDATE_LIMIT = 2000
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class VaultIndex:
+    def __init__(self):
+        self.entries = {}
+        # Триграммы сайта и логина -> id записей
+        self.grams = defaultdict(set)
+        # Отсортированные пары (eTLD+1, id) для поиска по префиксу домена
+        self.domains = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self, entries):
+        self.entries = {}
+        self.grams = defaultdict(set)
+        self.domains = []
+        for entry in entries:
+            self.put(entry, sort=False)
+        self.domains.sort()
+
+    def put(self, entry, sort=True):
+        entry_id = entry["id"]
+        if entry_id in self.entries:
+            self.remove(entry_id)
+        site = normalize_host(entry["site"])
+        username = entry["username"].lower()
+        domain = registrable_domain(site)
+        self.entries[entry_id] = (site, username, domain)
+        grams = self.grams
+        for gram in trigrams(site) | trigrams(username):
+            grams[gram].add(entry_id)
+        if sort:
+            bisect.insort(self.domains, (domain, entry_id))
+        else:
+            self.domains.append((domain, entry_id))
+
+    def remove(self, entry_id):
+        site, username, domain = self.entries.pop(entry_id)
+        for gram in trigrams(site) | trigrams(username):
+            ids = self.grams[gram]
+            ids.discard(entry_id)
+            if not ids:
+                del self.grams[gram]
+        row = bisect.bisect_left(self.domains, (domain, entry_id))
+        del self.domains[row]
+
+    def domain_matches(self, prefix, limit):
+        row = bisect.bisect_left(self.domains, (prefix,))
+        matches = []
+        for domain, entry_id in self.domains[row:row + limit]:
+            if not domain.startswith(prefix):
+                break
+            matches.append(entry_id)
+        return matches
+
+    def fuzzy_matches(self, text, limit):
+        grams = trigrams(text)
+        if not grams:
+            return {}
+        postings = sorted((self.grams.get(gram, set()) for gram in grams), key=len)
+        # Триграммы, которые есть во всех записях, ничего не отсекают: считаем их совпавшими сразу
+        common = sum(len(ids) == len(self.entries) for ids in postings)
+        postings = postings[:len(postings) - common]
+        if not postings:
+            return {entry_id: 1.0 for entry_id in itertools.islice(self.entries, limit)}
+        # Записи со всеми триграммами запроса находим пересечением множеств, без цикла в Python
+        exact = set.intersection(*postings)
+        if len(exact) >= limit:
+            return {entry_id: 1.0 for entry_id in itertools.islice(exact, limit)}
+        scores = {}
+        for entry_id in exact:
+            site, username = self.entries[entry_id][:2]
+            scores[entry_id] = 1.0 + (text in site or text in username)
+        # Допускаем опечатку на каждые три триграммы. Подходящая запись обязана попасть
+        # хотя бы в один из (misses + 1) самых редких списков, остальные не перебираем.
+        misses = len(grams) // 3
+        if not misses:
+            return scores
+        needed = len(grams) - misses - common
+        candidates = set()
+        for ids in postings[:misses + 1]:
+            candidates.update(itertools.islice(ids - exact if len(ids) < CANDIDATE_LIMIT else ids, CANDIDATE_LIMIT))
+            if len(candidates) >= CANDIDATE_LIMIT:
+                break
+        candidates -= exact
+        # Совпадения считаем пересечениями с каждым списком, перебор идёт внутри C
+        hits = Counter()
+        for ids in postings:
+            hits.update(candidates & ids)
+        for entry_id, count in hits.items():
+            if count >= needed:
+                scores[entry_id] = (count + common) / len(grams)
+        return scores
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        text = text.strip().lower()
+        if not text:
+            return None
+        prefix = normalize_host(text)
+        ranked = self.domain_matches(prefix, limit) if prefix else []
+        if len(ranked) >= limit:
+            return ranked
+        seen = set(ranked)
+        scores = self.fuzzy_matches(text, limit)
+        for entry_id in seen:
+            scores.pop(entry_id, None)
+        rest = sorted(scores, key=scores.__getitem__, reverse=True)[:limit - len(ranked)]
+        rest.sort(key=lambda entry_id: (-scores[entry_id], self.entries[entry_id][0]))
+        return ranked + rest
+
+class VaultSearchWorker(QObject):
+    # Живёт в отдельном QThread: индекс меняется и читается только в этом потоке
+    results_ready = pyqtSignal(int, object)
+
+    def __init__(self):
+        super().__init__()
+        self.index = VaultIndex()
+        self.latest = 0
+
+    @pyqtSlot(str, object)
+    def apply(self, op, payload):
+        if op == "load":
+            self.index.load(payload)
+        elif op == "put":
+            self.index.put(payload)
+        elif op == "remove" and payload in self.index.entries:
+            self.index.remove(payload)
+
+    @pyqtSlot(int, str)
+    def search(self, request_id, text):
+        if request_id < self.latest:
+            return  # пользователь уже набрал что-то новее
+        self.results_ready.emit(request_id, self.index.search(text))
@@ -0,0 +1,101 @@
+from random import randint
+from PyQt6.QtCore import Qt, QTimer, QRectF
+from PyQt6.QtWidgets import QWidget, QMessageBox
+from PyQt6.QtGui import QPainter, QBrush, QPen, QColor
+
+class SnakeGame(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Змейка.app")
+        self.setFixedSize(420, 420)
+        self.setStyleSheet("background-color: #0a192f;")
+        
+        self.cell_size = 20
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.move_snake)
+        self.direction = Qt.Key.Key_Right
+        self.snake = []
+        self.food = None
+        self.score = 0
+        
+        self.init_game()
+        self.timer.start(200)
+    
+    def init_game(self):
+        start_x, start_y = 100, 100
+        for i in range(3):
+            self.snake.append(QRectF(
+                start_x - i * self.cell_size, 
+                start_y, 
+                self.cell_size, 
+                self.cell_size
+            ))
+        self.spawn_food()
+    
+    def spawn_food(self):
+        cols = self.width() // self.cell_size
+        rows = self.height() // self.cell_size
+        self.food = QRectF(
+            randint(0, cols-1) * self.cell_size,
+            randint(0, rows-1) * self.cell_size,
+            self.cell_size,
+            self.cell_size
+        )
+    
+    def move_snake(self):
+        head = self.snake[0]
+        new_head = QRectF(head)
+        
+        if self.direction == Qt.Key.Key_Left:
+            new_head.moveLeft(head.left() - self.cell_size)
+        elif self.direction == Qt.Key.Key_Right:
+            new_head.moveLeft(head.left() + self.cell_size)
+        elif self.direction == Qt.Key.Key_Up:
+            new_head.moveTop(head.top() - self.cell_size)
+        elif self.direction == Qt.Key.Key_Down:
+            new_head.moveTop(head.top() + self.cell_size)
+        
+        if (new_head.left() < 0 or 
+            new_head.right() > self.width() or
+            new_head.top() < 0 or 
+            new_head.bottom() > self.height() or
+            any(new_head.intersects(segment) for segment in self.snake[:-1])):
+            self.game_over()
+            return
+        
+        self.snake.insert(0, new_head)
+        
+        if new_head.intersects(self.food):
+            self.score += 1
+            self.spawn_food()
+        else:
+            self.snake.pop()
+        
+        self.update()
+    
+    def game_over(self):
+        self.timer.stop()
+        QMessageBox.information(self, "Game Over", f"Счёт: {self.score}")
+        self.close()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        painter.setBrush(QBrush(QColor(100, 255, 100)))
+        for segment in self.snake:
+            painter.drawRect(segment)
+        
+        painter.setBrush(QBrush(QColor(255, 100, 100)))
+        painter.drawRect(self.food)
+        
+        painter.setPen(QPen(Qt.GlobalColor.white))
+        painter.drawText(10, 20, f"Счёт: {self.score}")
+    
+    def keyPressEvent(self, event):
+        key = event.key()
+        if (key == Qt.Key.Key_Left and self.direction != Qt.Key.Key_Right or
+            key == Qt.Key.Key_Right and self.direction != Qt.Key.Key_Left or
+            key == Qt.Key.Key_Up and self.direction != Qt.Key.Key_Down or
+            key == Qt.Key.Key_Down and self.direction != Qt.Key.Key_Up):
+            self.direction = key
@@ -0,0 +1,185 @@
+import os
+import re
+import csv
+import json
+import codecs
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from core.domains import normalize_host
+from premium.credentials import CredentialStore
+from premium.vault import Vault, VaultError
+
+# Через сколько записей сообщать о прогрессе и проверять отмену
+PROGRESS_STEP = 500
+CHUNK_SIZE = 64 * 1024
+# Формат экспорта Chrome: его понимают Chrome, Firefox и большинство менеджеров паролей
+CSV_FIELDS = ["name", "url", "username", "password"]
+# Chrome пишет url и name, Firefox - url, наш JSON - site
+SITE_FIELDS = ("site", "url", "origin", "name")
+USERNAME_FIELDS = ("username", "login")
+JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+class TransferCancelled(Exception):
+    pass
+
+class Source:
+    # Файл читается кусками, позиция в байтах нужна только для прогресса
+    def __init__(self, f):
+        self.file = f
+        self.size = os.fstat(f.fileno()).st_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")("replace")
+
+    def position(self):
+        return self.file.tell()
+
+    def lines(self):
+        for line in self.file:
+            yield self.decoder.decode(line)
+
+    def chunks(self):
+        while True:
+            chunk = self.file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield self.decoder.decode(chunk)
+
+def read_csv(source):
+    reader = csv.reader(source.lines())
+    header = [name.strip().lower() for name in next(reader, [])]
+    for row in reader:
+        yield dict(zip(header, row))
+
+def read_json(source):
+    # Потоковый разбор массива: в памяти только текущий кусок файла, а не весь список
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    for chunk in source.chunks():
+        buffer += chunk
+        pos = 0
+        while True:
+            pos = JSON_SEPARATORS.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Ожидался JSON-массив записей")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                value, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # запись не дочитана, ждём следующий кусок
+            yield value
+        buffer = buffer[pos:]
+    raise ValueError("Файл JSON обрывается")
+
+def pick(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value:
+            return value
+    return ""
+
+def as_credential(record):
+    if not isinstance(record, dict):
+        return None
+    site = normalize_host(pick(record, SITE_FIELDS))
+    password = record.get("password")
+    if not site or not password:
+        return None
+    return site, pick(record, USERNAME_FIELDS), password
+
+def write_csv(f, entries):
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    for entry in entries:
+        writer.writerow([entry["site"], f"https://{entry['site']}/", entry["username"], entry["password"]])
+
+def write_json(f, entries):
+    f.write("[")
+    separator = "\n"
+    for entry in entries:
+        f.write(separator + json.dumps(
+            {"site": entry["site"], "username": entry["username"], "password": entry["password"]},
+            ensure_ascii=False
+        ))
+        separator = ",\n"
+    f.write("\n]\n")
+
+def is_json(filename):
+    return filename.lower().endswith(".json")
+
+class TransferWorker(QObject):
+    # Живёт в отдельном QThread со своим соединением к хранилищу, GUI только получает прогресс
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str, object)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.cancelled = False
+
+    def step(self, count, done, total):
+        if count % PROGRESS_STEP == 0:
+            if self.cancelled:
+                raise TransferCancelled()
+            self.progress.emit(done(), total)
+
+    @pyqtSlot(str, str)
+    def run(self, op, filename):
+        self.cancelled = False
+        store = CredentialStore(self.path)
+        try:
+            if op == "import":
+                result = self.import_file(store, filename)
+            else:
+                result = self.export_file(store, filename)
+        except TransferCancelled:
+            self.finished.emit("cancelled", None)
+        except (OSError, ValueError, csv.Error, VaultError) as e:
+            self.finished.emit("error", str(e))
+        else:
+            self.finished.emit(op, result)
+        finally:
+            store.close()
+
+    def import_file(self, store, filename):
+        vault = Vault(self.path)
+        result = {"read": 0, "added": 0}
+
+        def sealed(records, source):
+            for count, record in enumerate(records, 1):
+                self.step(count, source.position, source.size)
+                credential = as_credential(record)
+                if credential:
+                    result["read"] += 1
+                    yield credential[:2] + (vault.seal(*credential),)
+
+        with open(filename, "rb") as f:
+            source = Source(f)
+            records = read_json(source) if is_json(filename) else read_csv(source)
+            result["added"] = store.add_many(sealed(records, source))
+        return result
+
+    def export_file(self, store, filename):
+        vault = Vault(self.path)
+        total = store.count()
+
+        def opened(entries):
+            for count, entry in enumerate(entries, 1):
+                self.step(count, lambda: count, total)
+                yield dict(entry, password=vault.open(entry))
+
+        # Пишем во временный файл: при отмене или ошибке недописанный экспорт не остаётся
+        tmp_path = filename + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                (write_json if is_json(filename) else write_csv)(f, opened(store.each()))
+            os.replace(tmp_path, filename)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return {"written": total}
@@ -0,0 +1,134 @@
+import os
+import time
+import importlib.util
+
+# scrypt: 2^15 * 8 * 128 байт = 32 МБ памяти и ~150 мс на вывод ключа
+KDF_N = 2 ** 15
+KDF_R = 8
+KDF_P = 1
+KDF_MAXMEM = 64 * 1024 * 1024
+# Сколько секунд без обращений ключ остаётся в памяти
+KEY_TIMEOUT = 15 * 60
+VERIFIER = b"govno-vault"
+
+class VaultError(Exception):
+    pass
+
+def available():
+    # cryptography необязателен: без него пароли хранятся как раньше, открытым текстом
+    return importlib.util.find_spec("cryptography") is not None
+
+def derive_key(password, salt, n=KDF_N, r=KDF_R, p=KDF_P):
+    import hashlib  # OpenSSL грузится только при разблокировке, а не при импорте менеджера
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=KDF_MAXMEM, dklen=32)
+
+def make_cipher(key):
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    return AESGCM(key)
+
+def record_aad(site, username):
+    # Шифротекст привязан к записи: пароль нельзя молча переставить на чужой сайт
+    return f"{site}\0{username}".encode("utf-8")
+
+class KeyCache:
+    def __init__(self, timeout=KEY_TIMEOUT):
+        self.timeout = timeout
+        self.ciphers = {}
+
+    def get(self, path):
+        item = self.ciphers.get(path)
+        if item is None:
+            return None
+        cipher, expires = item
+        now = time.monotonic()
+        if now > expires:
+            del self.ciphers[path]
+            return None
+        self.ciphers[path] = (cipher, now + self.timeout)
+        return cipher
+
+    def put(self, path, cipher):
+        self.ciphers[path] = (cipher, time.monotonic() + self.timeout)
+
+    def clear(self, path=None):
+        if path is None:
+            self.ciphers.clear()
+        else:
+            self.ciphers.pop(path, None)
+
+# Один на процесс: менеджер паролей и автозаполнение разблокируются одним вводом пароля
+key_cache = KeyCache()
+
+class Vault:
+    def __init__(self, path, store=None):
+        self.path = os.path.abspath(path)
+        self.store = store
+
+    def initialized(self):
+        return self.store.get_meta("salt") is not None
+
+    def locked(self):
+        return key_cache.get(self.path) is None
+
+    def cipher(self):
+        cipher = key_cache.get(self.path)
+        if cipher is None:
+            raise VaultError("Хранилище паролей заблокировано")
+        return cipher
+
+    def create(self, master):
+        salt = os.urandom(16)
+        cipher = make_cipher(derive_key(master, salt))
+        nonce = os.urandom(12)
+        self.store.set_meta(
+            salt=salt, kdf=f"{KDF_N},{KDF_R},{KDF_P}",
+            verifier=nonce + cipher.encrypt(nonce, VERIFIER, b"verifier")
+        )
+        key_cache.put(self.path, cipher)
+
+    def unlock(self, master):
+        if key_cache.get(self.path) is not None:
+            return True
+        from cryptography.exceptions import InvalidTag
+        n, r, p = (int(value) for value in self.store.get_meta("kdf").split(","))
+        cipher = make_cipher(derive_key(master, self.store.get_meta("salt"), n, r, p))
+        verifier = self.store.get_meta("verifier")
+        try:
+            cipher.decrypt(verifier[:12], verifier[12:], b"verifier")
+        except InvalidTag:
+            return False
+        key_cache.put(self.path, cipher)
+        return True
+
+    def lock(self):
+        key_cache.clear(self.path)
+
+    def seal(self, site, username, password):
+        if not available():
+            return password
+        nonce = os.urandom(12)
+        return nonce + self.cipher().encrypt(nonce, password.encode("utf-8"), record_aad(site, username))
+
+    def open(self, entry):
+        # Расшифровывается одна запись и только когда пароль действительно нужен
+        password = entry["password"]
+        if isinstance(password, str):
+            return password
+        if not available():
+            raise VaultError("Для расшифровки паролей нужен пакет cryptography")
+        from cryptography.exceptions import InvalidTag
+        try:
+            plain = self.cipher().decrypt(password[:12], password[12:], record_aad(entry["site"], entry["username"]))
+        except InvalidTag:
+            raise VaultError(f"Запись для {entry['site']} повреждена")
+        return plain.decode("utf-8")
+
+    def seal_plaintext(self):
+        # Записи, оставшиеся открытым текстом (старый passwords.json), шифруются после разблокировки
+        pairs = [(entry["id"], self.seal(entry["site"], entry["username"], entry["password"]))
+                 for entry in self.store.plaintext()]
+        self.store.set_passwords(pairs)
+        if available():
+            # Всё зашифровано - копия старого passwords.json с открытыми паролями больше не нужна
+            self.store.drop_legacy_backup()
+        return len(pairs)
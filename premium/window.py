@@ -0,0 +1,290 @@
+import os
+from PyQt6.QtCore import QUrl, Qt, QTimer, QPropertyAnimation
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QLineEdit, QPushButton, QWidget, QMessageBox, QLabel, QVBoxLayout,
+    QHBoxLayout, QComboBox
+)
+from PyQt6.QtGui import QDesktopServices
+from core.storage import atomic_write
+from core.paths import data_path
+
+class PremiumWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("GovnoBrowser | Меня спец. функций")
+        self.resize(700, 500)
+        self.setStyleSheet("""
+            background-color: #0a192f;
+            color: #e6f1ff;
+            font-family: Arial;
+        """)
+        
+        self.PREMIUM_KEYS = [
+            "AGLR71@!91vsUW", #1
+            "9KLM#22@FFA1XZ", #2
+            "PQ92$%AA11BB33", #3
+            "ZX45&*CC99DD88", #4
+            "261189HGHJliq7", #5
+            "5817JFJQOL<T34", #6
+            "DUYIK)!$$!5217", #7
+            "JHQKjg76347437", #8
+            "u3e812JGKLGFXH", #9
+            "7126484kajsh!@"  #10
+        ]
+        
+        # Менеджер прокси со своим потоком проверки создаётся при первом применении или проверке
+        self.proxy_manager = None
+
+        self.premium_key = self.load_premium_key()
+        if not self.premium_key:
+            self.show_activation_screen()
+        else:
+            self.show_premium_features()
+
+    def load_premium_key(self):
+        path = data_path("premium.txt")
+        if not os.path.exists(path):
+            return None
+        
+        with open(path, "r") as f:
+            key = f.read().strip()
+        
+        return key if key in self.PREMIUM_KEYS else None
+    
+    def get_proxy_manager(self):
+        if self.proxy_manager is None:
+            from premium.proxy import proxy_manager
+            self.proxy_manager = proxy_manager(QApplication.instance())
+            self.proxy_manager.status_changed.connect(self.update_proxy_status)
+        return self.proxy_manager
+
+    def apply_proxy(self):
+        location = self.proxy_combo.currentText()
+        self.get_proxy_manager().set_proxy(location)
+        QMessageBox.information(self, "GB-ProxyMaster:", f"Прокси: {location} успешно изменен!")
+
+    def probe_proxies(self):
+        self.get_proxy_manager().probe()
+
+    def update_proxy_status(self):
+        from premium.proxy import NO_PROXY
+        manager = self.proxy_manager
+        lines = ["Проверка прокси..."] if manager.probing else []
+        for name in manager.names():
+            if name in manager.latency:
+                latency = manager.latency[name]
+                lines.append(f"{name}: {latency:.0f} мс" if latency is not None
+                             else f"{name}: недоступен ({manager.errors[name]})")
+        lines.append(f"Сейчас: {manager.current['name'] if manager.current else NO_PROXY}")
+        self.proxy_status.setText("\n".join(lines))
+
+    def show_activation_screen(self):
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)    
+        
+        layout = QVBoxLayout()
+        
+        title = QLabel("Активируй спец. функции!")
+        button = QPushButton("Как получить ключ?")
+        button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://govno-browser.netlify.app/#premium")))
+        button.setStyleSheet("""
+            QPushButton {
+                background: gold;
+                color: black;
+                font-weight: bold;
+                padding: 10px;
+                border-radius: 5px;
+                min-width: 200px;
+                max-width: 200px;   
+            }
+            QPushButton:hover {
+                background: #FFD700;
+            }
+        """)
+        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #64ffda;")
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(button, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        self.key_input = QLineEdit()
+        self.key_input.setPlaceholderText("Введите ключ...")
+        self.key_input.setStyleSheet("""
+            padding: 10px;
+            border: 2px solid #64ffda;
+            border-radius: 5px;
+            background: #172a45;
+            color: white;
+        """)
+        layout.addWidget(self.key_input)
+        
+        activate_btn = QPushButton("Активировать")
+        activate_btn.setStyleSheet("""
+            QPushButton {
+                background: #64ffda;
+                color: #0a192f;
+                padding: 10px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #52e3c2; }
+        """)
+        activate_btn.clicked.connect(self.activate_premium)
+        layout.addWidget(activate_btn)
+        
+        self.central_widget.setLayout(layout)
+
+    def activate_premium(self):
+        key = self.key_input.text().strip()
+        if not key:
+            QMessageBox.warning(self, "Ошибка", "Введи ключ!")
+            return
+        
+        if key not in self.PREMIUM_KEYS:
+            QMessageBox.warning(self, "Ошибка", "Неверный ключ!")
+            return
+        
+        atomic_write(data_path("premium.txt"), key)
+        
+        self.fade_out_animation()
+        QTimer.singleShot(1000, self.show_premium_features)
+
+    def fade_out_animation(self):
+        self.animation = QPropertyAnimation(self, b"windowOpacity")
+        self.animation.setDuration(500)
+        self.animation.setStartValue(1)
+        self.animation.setEndValue(0)
+        self.animation.start()
+
+    def show_premium_features(self):
+        self.setWindowOpacity(1)
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        
+        layout = QVBoxLayout()
+        
+        title = QLabel("🔥 Специальные функции")
+        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #7161b8; padding-bottom: 40px;")
+        layout.addWidget(title, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        # Кнопка змейки
+        snake_btn = QPushButton("Играть в змейку")
+        snake_btn.setStyleSheet("""
+            QPushButton {
+                background: #1c4d9d;
+                color: white;
+                padding: 10px;
+                border-radius: 5px;
+                font-size: 16px;
+                font-weight: bold;
+            }
+            QPushButton:hover { background: #1a3c5e; }
+        """)
+        snake_btn.clicked.connect(self.start_snake_game)
+        layout.addWidget(snake_btn)
+        
+        # Раздел прокси
+        title2 = QLabel("Прокси")
+        title2.setStyleSheet("font-size: 24px; font-weight: bold; color: white; padding: 10px")
+        layout.addWidget(title2, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        proxy_label = QLabel("Выберите прокси:")
+        proxy_label.setStyleSheet("color: #e6f1ff; font-size: 14px; margin-top: 10px;")
+        layout.addWidget(proxy_label)
+
+        from premium.proxy import NO_PROXY, AUTO_PROXY, PROXY_FILE, ProxyManager, load_pool
+        # Окно могли закрыть и открыть снова: менеджер и выбранный прокси живут дальше
+        existing = QApplication.instance().findChild(ProxyManager)
+        names = existing.names() if existing else [proxy["name"] for proxy in load_pool(data_path(PROXY_FILE))[0]]
+        self.proxy_combo = QComboBox()
+        self.proxy_combo.addItems([NO_PROXY, AUTO_PROXY] + names)
+        self.proxy_combo.setStyleSheet("""
+            QComboBox {
+                background: #172a45;
+                color: white;
+                padding: 8px;
+                border: 1px solid #64ffda;
+                border-radius: 5px;
+            }
+        """)
+
+        proxy_btn = QPushButton("Активировать прокси")
+        proxy_btn.setStyleSheet("""
+            QPushButton {
+                background: #1c4d9d;
+                color: white;
+                padding: 10px;
+                border-radius: 5px;
+                font-weight: bold;
+                margin-top: 5px;
+            }
+            QPushButton:hover { background: #1a3c5e; }
+        """)
+        proxy_btn.clicked.connect(self.apply_proxy)
+
+        probe_btn = QPushButton("Проверить")
+        probe_btn.setStyleSheet("""
+            QPushButton {
+                background: #172a45;
+                color: white;
+                padding: 10px;
+                border: 1px solid #64ffda;
+                border-radius: 5px;
+                margin-top: 5px;
+            }
+            QPushButton:hover { background: #1a3c5e; }
+        """)
+        probe_btn.clicked.connect(self.probe_proxies)
+
+        self.proxy_status = QLabel()
+        self.proxy_status.setStyleSheet("color: #8892b0; font-size: 12px;")
+        if "--proxy-pac-url" in os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", ""):
+            routing_note = QLabel("Страницы открываются по правилам PAC (proxy_rules.txt), выбранный ниже прокси на них не влияет")
+            routing_note.setWordWrap(True)
+            routing_note.setStyleSheet("color: #ffd166; font-size: 12px;")
+            layout.addWidget(routing_note)
+
+        proxy_buttons = QHBoxLayout()
+        proxy_buttons.addWidget(proxy_btn, 1)
+        proxy_buttons.addWidget(probe_btn)
+        layout.addWidget(self.proxy_combo)
+        layout.addLayout(proxy_buttons)
+        layout.addWidget(self.proxy_status)
+        if existing:
+            self.proxy_combo.setCurrentText(existing.mode)
+            self.get_proxy_manager()
+            self.update_proxy_status()
+        
+        # Раздел паролей
+        title3 = QLabel("Пароли")
+        title3.setStyleSheet("font-size: 24px; font-weight: bold; color: white; padding: 10px; margin-top: 20px;")
+        layout.addWidget(title3, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        passwords_btn = QPushButton("Управление паролями")
+        passwords_btn.setStyleSheet("""
+            QPushButton {
+                background: #1c4d9d;
+                color: white;
+                padding: 10px;
+                font-size: 16px;
+                border-radius: 5px;
+                font-weight: bold;
+                margin-top: 5px;
+            }
+            QPushButton:hover { background: #1a3c5e; }
+        """)
+        passwords_btn.clicked.connect(self.open_password_manager)
+        layout.addWidget(passwords_btn)
+        
+        layout.addStretch()
+        self.central_widget.setLayout(layout)
+    
+    def open_password_manager(self):
+        from premium.passwords import PasswordManagerWindow
+        self.password_window = PasswordManagerWindow(self)
+        # Закрытое окно удаляется, а не копится среди дочерних окна спец. функций
+        self.password_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.password_window.show()
+    
+    def start_snake_game(self):
+        from premium.snake import SnakeGame
+        self.snake_game = SnakeGame()
+        self.snake_game.show()